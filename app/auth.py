@@ -1,23 +1,48 @@
+import asyncio
 import hashlib
 import secrets
+import threading
+import time
 import jwt
-import json
 import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Optional
+from .user_store import UserStore
+
+
+class HashingBusy(Exception):
+    """Too many password hashes are already queued; try again shortly"""
+
 
 class AuthManager:
-    def __init__(self, data_file: str = "/app/data/users.json"):
+    def __init__(self, data_file: str = "/app/data/users.json", hash_workers: int = 2, token_cache_ttl: float = 60,
+                 max_pending_hashes: int = 32):
         self.data_file = data_file
         self.secret_key = self._get_or_create_secret()
-        self.users = self._load_users()
-        
-        # Ensure data directory exists
-        os.makedirs(os.path.dirname(data_file), exist_ok=True)
+        # Journaled store: O(1) writes per change, last_login written behind
+        self.users = UserStore(data_file)
+
+        # PBKDF2 runs in a small dedicated pool so logins never block the event
+        # loop and cannot take more than hash_workers cores between them
+        self._hash_pool = ThreadPoolExecutor(max_workers=hash_workers, thread_name_prefix="auth-hash")
+        # Queued plus running hashes; past the cap new requests fail fast
+        # instead of making every real login wait behind a burst of guesses
+        self.max_pending_hashes = max_pending_hashes
+        self._pending_hashes = 0
+
+        # token -> (expires_at, user); username -> tokens, for invalidation
+        self.token_cache_ttl = token_cache_ttl
+        self.token_cache_size = 10000
+        self._token_cache = {}
+        self._tokens_by_user = {}
+        # Bumped on invalidation so a verification that raced it is not cached
+        self._token_generations = {}
+        self._token_lock = threading.Lock()
 
     def _get_or_create_secret(self) -> str:
         """Get or create a secret key for JWT signing"""
-        secret_file = "/app/data/secret.key"
+        secret_file = os.path.join(os.path.dirname(self.data_file), "secret.key")
         
         try:
             with open(secret_file, 'r') as f:
@@ -30,18 +55,9 @@ class AuthManager:
                 f.write(secret)
             return secret
 
-    def _load_users(self) -> dict:
-        """Load users from file"""
-        try:
-            with open(self.data_file, 'r') as f:
-                return json.load(f)
-        except FileNotFoundError:
-            return {}
-
-    def _save_users(self):
-        """Save users to file"""
-        with open(self.data_file, 'w') as f:
-            json.dump(self.users, f, indent=2)
+    def close(self):
+        """Persist pending user updates"""
+        self.users.close()
 
     def _hash_password(self, password: str, salt: str = None) -> tuple:
         """Hash password with salt"""
@@ -68,21 +84,46 @@ class AuthManager:
         if len(password) < 8:
             raise ValueError("Password must be at least 8 characters")
         password_hash, salt = self._hash_password(password)
-        # First user is always admin
-        if not self.users:
-            role = "admin"
-        elif not role:
-            role = "child"
-        self.users[username] = {
-            "password_hash": password_hash,
-            "salt": salt,
-            "created_at": datetime.utcnow().isoformat(),
-            "last_login": None,
-            "role": role
-        }
-        self._save_users()
+        # Re-check under the store lock: hashing ran unlocked, possibly beside another create
+        with self.users.lock:
+            if username in self.users:
+                raise ValueError("User already exists")
+            # First user is always admin
+            if not self.users:
+                role = "admin"
+            elif not role:
+                role = "child"
+            self.users.put(username, {
+                "password_hash": password_hash,
+                "salt": salt,
+                "created_at": datetime.utcnow().isoformat(),
+                "last_login": None,
+                "role": role
+            })
         return True
     
+    async def _run_hashing(self, func, *args):
+        if self._pending_hashes >= self.max_pending_hashes:
+            raise HashingBusy("Too many login attempts in progress, try again shortly")
+        self._pending_hashes += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._hash_pool, func, *args)
+        finally:
+            self._pending_hashes -= 1
+
+    async def create_user_async(self, username: str, password: str, role: str = None) -> bool:
+        """create_user with the password hashed in the hashing pool"""
+        return await self._run_hashing(self.create_user, username, password, role)
+
+    async def verify_password_async(self, username: str, password: str) -> bool:
+        """verify_password with the password hashed in the hashing pool"""
+        return await self._run_hashing(self.verify_password, username, password)
+
+    async def change_password_async(self, username: str, old_password: str, new_password: str) -> bool:
+        """change_password with both passwords hashed in the hashing pool"""
+        return await self._run_hashing(self.change_password, username, old_password, new_password)
+
     def verify_password(self, username: str, password: str) -> bool:
         """Verify user password"""
         if username not in self.users:
@@ -92,9 +133,8 @@ class AuthManager:
         password_hash, _ = self._hash_password(password, user["salt"])
         
         if password_hash == user["password_hash"]:
-            # Update last login
-            self.users[username]["last_login"] = datetime.utcnow().isoformat()
-            self._save_users()
+            # Update last login (persisted by the store's background flush)
+            self.users.touch(username, last_login=datetime.utcnow().isoformat())
             return True
         
         return False
@@ -110,17 +150,48 @@ class AuthManager:
         return jwt.encode(payload, self.secret_key, algorithm="HS256")
 
     def verify_token(self, token: str) -> Optional[dict]:
+        now = time.time()
+        with self._token_lock:
+            cached = self._token_cache.get(token)
+        if cached and cached[0] > now:
+            return dict(cached[1])
+
         try:
             payload = jwt.decode(token, self.secret_key, algorithms=["HS256"])
             username = payload.get("username")
+            with self._token_lock:
+                generation = self._token_generations.get(username, 0)
             if username in self.users:
                 user = self.users[username]
-                return {"username": username, "role": user.get("role", "child")}
+                verified = {"username": username, "role": user.get("role", "child")}
+                self._cache_token(
+                    token, verified, min(now + self.token_cache_ttl, payload.get("exp", now)), generation
+                )
+                return dict(verified)
             return None
         except jwt.ExpiredSignatureError:
             return None
         except jwt.InvalidTokenError:
             return None
+
+    def _cache_token(self, token: str, user: dict, expires_at: float, generation: int):
+        with self._token_lock:
+            if self._token_generations.get(user["username"], 0) != generation:
+                # Invalidated since the user was read: the result may already be stale
+                return
+            if len(self._token_cache) >= self.token_cache_size:
+                # Full: drop everything rather than track recency; entries are cheap to rebuild
+                self._token_cache.clear()
+                self._tokens_by_user.clear()
+            self._token_cache[token] = (expires_at, user)
+            self._tokens_by_user.setdefault(user["username"], set()).add(token)
+
+    def invalidate_tokens(self, username: str):
+        """Forget cached verifications for a user so their tokens are re-checked"""
+        with self._token_lock:
+            self._token_generations[username] = self._token_generations.get(username, 0) + 1
+            for token in self._tokens_by_user.pop(username, ()):
+                self._token_cache.pop(token, None)
         
     def change_password(self, username: str, old_password: str, new_password: str) -> bool:
         """Change user password"""
@@ -132,17 +203,14 @@ class AuthManager:
         
         password_hash, salt = self._hash_password(new_password)
         
-        self.users[username]["password_hash"] = password_hash
-        self.users[username]["salt"] = salt
-        
-        self._save_users()
+        self.users.put(username, {**self.users[username], "password_hash": password_hash, "salt": salt})
+        self.invalidate_tokens(username)
         return True
 
     def delete_user(self, username: str) -> bool:
         """Delete a user"""
-        if username in self.users:
-            del self.users[username]
-            self._save_users()
+        if self.users.delete(username):
+            self.invalidate_tokens(username)
             return True
         return False
 
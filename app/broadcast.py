@@ -0,0 +1,90 @@
+import asyncio
+import json
+import logging
+import time
+
+from .instrumentation import instrumentation
+
+logger = logging.getLogger(__name__)
+
+
+class Subscription:
+    """One subscriber's view of a hub: the latest encoded payload it has not sent yet"""
+
+    def __init__(self, every, next_tick):
+        self.every = every
+        self.next_tick = next_tick
+        self._queue = asyncio.Queue(maxsize=1)
+
+    def offer(self, payload):
+        # A subscriber that falls behind only ever gets the newest snapshot
+        if self._queue.full():
+            self._queue.get_nowait()
+        self._queue.put_nowait(payload)
+
+    async def get(self):
+        return await self._queue.get()
+
+
+class BroadcastHub:
+    """Sample a snapshot once per tick and fan the encoded payload out to subscribers.
+
+    Each subscriber asks for a refresh interval which is rounded to the nearest
+    whole number of ticks. A tick on which no subscriber is due is skipped
+    without sampling, and the sampling task exits when the last subscriber
+    leaves.
+    """
+
+    def __init__(self, sample, tick=1.0, name="broadcast"):
+        self.sample = sample
+        self.tick = tick
+        self.name = name
+        self._subscribers = set()
+        self._tick_count = 0
+        self._task = None
+
+    def subscribe(self, interval):
+        every = self._ticks(interval)
+        subscription = Subscription(every, self._tick_count + every)
+        self._subscribers.add(subscription)
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+        return subscription
+
+    def set_interval(self, subscription, interval):
+        """Change a subscriber's refresh interval; a shorter one takes effect on the next due tick"""
+        subscription.every = self._ticks(interval)
+        subscription.next_tick = min(subscription.next_tick, self._tick_count + subscription.every)
+
+    def _ticks(self, interval):
+        return max(1, round(interval / self.tick))
+
+    def unsubscribe(self, subscription):
+        self._subscribers.discard(subscription)
+
+    @property
+    def subscriber_count(self):
+        return len(self._subscribers)
+
+    async def _run(self):
+        next_time = time.monotonic()
+        while self._subscribers:
+            # Skip ticks missed while a slow sample was running rather than bursting
+            next_time = max(next_time + self.tick, time.monotonic())
+            await asyncio.sleep(next_time - time.monotonic())
+            self._tick_count += 1
+
+            due = [s for s in self._subscribers if s.next_tick <= self._tick_count]
+            if not due:
+                continue
+            try:
+                with instrumentation.measure("task", f"{self.name} sample"):
+                    snapshot = await self.sample()
+                with instrumentation.measure("task", f"{self.name} encode"):
+                    payload = json.dumps(snapshot)
+            except Exception as e:
+                logger.error(f"Error sampling broadcast snapshot: {e}")
+                continue
+            for subscription in due:
+                subscription.next_tick = self._tick_count + subscription.every
+                subscription.offer(payload)
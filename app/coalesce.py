@@ -0,0 +1,98 @@
+import asyncio
+import functools
+import inspect
+import threading
+from concurrent.futures import Future
+
+
+class Coalescer:
+    """Single-flight calls: concurrent callers with the same key share one run.
+
+    Coroutines share one asyncio task per event loop; blocking calls share the
+    result of the thread that started first. Nothing is cached once a run
+    finishes, so the next call starts a fresh one. Per-name counters record
+    how many calls were made and how many joined a run already in flight.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._tasks = {}
+        self._futures = {}
+        self._counters = {}
+
+    def _count(self, name, coalesced):
+        # Caller holds self._lock
+        counter = self._counters.setdefault(name, {"calls": 0, "coalesced": 0})
+        counter["calls"] += 1
+        if coalesced:
+            counter["coalesced"] += 1
+
+    async def run_async(self, name, key, factory):
+        """Await factory(), or the run already in flight for key"""
+        key = (asyncio.get_running_loop(), key)
+        with self._lock:
+            task = self._tasks.get(key)
+            self._count(name, task is not None)
+            if task is None:
+                task = asyncio.ensure_future(factory())
+                self._tasks[key] = task
+                task.add_done_callback(lambda done: self._finished(key, done))
+        # A cancelled caller must not cancel the run the others are waiting on
+        return await asyncio.shield(task)
+
+    def _finished(self, key, task):
+        with self._lock:
+            self._tasks.pop(key, None)
+        if not task.cancelled():
+            # Mark the error retrieved even if every caller was cancelled
+            task.exception()
+
+    def run(self, name, key, fn):
+        """Call fn(), or wait for the call already in flight for key"""
+        with self._lock:
+            future = self._futures.get(key)
+            leader = future is None
+            if leader:
+                future = self._futures[key] = Future()
+            self._count(name, not leader)
+        if not leader:
+            return future.result()
+
+        try:
+            result = fn()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                self._futures.pop(key, None)
+
+    def stats(self):
+        """{name: {"calls", "coalesced"}} since start"""
+        with self._lock:
+            return {name: dict(counter) for name, counter in self._counters.items()}
+
+
+def coalesced(method):
+    """Share one in-flight call per instance and arguments through self.coalescer.
+
+    Arguments must be hashable. Callers receive the same result object, so
+    they must not mutate it.
+    """
+    name = method.__name__
+
+    if inspect.iscoroutinefunction(method):
+        @functools.wraps(method)
+        async def async_wrapper(self, *args, **kwargs):
+            key = (name, args, tuple(sorted(kwargs.items())))
+            return await self.coalescer.run_async(name, key, lambda: method(self, *args, **kwargs))
+        return async_wrapper
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        key = (name, args, tuple(sorted(kwargs.items())))
+        return self.coalescer.run(name, key, lambda: method(self, *args, **kwargs))
+    return wrapper
@@ -0,0 +1,151 @@
+import logging
+import os
+import zlib
+from starlette.datastructures import Headers, MutableHeaders
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip is always available
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+# Already-compressed payloads gain nothing from another pass
+SKIP_CONTENT_TYPES = ("image/", "font/", "audio/", "video/", "application/zip", "application/gzip")
+
+
+class GzipEncoder:
+    name = "gzip"
+
+    def __init__(self, level=6):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, data, final):
+        # Sync-flush each chunk so streamed responses (NDJSON logs) stay live
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_FINISH if final else zlib.Z_SYNC_FLUSH)
+
+
+class BrotliEncoder:
+    name = "br"
+
+    def __init__(self, quality=4):
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, data, final):
+        return self._compressor.process(data) + (self._compressor.finish() if final else self._compressor.flush())
+
+
+def accepted_encodings(header):
+    """Encodings a client accepts, from an Accept-Encoding header (q=0 excluded)"""
+    accepted = set()
+    for part in header.split(","):
+        token, _, params = part.strip().partition(";")
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                if float(params[2:]) <= 0:
+                    continue
+            except ValueError:
+                continue
+        if token:
+            accepted.add(token.strip().lower())
+    return accepted
+
+
+def compression_settings_from_env():
+    """Middleware settings from the environment, or None when compression is disabled.
+
+    LOGIQUE_COMPRESSION=off disables HTTP compression; LOGIQUE_COMPRESSION_MIN_BYTES,
+    LOGIQUE_GZIP_LEVEL and LOGIQUE_BROTLI_QUALITY tune it.
+    """
+    if os.environ.get("LOGIQUE_COMPRESSION", "on").lower() in ("0", "off", "false", "no"):
+        return None
+    return {
+        "minimum_size": int(os.environ.get("LOGIQUE_COMPRESSION_MIN_BYTES", 1024)),
+        "gzip_level": int(os.environ.get("LOGIQUE_GZIP_LEVEL", 6)),
+        "brotli_quality": int(os.environ.get("LOGIQUE_BROTLI_QUALITY", 4)),
+    }
+
+
+class CompressionMiddleware:
+    """Negotiated brotli/gzip compression for HTTP responses.
+
+    Brotli is preferred when the client accepts it and the ``brotli`` package
+    is installed, otherwise gzip. Complete responses smaller than
+    ``minimum_size`` are sent as-is; streamed responses are compressed chunk
+    by chunk. Websockets are left to the server's permessage-deflate.
+    """
+
+    def __init__(self, app, minimum_size=1024, gzip_level=6, brotli_quality=4):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    def _encoder_for(self, accept_encoding):
+        accepted = accepted_encodings(accept_encoding)
+        if brotli is not None and "br" in accepted:
+            return lambda: BrotliEncoder(self.brotli_quality)
+        if "gzip" in accepted:
+            return lambda: GzipEncoder(self.gzip_level)
+        return None
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        make_encoder = self._encoder_for(Headers(scope=scope).get("accept-encoding", ""))
+        if make_encoder is None:
+            await self.app(scope, receive, send)
+            return
+
+        start = None
+        encoder = None
+
+        async def send_compressed(message):
+            nonlocal start, encoder
+            if message["type"] == "http.response.start":
+                # Hold the headers until the first body chunk decides the encoding
+                start = message
+                return
+            if message["type"] != "http.response.body":
+                if start is not None:
+                    await send(start)
+                    start = None
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if start is not None:
+                headers = MutableHeaders(raw=start["headers"])
+                content_type = headers.get("content-type", "")
+                if (
+                    "content-encoding" in headers
+                    or start["status"] in (204, 206, 304)
+                    or content_type.startswith(SKIP_CONTENT_TYPES)
+                    or (not more_body and len(body) < self.minimum_size)
+                ):
+                    await send(start)
+                    start = None
+                    await send(message)
+                    return
+
+                encoder = make_encoder()
+                headers["Content-Encoding"] = encoder.name
+                headers.add_vary_header("Accept-Encoding")
+                if "content-length" in headers:
+                    del headers["Content-Length"]
+                body = encoder.compress(body, final=not more_body)
+                if not more_body:
+                    headers["Content-Length"] = str(len(body))
+                await send(start)
+                start = None
+                await send({"type": "http.response.body", "body": body, "more_body": more_body})
+                return
+
+            if encoder is not None:
+                message = {"type": "http.response.body", "body": encoder.compress(body, final=not more_body), "more_body": more_body}
+            await send(message)
+
+        await self.app(scope, receive, send_compressed)
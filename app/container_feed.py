@@ -0,0 +1,130 @@
+import asyncio
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def diff_containers(old, new):
+    """Compare two {id: container_info} maps and return (added, removed, changed).
+
+    ``changed`` holds only the fields that differ, plus the container id.
+    """
+    added = [info for container_id, info in new.items() if container_id not in old]
+    removed = [container_id for container_id in old if container_id not in new]
+    changed = []
+    for container_id, info in new.items():
+        previous = old.get(container_id)
+        if previous is None or previous == info:
+            continue
+        fields = {key: value for key, value in info.items() if previous.get(key) != value}
+        fields["id"] = container_id
+        changed.append(fields)
+    return added, removed, changed
+
+
+class FeedSubscriber:
+    """Pending frames for one /ws/containers client"""
+
+    def __init__(self, feed, max_pending=64):
+        self.feed = feed
+        self._queue = asyncio.Queue(maxsize=max_pending)
+        self._needs_snapshot = False
+
+    def offer(self, message):
+        if self._queue.full():
+            # Too far behind for deltas to be useful; start over from a snapshot
+            self.request_snapshot()
+            return
+        self._queue.put_nowait(message)
+
+    def request_snapshot(self):
+        self._needs_snapshot = True
+        while not self._queue.empty():
+            self._queue.get_nowait()
+        self._queue.put_nowait(None)
+
+    async def get(self):
+        message = await self._queue.get()
+        if message is None or self._needs_snapshot:
+            # Every queued delta is already folded into the current snapshot
+            while not self._queue.empty():
+                self._queue.get_nowait()
+            self._needs_snapshot = False
+            return self.feed.snapshot_message()
+        return message
+
+
+class ContainerFeed:
+    """Versioned container list shared by every /ws/containers client.
+
+    Subscribers first receive ``{"type": "snapshot", "version", "containers"}``
+    and then ``{"type": "delta", "version", "added", "removed", "changed"}``
+    frames, one version apart. The diff is computed and encoded once per
+    refresh. A client that sees a version gap asks for a new snapshot.
+    """
+
+    def __init__(self, load, wait_for_change, refresh_interval=5):
+        self.load = load
+        self.wait_for_change = wait_for_change
+        self.refresh_interval = refresh_interval
+        self.version = 0
+        self._containers = {}
+        self._source_version = 0
+        self._subscribers = set()
+        self._task = None
+        self._start_lock = asyncio.Lock()
+
+    def snapshot_message(self):
+        return json.dumps({
+            "type": "snapshot",
+            "version": self.version,
+            "containers": list(self._containers.values())
+        })
+
+    async def subscribe(self):
+        # Concurrent first subscribers must not each start a poller
+        async with self._start_lock:
+            if self._task is None or self._task.done():
+                # Nobody was following changes, so bring the snapshot up to date first
+                await self._refresh()
+                self._task = asyncio.create_task(self._run())
+            subscriber = FeedSubscriber(self)
+            subscriber.request_snapshot()
+            self._subscribers.add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber):
+        self._subscribers.discard(subscriber)
+
+    async def _run(self):
+        while self._subscribers:
+            try:
+                # Refresh on inventory changes, and periodically for live stats
+                self._source_version = await asyncio.wait_for(
+                    self.wait_for_change(self._source_version), self.refresh_interval
+                )
+            except asyncio.TimeoutError:
+                pass
+            try:
+                await self._refresh()
+            except Exception as e:
+                logger.error(f"Error refreshing container feed: {e}")
+
+    async def _refresh(self):
+        containers = {info["id"]: info for info in await self.load()}
+        added, removed, changed = diff_containers(self._containers, containers)
+        self._containers = containers
+        if not (added or removed or changed):
+            return
+
+        self.version += 1
+        message = json.dumps({
+            "type": "delta",
+            "version": self.version,
+            "added": added,
+            "removed": removed,
+            "changed": changed
+        })
+        for subscriber in list(self._subscribers):
+            subscriber.offer(message)
@@ -0,0 +1,295 @@
+import aiohttp
+import asyncio
+import json
+import os
+import ssl
+import struct
+
+from .instrumentation import engine_route, instrumentation
+
+
+class DockerEngineError(Exception):
+    """Error response from the Docker Engine API"""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class NotFound(DockerEngineError):
+    """The requested container, network or image does not exist"""
+
+
+class AsyncDockerEngine:
+    """Minimal asyncio client for the Docker Engine API over a unix socket or TCP.
+
+    Covers the calls Logique needs on the request path so FastAPI handlers can
+    await them instead of blocking the event loop in docker-py. Each instance
+    owns its own connection pool of up to ``pool_size`` connections.
+    """
+
+    def __init__(self, socket_path="/var/run/docker.sock", timeout=30, base_url=None, pool_size=100, ssl_context=None):
+        self.socket_path = None if base_url else socket_path
+        self.base_url = (base_url or "http://docker").rstrip("/")
+        self.timeout = timeout
+        self.pool_size = pool_size
+        self.ssl_context = ssl_context
+        self._session = None
+
+    @classmethod
+    def from_env(cls, **kwargs):
+        """Talk to the daemon docker-py uses: DOCKER_HOST if set, else the default socket.
+
+        As in docker-py, a tcp:// host uses TLS when DOCKER_TLS_VERIFY is set,
+        with ca.pem, cert.pem and key.pem from DOCKER_CERT_PATH (default ~/.docker).
+        """
+        docker_host = os.environ.get("DOCKER_HOST", "")
+        if not docker_host:
+            return cls(**kwargs)
+        if docker_host.startswith("tcp://") and os.environ.get("DOCKER_TLS_VERIFY"):
+            cert_path = os.environ.get("DOCKER_CERT_PATH") or os.path.join(os.path.expanduser("~"), ".docker")
+            context = ssl.create_default_context(cafile=os.path.join(cert_path, "ca.pem"))
+            context.load_cert_chain(os.path.join(cert_path, "cert.pem"), os.path.join(cert_path, "key.pem"))
+            return cls.from_url("https://" + docker_host[len("tcp://"):], ssl_context=context, **kwargs)
+        return cls.from_url(docker_host, **kwargs)
+
+    @classmethod
+    def from_url(cls, url, **kwargs):
+        """Client for unix:///path/docker.sock, tcp://host:port or http(s)://host:port"""
+        if url.startswith("unix://"):
+            return cls(socket_path=url[len("unix://"):], **kwargs)
+        if url.startswith("tcp://"):
+            return cls(base_url="http://" + url[len("tcp://"):], **kwargs)
+        if url.startswith(("http://", "https://")):
+            return cls(base_url=url, **kwargs)
+        raise ValueError(f"Unsupported Docker endpoint: {url}")
+
+    def _get_session(self):
+        if self._session is None or self._session.closed:
+            if self.socket_path:
+                connector = aiohttp.UnixConnector(path=self.socket_path, limit=self.pool_size)
+            else:
+                connector = aiohttp.TCPConnector(limit=self.pool_size, ssl=self.ssl_context or True)
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout)
+            )
+        return self._session
+
+    async def close(self):
+        """Close the underlying HTTP session"""
+        if self._session and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    @staticmethod
+    def _encode_params(params):
+        encoded = {}
+        for key, value in (params or {}).items():
+            if value is None:
+                continue
+            if isinstance(value, bool):
+                encoded[key] = "1" if value else "0"
+            elif isinstance(value, dict):
+                encoded[key] = json.dumps(value)
+            else:
+                encoded[key] = str(value)
+        return encoded
+
+    @staticmethod
+    async def _raise_for_status(response):
+        if response.status < 400:
+            return
+        try:
+            message = (await response.json(content_type=None)).get("message", response.reason)
+        except Exception:
+            message = response.reason
+        if response.status == 404:
+            raise NotFound(response.status, message)
+        raise DockerEngineError(response.status, message)
+
+    async def _request(self, method, path, params=None, timeout=None):
+        session = self._get_session()
+        kwargs = {"params": self._encode_params(params)}
+        if timeout is not None:
+            kwargs["timeout"] = aiohttp.ClientTimeout(total=timeout)
+        with instrumentation.measure("docker_api", engine_route(method, path)):
+            async with session.request(method, f"{self.base_url}{path}", **kwargs) as response:
+                await self._raise_for_status(response)
+                if response.status == 204:
+                    return None
+                body = await response.read()
+        if response.content_type == "application/json" and body:
+            return json.loads(body)
+        return body
+
+    async def _stream(self, path, params=None):
+        """Open a long-lived response; the caller must release it"""
+        session = self._get_session()
+        # Timed to the response headers; the stream itself stays open
+        with instrumentation.measure("docker_api", engine_route("GET", path)):
+            response = await session.get(
+                f"{self.base_url}{path}",
+                params=self._encode_params(params),
+                timeout=aiohttp.ClientTimeout(total=None, sock_connect=self.timeout)
+            )
+            try:
+                await self._raise_for_status(response)
+            except Exception:
+                response.release()
+                raise
+        return response
+
+    # Daemon
+    async def ping(self):
+        return await self._request("GET", "/_ping", timeout=5)
+
+    async def info(self):
+        return await self._request("GET", "/info")
+
+    # Containers
+    async def list_containers(self, all=True, filters=None):
+        return await self._request("GET", "/containers/json", {"all": all, "filters": filters})
+
+    async def inspect_container(self, container_id):
+        return await self._request("GET", f"/containers/{container_id}/json")
+
+    async def container_stats(self, container_id):
+        """Single stats sample (the daemon waits for a second sample to fill precpu_stats)"""
+        return await self._request("GET", f"/containers/{container_id}/stats", {"stream": False})
+
+    async def stream_stats(self, container_id):
+        """Yield decoded stats samples until the container stops"""
+        response = await self._stream(f"/containers/{container_id}/stats", {"stream": True})
+        try:
+            async for line in response.content:
+                if line.strip():
+                    yield json.loads(line)
+        finally:
+            response.release()
+
+    async def container_logs(self, container_id, tail=1000, since=None, timestamps=True):
+        """Return demultiplexed stdout/stderr log output as text"""
+        params = {"stdout": True, "stderr": True, "timestamps": timestamps, "tail": tail, "since": since}
+        body = await self._request("GET", f"/containers/{container_id}/logs", params)
+        return b"".join(self._demux(body)).decode("utf-8", errors="replace")
+
+    async def stream_logs(self, container_id, tail=10, since=None, timestamps=True, follow=True):
+        """Yield raw log lines (bytes, newline-terminated) as the daemon emits them"""
+        params = {
+            "stdout": True, "stderr": True, "timestamps": timestamps,
+            "tail": tail, "since": since, "follow": follow
+        }
+        response = await self._stream(f"/containers/{container_id}/logs", params)
+        try:
+            async for line in self._iter_log_lines(response.content):
+                yield line
+        finally:
+            response.release()
+
+    async def start_container(self, container_id):
+        await self._request("POST", f"/containers/{container_id}/start")
+
+    async def stop_container(self, container_id, timeout=10):
+        await self._request("POST", f"/containers/{container_id}/stop", {"t": timeout}, timeout=self.timeout + timeout)
+
+    async def restart_container(self, container_id, timeout=10):
+        await self._request("POST", f"/containers/{container_id}/restart", {"t": timeout}, timeout=self.timeout + timeout)
+
+    async def remove_container(self, container_id, force=False):
+        await self._request("DELETE", f"/containers/{container_id}", {"force": force})
+
+    # Networks and images
+    async def list_networks(self):
+        return await self._request("GET", "/networks")
+
+    async def inspect_network(self, network_id):
+        return await self._request("GET", f"/networks/{network_id}")
+
+    async def inspect_image(self, image_id):
+        return await self._request("GET", f"/images/{image_id}/json")
+
+    async def list_images(self):
+        return await self._request("GET", "/images/json")
+
+    # Events
+    async def events(self, filters=None, since=None, until=None):
+        """Yield decoded events from the daemon's event stream"""
+        response = await self._stream("/events", {"filters": filters, "since": since, "until": until})
+        try:
+            async for line in response.content:
+                if line.strip():
+                    yield json.loads(line)
+        finally:
+            response.release()
+
+    # Log stream framing
+    @staticmethod
+    def _is_multiplexed(data):
+        # Non-TTY containers prefix each frame with an 8-byte header: stream, 0, 0, 0, size
+        return len(data) >= 8 and data[0] in (0, 1, 2) and data[1:4] == b"\x00\x00\x00"
+
+    @classmethod
+    def _demux(cls, data):
+        if not data:
+            return []
+        if not cls._is_multiplexed(data):
+            return [data]
+        chunks = []
+        offset = 0
+        while offset + 8 <= len(data):
+            size = struct.unpack(">I", data[offset + 4:offset + 8])[0]
+            chunks.append(data[offset + 8:offset + 8 + size])
+            offset += 8 + size
+        return chunks
+
+    @staticmethod
+    def _complete_lines(pending, data):
+        """Append data to a stream's pending bytes and return the lines it completes"""
+        end = data.rfind(b"\n")
+        if end < 0:
+            pending += data
+            return []
+        pending += data[:end + 1]
+        lines = [line + b"\n" for line in bytes(pending).split(b"\n")[:-1]]
+        pending.clear()
+        pending += data[end + 1:]
+        return lines
+
+    @classmethod
+    async def _iter_log_lines(cls, content):
+        try:
+            header = await content.readexactly(8)
+        except asyncio.IncompleteReadError as e:
+            if e.partial:
+                yield e.partial
+            return
+
+        # Partial lines are kept per stream id so stdout and stderr frames don't splice
+        pending = {}
+        if cls._is_multiplexed(header):
+            while True:
+                size = struct.unpack(">I", header[4:8])[0]
+                buffer = pending.setdefault(header[0], bytearray())
+                try:
+                    frame = await content.readexactly(size)
+                except asyncio.IncompleteReadError as e:
+                    buffer += e.partial
+                    break
+                for line in cls._complete_lines(buffer, frame):
+                    yield line
+                try:
+                    header = await content.readexactly(8)
+                except asyncio.IncompleteReadError:
+                    break
+        else:
+            buffer = pending[None] = bytearray()
+            chunk = header
+            while chunk:
+                for line in cls._complete_lines(buffer, chunk):
+                    yield line
+                chunk = await content.read(65536)
+
+        for buffer in pending.values():
+            if buffer:
+                yield bytes(buffer)
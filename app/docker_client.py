@@ -1,16 +1,67 @@
 import docker
 import psutil
+import asyncio
+import os
+import threading
 import time
 from datetime import datetime, timezone
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor
 import logging
+from contextlib import aclosing
 from functools import lru_cache
-import threading
+from .stats_collector import StatsCollector
+from .docker_async import AsyncDockerEngine, NotFound
+from .inventory import DockerInventory, image_name_map, image_display_name, summary_attrs
+from .log_mux import LogMultiplexer, parse_log_line
+from .log_merge import merge_sorted_streams
+from .timestamps import parse_docker_timestamp
+from .prometheus import container_samples
+from .coalesce import Coalescer, coalesced
+from .instrumentation import instrumented, record_docker_response
+from .ttl_cache import TTLCache
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Cache key prefix -> (seconds fresh, further seconds served stale while refreshing)
+CACHE_FAMILIES = {
+    "system_stats": (5, 30),
+    "container_details_": (2, 10),
+    "container_networks": (10, 60),
+    "docker_info": (60, 600),
+    "image_names": (30, 300),
+}
+
+class CpuPercent:
+    """Host CPU utilisation since the previous call, from psutil.cpu_times() deltas.
+
+    psutil.cpu_percent(interval=None) keeps its previous sample per thread, so
+    from pool threads each reading covers an arbitrary window or none at all.
+    Each instance keeps its own previous sample; the first reading covers the
+    time since the instance was created.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._last = psutil.cpu_times()
+
+    @staticmethod
+    def _busy_and_total(times):
+        # Guest time is already included in user time on Linux
+        total = sum(times) - getattr(times, "guest", 0) - getattr(times, "guest_nice", 0)
+        return total - times.idle - getattr(times, "iowait", 0), total
+
+    def __call__(self):
+        with self._lock:
+            times = psutil.cpu_times()
+            last, self._last = self._last, times
+        busy, total = self._busy_and_total(times)
+        last_busy, last_total = self._busy_and_total(last)
+        if total <= last_total:
+            return 0.0
+        return round(min(100.0, max(0.0, (busy - last_busy) / (total - last_total) * 100)), 1)
+
 class DockerClient:
     def __init__(self):
         try:
@@ -18,11 +69,40 @@ class DockerClient:
             # Test connection
             self.client.ping()
             logger.info("Docker client initialized successfully")
+            # Time every docker-py request, attributed to the calling method
+            self.client.api.hooks["response"].append(record_docker_response)
+
+            # Host CPU readers with their own previous sample: the dashboard and the metrics history
+            # each get the utilisation since their own last reading, whichever thread they run on
+            self._dashboard_cpu = CpuPercent()
+            self._history_cpu = CpuPercent()
+
+            # One long-lived pool for blocking daemon calls, shared by every request
+            self.executor = ThreadPoolExecutor(
+                max_workers=int(os.environ.get("LOGIQUE_DOCKER_WORKERS", 8)),
+                thread_name_prefix="docker-client"
+            )
 
             # Performance optimization: Cache frequently accessed data
-            self._stats_cache = {}
-            self._cache_lock = threading.Lock()
-            self._cache_timeout = 5  # seconds
+            self.cache = TTLCache(
+                CACHE_FAMILIES,
+                maxsize=int(os.environ.get("LOGIQUE_CACHE_SIZE", 512)),
+                executor=self.executor
+            )
+            # Concurrent identical queries share one in-flight call
+            self.coalescer = Coalescer()
+
+            # Streaming stats subscriptions so readers never block on the daemon
+            self.stats_collector = StatsCollector(self.client)
+
+            # Non-blocking Engine client for the async request handlers
+            self.engine = AsyncDockerEngine.from_env()
+
+            # Containers and networks kept current from the events stream
+            self.inventory = DockerInventory(self.engine, self.stats_collector)
+
+            # One shared follow stream per container for all log viewers
+            self.log_multiplexer = LogMultiplexer(self.engine)
 
         except Exception as e:
             logger.error(f"Failed to initialize Docker client: {e}")
@@ -33,120 +113,109 @@ class DockerClient:
         """Cache CPU count as it doesn't change"""
         return psutil.cpu_count(logical=True)
 
+    @instrumented
+    @coalesced
     def get_system_stats(self):
         """Get comprehensive system statistics with caching"""
         try:
-            # Check cache first
-            with self._cache_lock:
-                now = time.time()
-                if 'system_stats' in self._stats_cache:
-                    cache_time, cached_data = self._stats_cache['system_stats']
-                    if now - cache_time < self._cache_timeout:
-                        return cached_data
-
-            # Get boot time for accurate uptime
-            boot_time = psutil.boot_time()
-            uptime_seconds = time.time() - boot_time
-
-            # Get load averages (Unix-like systems) with error handling
-            try:
-                load_avg = psutil.getloadavg()
-                load_1min = round(load_avg[0], 2)
-                load_5min = round(load_avg[1], 2)
-                load_15min = round(load_avg[2], 2)
-            except (AttributeError, OSError):
-                # Windows doesn't have load average
-                load_1min = load_5min = load_15min = None
-
-            # Network I/O stats with error handling
-            try:
-                net_io = psutil.net_io_counters()
-                network_data = {
-                    "bytes_sent": net_io.bytes_sent,
-                    "bytes_recv": net_io.bytes_recv,
-                    "packets_sent": net_io.packets_sent,
-                    "packets_recv": net_io.packets_recv
-                }
-            except Exception as e:
-                logger.warning(f"Could not get network stats: {e}")
-                network_data = {
-                    "bytes_sent": 0,
-                    "bytes_recv": 0,
-                    "packets_sent": 0,
-                    "packets_recv": 0
-                }
+            return self.cache.get_or_load('system_stats', self._collect_system_stats)
+        except Exception as e:
+            logger.error(f"Error getting system stats: {e}")
+            return self._get_fallback_system_stats()
 
-            # Memory stats with error handling
-            try:
-                memory = psutil.virtual_memory()
-                memory_data = {
-                    "total_gb": round(memory.total / (1024**3), 2),
-                    "used_memory": round(memory.used / (1024**3), 2),
-                    "used_percent": round(memory.percent, 2),
-                    "available_gb": round(memory.available / (1024**3), 2)
-                }
-            except Exception as e:
-                logger.warning(f"Could not get memory stats: {e}")
-                memory_data = {
-                    "total_gb": 0,
-                    "used_memory": 0,
-                    "used_percent": 0,
-                    "available_gb": 0
-                }
+    def _collect_system_stats(self):
+        """Sample host CPU, memory, disk, network, load and uptime"""
+        # Get boot time for accurate uptime
+        boot_time = psutil.boot_time()
+        uptime_seconds = time.time() - boot_time
 
-            # Disk stats with error handling
-            try:
-                disk = psutil.disk_usage('/')
-                disk_data = {
-                    "total_gb": round(disk.total / (1024**3), 2),
-                    "used_gb": round(disk.used / (1024**3), 2),
-                    "used_percent": round((disk.used / disk.total) * 100, 2),
-                    "free_gb": round(disk.free / (1024**3), 2)
-                }
-            except Exception as e:
-                logger.warning(f"Could not get disk stats: {e}")
-                disk_data = {
-                    "total_gb": 0,
-                    "used_gb": 0,
-                    "used_percent": 0,
-                    "free_gb": 0
-                }
-
-            # CPU usage with timeout
-            try:
-                # Warm up psutil's CPU percent calculation if needed
-                if not hasattr(self, "_cpu_percent_warmed"):
-                    psutil.cpu_percent(interval=None)
-                    self._cpu_percent_warmed = True
-                cpu_percent = psutil.cpu_percent(interval=None)
-            except Exception as e:
-                logger.warning(f"Could not get CPU stats: {e}")
-                cpu_percent = 0.0
-
-            stats_data = {
-                "cpu_cores": self._get_cpu_count(),
-                "cpu_usage_percent": round(cpu_percent, 2),
-                "memory": memory_data,
-                "disk": disk_data,
-                "network": network_data,
-                "load_average": {
-                    "1min": load_1min,
-                    "5min": load_5min,
-                    "15min": load_15min
-                },
-                "uptime_seconds": int(uptime_seconds),
-                "timestamp": datetime.now(timezone.utc).isoformat()
+        # Get load averages (Unix-like systems) with error handling
+        try:
+            load_avg = psutil.getloadavg()
+            load_1min = round(load_avg[0], 2)
+            load_5min = round(load_avg[1], 2)
+            load_15min = round(load_avg[2], 2)
+        except (AttributeError, OSError):
+            # Windows doesn't have load average
+            load_1min = load_5min = load_15min = None
+
+        # Network I/O stats with error handling
+        try:
+            net_io = psutil.net_io_counters()
+            network_data = {
+                "bytes_sent": net_io.bytes_sent,
+                "bytes_recv": net_io.bytes_recv,
+                "packets_sent": net_io.packets_sent,
+                "packets_recv": net_io.packets_recv
+            }
+        except Exception as e:
+            logger.warning(f"Could not get network stats: {e}")
+            network_data = {
+                "bytes_sent": 0,
+                "bytes_recv": 0,
+                "packets_sent": 0,
+                "packets_recv": 0
             }
 
-            # Cache the result
-            with self._cache_lock:
-                self._stats_cache['system_stats'] = (time.time(), stats_data)
+        # Memory stats with error handling
+        try:
+            memory = psutil.virtual_memory()
+            memory_data = {
+                "total_gb": round(memory.total / (1024**3), 2),
+                "used_memory": round(memory.used / (1024**3), 2),
+                "used_percent": round(memory.percent, 2),
+                "available_gb": round(memory.available / (1024**3), 2)
+            }
+        except Exception as e:
+            logger.warning(f"Could not get memory stats: {e}")
+            memory_data = {
+                "total_gb": 0,
+                "used_memory": 0,
+                "used_percent": 0,
+                "available_gb": 0
+            }
 
-            return stats_data
+        # Disk stats with error handling
+        try:
+            disk = psutil.disk_usage('/')
+            disk_data = {
+                "total_gb": round(disk.total / (1024**3), 2),
+                "used_gb": round(disk.used / (1024**3), 2),
+                "used_percent": round((disk.used / disk.total) * 100, 2),
+                "free_gb": round(disk.free / (1024**3), 2)
+            }
+        except Exception as e:
+            logger.warning(f"Could not get disk stats: {e}")
+            disk_data = {
+                "total_gb": 0,
+                "used_gb": 0,
+                "used_percent": 0,
+                "free_gb": 0
+            }
 
+        # CPU usage with timeout
+        try:
+            cpu_percent = self._dashboard_cpu()
         except Exception as e:
-            logger.error(f"Error getting system stats: {e}")
-            return self._get_fallback_system_stats()
+            logger.warning(f"Could not get CPU stats: {e}")
+            cpu_percent = 0.0
+
+        stats_data = {
+            "cpu_cores": self._get_cpu_count(),
+            "cpu_usage_percent": round(cpu_percent, 2),
+            "memory": memory_data,
+            "disk": disk_data,
+            "network": network_data,
+            "load_average": {
+                "1min": load_1min,
+                "5min": load_5min,
+                "15min": load_15min
+            },
+            "uptime_seconds": int(uptime_seconds),
+            "timestamp": datetime.now(timezone.utc).isoformat()
+        }
+
+        return stats_data
 
     def _get_fallback_system_stats(self):
         """Fallback system stats in case of errors"""
@@ -161,117 +230,198 @@ class DockerClient:
             "timestamp": datetime.now(timezone.utc).isoformat()
         }
 
-    def get_containers_info(self):
-        """Get detailed information about all containers with optimized parallel processing"""
+    @instrumented
+    def sample_host_metrics(self):
+        """Lightweight host sample for the metrics history and /metrics (counters are cumulative)"""
+        memory = psutil.virtual_memory()
+        disk = psutil.disk_usage('/')
+        net_io = psutil.net_io_counters()
         try:
-            containers = self.client.containers.list(all=True)
-            container_info_list = []
+            load_1min, load_5min, load_15min = psutil.getloadavg()
+        except (AttributeError, OSError):
+            load_1min = load_5min = load_15min = 0.0
+        return {
+            "cpu_percent": self._history_cpu(),
+            "cpu_cores": self._get_cpu_count(),
+            "memory_percent": memory.percent,
+            "memory_used_gb": memory.used / (1024 ** 3),
+            "memory_total_bytes": memory.total,
+            "memory_used_bytes": memory.used,
+            "memory_available_bytes": memory.available,
+            "disk_percent": (disk.used / disk.total) * 100 if disk.total else 0.0,
+            "disk_total_bytes": disk.total,
+            "disk_used_bytes": disk.used,
+            "disk_free_bytes": disk.free,
+            "net_rx_bytes": net_io.bytes_recv if net_io else 0,
+            "net_tx_bytes": net_io.bytes_sent if net_io else 0,
+            "net_rx_packets": net_io.packets_recv if net_io else 0,
+            "net_tx_packets": net_io.packets_sent if net_io else 0,
+            "load_1min": load_1min,
+            "load_5min": load_5min,
+            "load_15min": load_15min,
+            "uptime_seconds": time.time() - psutil.boot_time(),
+        }
 
-            def process_container(container):
-                try:
-                    # Initialize default values
-                    cpu_percent = 0.0
-                    mem_usage_mb = 0.0
-                    mem_limit_mb = 1.0
-                    mem_percent = 0.0
-                    network_rx_mb = 0.0
-                    network_tx_mb = 0.0
-
-                    # Get container creation time with error handling
-                    created_time = container.attrs.get('Created', '')
-                    if created_time:
-                        try:
-                            created_dt = datetime.fromisoformat(created_time.replace('Z', '+00:00'))
-                            created_time = created_dt.isoformat()
-                        except Exception:
-                            pass
-
-                    # Get network information with error handling
-                    networks = []
-                    try:
-                        network_settings = container.attrs.get('NetworkSettings', {})
-                        if network_settings.get('Networks'):
-                            networks = list(network_settings['Networks'].keys())
-                    except Exception:
-                        pass
+    @instrumented
+    def sample_container_metrics(self):
+        """{container_id: (name, sample)} for running containers from the collector's latest stats"""
+        if not self.inventory.ready:
+            return {}
+        samples = {}
+        for attrs in self.inventory.containers():
+            if attrs.get('State', {}).get('Status') != "running":
+                continue
+            stats = self.stats_collector.get(attrs['Id'])
+            if not stats:
+                continue
+            memory_stats = stats.get("memory_stats", {})
+            mem_usage = memory_stats.get("usage", 0)
+            mem_limit = memory_stats.get("limit", 0)
+            networks_stats = (stats.get("networks") or {}).values()
+            samples[attrs['Id']] = (attrs.get('Name', '').lstrip('/'), {
+                "cpu_percent": self._calculate_cpu_percent(stats),
+                "memory_mb": mem_usage / (1024 ** 2),
+                "memory_percent": (mem_usage / mem_limit) * 100 if mem_limit else 0.0,
+                "net_rx_bytes": sum(net.get("rx_bytes", 0) for net in networks_stats),
+                "net_tx_bytes": sum(net.get("tx_bytes", 0) for net in networks_stats),
+            })
+        return samples
+
+    def prometheus_containers(self):
+        """(labels, samples) per known container for /metrics, from the inventory and collector only"""
+        if not self.inventory.ready:
+            return []
+        containers = []
+        for attrs in self.inventory.containers():
+            stats = self.stats_collector.get(attrs['Id'])
+            labels = {
+                "id": attrs['Id'][:12],
+                "name": attrs.get('Name', '').lstrip('/'),
+                "image": self.inventory.image_name(attrs.get('Image', '')),
+                "network": ",".join(sorted((attrs.get('NetworkSettings', {}).get('Networks') or {}).keys())),
+            }
+            cpu_percent = self._calculate_cpu_percent(stats) if stats else 0.0
+            containers.append((labels, container_samples(attrs, stats, cpu_percent)))
+        return containers
 
-                    # Get image name with fallback
-                    try:
-                        image_name = container.image.tags[0] if container.image.tags else container.image.id[:12]
-                    except Exception:
-                        image_name = "unknown"
-
-                    # Get stats for running containers only (performance optimization)
-                    if container.status == "running":
-                        try:
-                            # Use timeout to prevent hanging
-                            stats = container.stats(stream=False)
-
-                            # Calculate CPU percentage with error handling
-                            cpu_percent = self._calculate_cpu_percent(stats)
-
-                            # Calculate memory usage with error handling
-                            memory_stats = stats.get("memory_stats", {})
-                            mem_usage_bytes = memory_stats.get("usage", 0)
-                            mem_limit_bytes = memory_stats.get("limit", 1)
-
-                            if mem_usage_bytes and mem_limit_bytes:
-                                mem_usage_mb = mem_usage_bytes / (1024 ** 2)
-                                mem_limit_mb = mem_limit_bytes / (1024 ** 2)
-                                mem_percent = (mem_usage_mb / mem_limit_mb) * 100 if mem_limit_mb else 0
-
-                            # Calculate network I/O with error handling
-                            networks_stats = stats.get("networks", {})
-                            if networks_stats:
-                                total_rx = sum(net.get("rx_bytes", 0) for net in networks_stats.values())
-                                total_tx = sum(net.get("tx_bytes", 0) for net in networks_stats.values())
-                                network_rx_mb = total_rx / (1024 ** 2)
-                                network_tx_mb = total_tx / (1024 ** 2)
-
-                        except Exception as e:
-                            logger.debug(f"Could not retrieve stats for container {container.name}: {e}")
-
-                    return {
-                        "id": container.id,
-                        "short_id": container.short_id,
-                        "name": container.name,
-                        "status": container.status,
-                        "image": image_name,
-                        "created": created_time,
-                        "cpu_percent": round(cpu_percent, 2),
-                        "memory_usage_mb": round(mem_usage_mb, 2),
-                        "memory_limit_mb": round(mem_limit_mb, 2),
-                        "memory_percent": round(mem_percent, 2),
-                        "network_rx_mb": round(network_rx_mb, 2),
-                        "network_tx_mb": round(network_tx_mb, 2),
-                        "networks": networks,
-                        "ports": self._get_container_ports(container),
-                        "labels": container.labels or {},
-                        "state": container.attrs.get('State', {}),
-                        "restart_count": container.attrs.get('RestartCount', 0)
-                    }
-                except Exception as e:
-                    logger.error(f"Error processing container {getattr(container, 'name', 'unknown')}: {e}")
-                    return None
-
-            # Process containers in parallel with reduced thread count for better performance
-            max_workers = min(8, len(containers))  # Limit concurrent threads
-            with ThreadPoolExecutor(max_workers=max_workers) as executor:
-                futures = {executor.submit(process_container, c): c for c in containers}
-                for future in as_completed(futures):
-                    result = future.result()
-                    if result:
-                        container_info_list.append(result)
+    @instrumented
+    @coalesced
+    def get_containers_info(self):
+        """Get the dashboard summary of all containers from one bulk listing"""
+        try:
+            # One bulk listing; docker-py's containers.list() would inspect every container
+            summaries = self.client.api.containers(all=True)
+            image_names = self._get_image_names()
+            container_info_list = []
+            for summary in summaries:
+                attrs = summary_attrs(summary)
+                info = self._build_container_info(attrs, image_display_name(attrs['Image'], image_names))
+                if info:
+                    container_info_list.append(info)
 
             return container_info_list
         except Exception as e:
             logger.error(f"Error getting containers info: {e}")
             return []
 
-    def _get_container_ports(self, container):
-        """Extract port mappings from container with error handling"""
+    def _build_container_info(self, attrs, image_name):
+        """Build the dashboard summary for a container from its inspect data"""
+        name = attrs.get('Name', '').lstrip('/')
+        try:
+            # Initialize default values
+            cpu_percent = 0.0
+            mem_usage_mb = 0.0
+            mem_limit_mb = 1.0
+            mem_percent = 0.0
+            network_rx_mb = 0.0
+            network_tx_mb = 0.0
+
+            # Get container creation time with error handling
+            created_time = attrs.get('Created', '')
+            if created_time:
+                try:
+                    created_dt = datetime.fromisoformat(created_time.replace('Z', '+00:00'))
+                    created_time = created_dt.isoformat()
+                except Exception:
+                    pass
+
+            # Get network information with error handling
+            networks = []
+            try:
+                network_settings = attrs.get('NetworkSettings', {})
+                if network_settings.get('Networks'):
+                    networks = list(network_settings['Networks'].keys())
+            except Exception:
+                pass
+
+            # Read the latest streamed sample for running containers
+            status = attrs.get('State', {}).get('Status')
+            stats = self._get_latest_stats(attrs['Id'], status)
+            if stats:
+                try:
+                    # Calculate CPU percentage with error handling
+                    cpu_percent = self._calculate_cpu_percent(stats)
+
+                    # Calculate memory usage with error handling
+                    memory_stats = stats.get("memory_stats", {})
+                    mem_usage_bytes = memory_stats.get("usage", 0)
+                    mem_limit_bytes = memory_stats.get("limit", 1)
+
+                    if mem_usage_bytes and mem_limit_bytes:
+                        mem_usage_mb = mem_usage_bytes / (1024 ** 2)
+                        mem_limit_mb = mem_limit_bytes / (1024 ** 2)
+                        mem_percent = (mem_usage_mb / mem_limit_mb) * 100 if mem_limit_mb else 0
+
+                    # Calculate network I/O with error handling
+                    networks_stats = stats.get("networks", {})
+                    if networks_stats:
+                        total_rx = sum(net.get("rx_bytes", 0) for net in networks_stats.values())
+                        total_tx = sum(net.get("tx_bytes", 0) for net in networks_stats.values())
+                        network_rx_mb = total_rx / (1024 ** 2)
+                        network_tx_mb = total_tx / (1024 ** 2)
+
+                except Exception as e:
+                    logger.debug(f"Could not retrieve stats for container {name}: {e}")
+
+            return {
+                "id": attrs['Id'],
+                "short_id": attrs['Id'][:12],
+                "name": name,
+                "status": status,
+                "image": image_name,
+                "created": created_time,
+                "cpu_percent": round(cpu_percent, 2),
+                "memory_usage_mb": round(mem_usage_mb, 2),
+                "memory_limit_mb": round(mem_limit_mb, 2),
+                "memory_percent": round(mem_percent, 2),
+                "network_rx_mb": round(network_rx_mb, 2),
+                "network_tx_mb": round(network_tx_mb, 2),
+                "networks": networks,
+                "ports": self._get_container_ports(attrs),
+                "labels": attrs.get('Config', {}).get('Labels') or {},
+                "state": attrs.get('State', {}),
+                # Only known once the container has been inspected (listings don't carry it)
+                "restart_count": attrs.get('RestartCount')
+            }
+        except Exception as e:
+            logger.error(f"Error processing container {name or 'unknown'}: {e}")
+            return None
+
+    def _get_latest_stats(self, container_id, status, stats_collector=None):
+        """Return the collector's latest stats sample for a running container"""
+        if status != "running":
+            return None
+        stats_collector = stats_collector or self.stats_collector
+        stats = stats_collector.get(container_id)
+        if stats is None:
+            # Not subscribed yet (e.g. started between resyncs); the next read has it
+            stats_collector.attach(container_id)
+        return stats
+
+    def _get_container_ports(self, attrs):
+        """Extract port mappings from container inspect data with error handling"""
         try:
-            ports = container.attrs.get('NetworkSettings', {}).get('Ports', {})
+            ports = attrs.get('NetworkSettings', {}).get('Ports', {})
             port_mappings = []
             for container_port, host_bindings in ports.items():
                 if host_bindings:
@@ -310,102 +460,97 @@ class DockerClient:
             logger.debug(f"Error calculating CPU percent: {e}")
             return 0.0
 
+    @instrumented
     def get_container_details(self, container_id):
         """Get detailed information about a specific container with caching"""
+        def load():
+            container = self.client.containers.get(container_id)
+            image_name = image_display_name(container.attrs.get('Image', ''), self._get_image_names())
+            return self._build_container_details(container.attrs, image_name)
+
         try:
-            # Check cache first
-            cache_key = f"container_details_{container_id}"
-            with self._cache_lock:
-                if cache_key in self._stats_cache:
-                    cache_time, cached_data = self._stats_cache[cache_key]
-                    if time.time() - cache_time < 2:  # 2 second cache for container details
-                        return cached_data
+            return self.cache.get_or_load(f"container_details_{container_id}", load)
 
-            container = self.client.containers.get(container_id)
+        except docker.errors.NotFound:
+            logger.error(f"Container {container_id} not found")
+            return None
+        except Exception as e:
+            logger.error(f"Error getting container details for {container_id}: {e}")
+            return None
 
-            # Get basic container info
-            container_info = {
-                "id": container.id,
-                "short_id": container.short_id,
-                "name": container.name,
-                "status": container.status,
-                "image": container.image.tags[0] if container.image.tags else container.image.id[:12],
-                "created": container.attrs.get('Created', ''),
-                "started": container.attrs.get('State', {}).get('StartedAt', ''),
-                "finished": container.attrs.get('State', {}).get('FinishedAt', ''),
-                "restart_count": container.attrs.get('RestartCount', 0),
-                "platform": container.attrs.get('Platform', 'unknown'),
-                "networks": list(container.attrs.get('NetworkSettings', {}).get('Networks', {}).keys()),
-                "ports": self._get_container_ports(container),
-                "mounts": [mount['Source'] + ':' + mount['Destination'] for mount in container.attrs.get('Mounts', [])],
-                "env_vars": container.attrs.get('Config', {}).get('Env', []),
-                "labels": container.labels or {},
-                "state": container.attrs.get('State', {})
-            }
+    def _build_container_details(self, attrs, image_name, stats_collector=None):
+        """Build the detail view for a container from its inspect data (and another host's collector)"""
+        name = attrs.get('Name', '').lstrip('/')
+        status = attrs.get('State', {}).get('Status')
+
+        # Get basic container info
+        container_info = {
+            "id": attrs['Id'],
+            "short_id": attrs['Id'][:12],
+            "name": name,
+            "status": status,
+            "image": image_name,
+            "created": attrs.get('Created', ''),
+            "started": attrs.get('State', {}).get('StartedAt', ''),
+            "finished": attrs.get('State', {}).get('FinishedAt', ''),
+            "restart_count": attrs.get('RestartCount'),
+            "platform": attrs.get('Platform', 'unknown'),
+            "networks": list(attrs.get('NetworkSettings', {}).get('Networks', {}).keys()),
+            "ports": self._get_container_ports(attrs),
+            "mounts": [mount['Source'] + ':' + mount['Destination'] for mount in attrs.get('Mounts', [])],
+            "env_vars": attrs.get('Config', {}).get('Env', []),
+            "labels": attrs.get('Config', {}).get('Labels') or {},
+            "state": attrs.get('State', {})
+        }
 
-            # Get real-time stats for running containers
-            if container.status == "running":
-                try:
-                    stats = container.stats(stream=False)
+        # Get real-time stats for running containers
+        stats = self._get_latest_stats(attrs['Id'], status, stats_collector)
+        if stats:
+            try:
+                # CPU stats
+                cpu_percent = self._calculate_cpu_percent(stats)
 
-                    # CPU stats
-                    cpu_percent = self._calculate_cpu_percent(stats)
+                # Memory stats
+                memory_stats = stats.get("memory_stats", {})
+                mem_usage = memory_stats.get("usage", 0)
+                mem_limit = memory_stats.get("limit", 1)
+                mem_cache = memory_stats.get("stats", {}).get("cache", 0)
 
-                    # Memory stats
-                    memory_stats = stats.get("memory_stats", {})
-                    mem_usage = memory_stats.get("usage", 0)
-                    mem_limit = memory_stats.get("limit", 1)
-                    mem_cache = memory_stats.get("stats", {}).get("cache", 0)
+                # Network stats
+                networks_stats = stats.get("networks", {})
+                total_rx = sum(net.get("rx_bytes", 0) for net in networks_stats.values())
+                total_tx = sum(net.get("tx_bytes", 0) for net in networks_stats.values())
 
-                    # Network stats
-                    networks_stats = stats.get("networks", {})
-                    total_rx = sum(net.get("rx_bytes", 0) for net in networks_stats.values())
-                    total_tx = sum(net.get("tx_bytes", 0) for net in networks_stats.values())
-
-                    # Block I/O stats
-                    blkio_stats = stats.get("blkio_stats", {})
-                    io_read = sum(item.get("value", 0) for item in blkio_stats.get("io_service_bytes_recursive", []) if item.get("op") == "Read")
-                    io_write = sum(item.get("value", 0) for item in blkio_stats.get("io_service_bytes_recursive", []) if item.get("op") == "Write")
-
-                    container_info.update({
-                        "cpu_percent": round(cpu_percent, 2),
-                        "memory_usage_mb": round(mem_usage / (1024**2), 2),
-                        "memory_limit_mb": round(mem_limit / (1024**2), 2),
-                        "memory_percent": round((mem_usage / mem_limit) * 100, 2) if mem_limit else 0,
-                        "memory_cache_mb": round(mem_cache / (1024**2), 2),
-                        "network_rx_mb": round(total_rx / (1024**2), 2),
-                        "network_tx_mb": round(total_tx / (1024**2), 2),
-                        "block_read_mb": round(io_read / (1024**2), 2),
-                        "block_write_mb": round(io_write / (1024**2), 2)
-                    })
-
-                    # Calculate uptime for running containers
-                    started_at = container_info.get('started')
-                    if started_at:
-                        try:
-                            started_dt = datetime.fromisoformat(started_at.replace('Z', '+00:00'))
-                            uptime_seconds = (datetime.now(timezone.utc) - started_dt).total_seconds()
-                            container_info['uptime_seconds'] = int(uptime_seconds)
-                        except Exception:
-                            container_info['uptime_seconds'] = 0
+                # Block I/O stats
+                blkio_stats = stats.get("blkio_stats", {})
+                io_read = sum(item.get("value", 0) for item in blkio_stats.get("io_service_bytes_recursive", []) if item.get("op") == "Read")
+                io_write = sum(item.get("value", 0) for item in blkio_stats.get("io_service_bytes_recursive", []) if item.get("op") == "Write")
 
-                except Exception as e:
-                    logger.warning(f"Could not retrieve real-time stats for container {container.name}: {e}")
-                    # Set default values for stats
-                    container_info.update({
-                        "cpu_percent": 0.0,
-                        "memory_usage_mb": 0.0,
-                        "memory_limit_mb": 0.0,
-                        "memory_percent": 0.0,
-                        "memory_cache_mb": 0.0,
-                        "network_rx_mb": 0.0,
-                        "network_tx_mb": 0.0,
-                        "block_read_mb": 0.0,
-                        "block_write_mb": 0.0,
-                        "uptime_seconds": 0
-                    })
-            else:
-                # Container is not running, set stats to zero
+                container_info.update({
+                    "cpu_percent": round(cpu_percent, 2),
+                    "memory_usage_mb": round(mem_usage / (1024**2), 2),
+                    "memory_limit_mb": round(mem_limit / (1024**2), 2),
+                    "memory_percent": round((mem_usage / mem_limit) * 100, 2) if mem_limit else 0,
+                    "memory_cache_mb": round(mem_cache / (1024**2), 2),
+                    "network_rx_mb": round(total_rx / (1024**2), 2),
+                    "network_tx_mb": round(total_tx / (1024**2), 2),
+                    "block_read_mb": round(io_read / (1024**2), 2),
+                    "block_write_mb": round(io_write / (1024**2), 2)
+                })
+
+                # Calculate uptime for running containers
+                started_at = container_info.get('started')
+                if started_at:
+                    try:
+                        started_dt = datetime.fromisoformat(started_at.replace('Z', '+00:00'))
+                        uptime_seconds = (datetime.now(timezone.utc) - started_dt).total_seconds()
+                        container_info['uptime_seconds'] = int(uptime_seconds)
+                    except Exception:
+                        container_info['uptime_seconds'] = 0
+
+            except Exception as e:
+                logger.warning(f"Could not retrieve real-time stats for container {name}: {e}")
+                # Set default values for stats
                 container_info.update({
                     "cpu_percent": 0.0,
                     "memory_usage_mb": 0.0,
@@ -418,20 +563,24 @@ class DockerClient:
                     "block_write_mb": 0.0,
                     "uptime_seconds": 0
                 })
-
-            # Cache the result
-            with self._cache_lock:
-                self._stats_cache[cache_key] = (time.time(), container_info)
-
-            return container_info
-
-        except docker.errors.NotFound:
-            logger.error(f"Container {container_id} not found")
-            return None
-        except Exception as e:
-            logger.error(f"Error getting container details for {container_id}: {e}")
-            return None
-
+        else:
+            # Container is not running (or has no sample yet), set stats to zero
+            container_info.update({
+                "cpu_percent": 0.0,
+                "memory_usage_mb": 0.0,
+                "memory_limit_mb": 0.0,
+                "memory_percent": 0.0,
+                "memory_cache_mb": 0.0,
+                "network_rx_mb": 0.0,
+                "network_tx_mb": 0.0,
+                "block_read_mb": 0.0,
+                "block_write_mb": 0.0,
+                "uptime_seconds": 0
+            })
+
+        return container_info
+
+    @instrumented
     def get_container_logs(self, container_id, tail=1000, since=None, follow=False):
         """Get container logs with enhanced options and error handling"""
         try:
@@ -466,71 +615,72 @@ class DockerClient:
             logger.error(f"Error getting logs for container {container_id}: {e}")
             return ""
 
+    @instrumented
+    @coalesced
     def get_container_networks(self):
         """Return all Docker networks with the containers connected to each - optimized"""
-        try:
-            # Check cache first
-            cache_key = "container_networks"
-            with self._cache_lock:
-                if cache_key in self._stats_cache:
-                    cache_time, cached_data = self._stats_cache[cache_key]
-                    if time.time() - cache_time < 10:  # 10 second cache for networks
-                        return cached_data
-
-            networks = self.client.networks.list()
-            network_info = {}
-
-            # Step 1: Initialize each network
-            for network in networks:
-                try:
-                    config = network.attrs.get('IPAM', {}).get('Config')
-                    if isinstance(config, list) and config and isinstance(config[0], dict):
-                        subnet = config[0].get('Subnet', 'unknown')
-                    else:
-                        subnet = 'unknown'
-
-                    network_info[network.name] = {
-                        'id': network.id,
-                        'name': network.name,
-                        'driver': network.attrs.get('Driver', 'unknown'),
-                        'scope': network.attrs.get('Scope', 'unknown'),
-                        'created': network.attrs.get('Created', ''),
-                        'containers': [],
-                        'subnet': subnet
-                    }
-                except Exception as e:
-                    logger.warning(f"Error processing network {network.name}: {e}")
+        def load():
+            networks = self.client.api.networks()
+            containers = [
+                (
+                    c['Id'],
+                    (c.get('Names') or [''])[0].lstrip('/'),
+                    c.get('State', ''),
+                    (c.get('NetworkSettings') or {}).get('Networks') or {}
+                )
+                for c in self.client.api.containers(all=True)
+            ]
+            return self._build_network_info(networks, containers)
 
-            # Step 2: Add containers into networks based on their NetworkSettings
-            containers = self.client.containers.list(all=True)
-            for container in containers:
-                try:
-                    container_id = container.id
-                    container_name = container.name
-                    container_status = container.status
-                    container_networks = container.attrs.get("NetworkSettings", {}).get("Networks", {})
-
-                    for net_name, net_info in container_networks.items():
-                        if net_name in network_info:
-                            network_info[net_name]["containers"].append({
-                                'id': container_id,
-                                'name': container_name,
-                                'status': container_status,
-                                'ip_address': net_info.get('IPAddress', '')
-                            })
-                except Exception as e:
-                    logger.warning(f"Error processing container {container.name} networks: {e}")
-
-            # Cache the result
-            with self._cache_lock:
-                self._stats_cache[cache_key] = (time.time(), network_info)
-
-            return network_info
+        try:
+            return self.cache.get_or_load("container_networks", load)
         except Exception as e:
             logger.error(f"Error getting network information: {e}")
             return {}
 
+    def _build_network_info(self, networks, containers):
+        """Group containers by network from network attrs and (id, name, status, networks) rows"""
+        network_info = {}
+
+        # Step 1: Initialize each network
+        for network in networks:
+            try:
+                config = network.get('IPAM', {}).get('Config')
+                if isinstance(config, list) and config and isinstance(config[0], dict):
+                    subnet = config[0].get('Subnet', 'unknown')
+                else:
+                    subnet = 'unknown'
+
+                network_info[network['Name']] = {
+                    'id': network['Id'],
+                    'name': network['Name'],
+                    'driver': network.get('Driver', 'unknown'),
+                    'scope': network.get('Scope', 'unknown'),
+                    'created': network.get('Created', ''),
+                    'containers': [],
+                    'subnet': subnet
+                }
+            except Exception as e:
+                logger.warning(f"Error processing network {network.get('Name')}: {e}")
+
+        # Step 2: Add containers into networks based on their NetworkSettings
+        for container_id, container_name, container_status, container_networks in containers:
+            try:
+                for net_name, net_info in (container_networks or {}).items():
+                    if net_name in network_info:
+                        network_info[net_name]["containers"].append({
+                            'id': container_id,
+                            'name': container_name,
+                            'status': container_status,
+                            'ip_address': net_info.get('IPAddress', '')
+                        })
+            except Exception as e:
+                logger.warning(f"Error processing container {container_name} networks: {e}")
+
+        return network_info
+
     # Container control methods with better error handling
+    @instrumented
     def start_container(self, container_id):
         """Start a container"""
         try:
@@ -545,6 +695,7 @@ class DockerClient:
             logger.error(f"Error starting container {container_id}: {e}")
             raise
 
+    @instrumented
     def stop_container(self, container_id):
         """Stop a container"""
         try:
@@ -559,6 +710,7 @@ class DockerClient:
             logger.error(f"Error stopping container {container_id}: {e}")
             raise
 
+    @instrumented
     def restart_container(self, container_id):
         """Restart a container"""
         try:
@@ -573,6 +725,7 @@ class DockerClient:
             logger.error(f"Error restarting container {container_id}: {e}")
             raise
 
+    @instrumented
     def remove_container(self, container_id, force=False):
         """Remove a container"""
         try:
@@ -588,36 +741,249 @@ class DockerClient:
             logger.error(f"Error removing container {container_id}: {e}")
             raise
 
+    def _get_image_names(self):
+        """{image id: first tag} from one bulk image listing, shared through the cache"""
+        try:
+            return self.cache.get_or_load("image_names", lambda: image_name_map(self.client.api.images()))
+        except Exception as e:
+            logger.warning(f"Could not list images: {e}")
+            return {}
+
     def _clear_container_cache(self, container_id):
         """Clear cache entries for a specific container"""
-        with self._cache_lock:
-            keys_to_remove = [key for key in self._stats_cache.keys()
-                            if key.startswith(f"container_details_{container_id}")]
-            for key in keys_to_remove:
-                del self._stats_cache[key]
-
-            # Also clear network cache as container state changed
-            if "container_networks" in self._stats_cache:
-                del self._stats_cache["container_networks"]
+        self.cache.invalidate_prefix(f"container_details_{container_id}")
+        # Also clear network cache as container state changed
+        self.cache.invalidate("container_networks")
 
+    @instrumented
+    @coalesced
     def get_docker_info(self):
         """Get Docker daemon information with caching"""
         try:
-            # Check cache first
-            cache_key = "docker_info"
-            with self._cache_lock:
-                if cache_key in self._stats_cache:
-                    cache_time, cached_data = self._stats_cache[cache_key]
-                    if time.time() - cache_time < 60:  # 1 minute cache for docker info
-                        return cached_data
+            return self.cache.get_or_load("docker_info", self.client.info)
+        except Exception as e:
+            logger.error(f"Error getting Docker info: {e}")
+            return {}
+    # Awaitable variants for the FastAPI handlers, built on the asyncio Engine client
+    @instrumented
+    @coalesced
+    async def get_system_stats_async(self):
+        """Get system statistics without blocking the event loop"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, self.get_system_stats)
+
+    @instrumented
+    @coalesced
+    async def get_containers_info_async(self):
+        """Awaitable get_containers_info, served from the inventory once it is loaded"""
+        if self.inventory.ready:
+            container_info_list = []
+            for attrs in self.inventory.containers():
+                info = self._build_container_info(attrs, self.inventory.image_name(attrs.get('Image', '')))
+                if info:
+                    container_info_list.append(info)
+            return container_info_list
 
-            info = self.client.info()
+        try:
+            summaries, image_names = await asyncio.gather(
+                self.engine.list_containers(all=True),
+                self._get_image_names_async()
+            )
+            container_info_list = []
+            for summary in summaries:
+                attrs = summary_attrs(summary)
+                info = self._build_container_info(attrs, image_display_name(attrs['Image'], image_names))
+                if info:
+                    container_info_list.append(info)
+            return container_info_list
+        except Exception as e:
+            logger.error(f"Error getting containers info: {e}")
+            return []
+
+    async def _get_image_names_async(self):
+        """Awaitable _get_image_names"""
+        async def load():
+            return image_name_map(await self.engine.list_images())
 
-            # Cache the result
-            with self._cache_lock:
-                self._stats_cache[cache_key] = (time.time(), info)
+        try:
+            return await self.cache.get_or_load_async("image_names", load)
+        except Exception as e:
+            logger.warning(f"Could not list images: {e}")
+            return {}
 
-            return info
+    @instrumented
+    @coalesced
+    async def get_container_details_async(self, container_id):
+        """Awaitable get_container_details"""
+        async def load():
+            # The detail view needs Env, RestartCount and the full State: always a full inspect
+            if self.inventory.ready:
+                attrs = await self.engine.inspect_container(container_id)
+                image_name = self.inventory.image_name(attrs.get('Image', ''))
+            else:
+                attrs, image_names = await asyncio.gather(
+                    self.engine.inspect_container(container_id),
+                    self._get_image_names_async()
+                )
+                image_name = image_display_name(attrs.get('Image', ''), image_names)
+            return self._build_container_details(attrs, image_name)
+
+        try:
+            return await self.cache.get_or_load_async(f"container_details_{container_id}", load)
+
+        except NotFound:
+            logger.error(f"Container {container_id} not found")
+            return None
+        except Exception as e:
+            logger.error(f"Error getting container details for {container_id}: {e}")
+            return None
+
+    @instrumented
+    async def get_container_logs_async(self, container_id, tail=1000, since=None, follow=False, engine=None):
+        """Awaitable get_container_logs; with follow=True returns an async line iterator.
+
+        ``engine`` reads from another Docker host instead of the local one.
+        """
+        engine = engine or self.engine
+        tail = min(tail, 5000)  # Limit max tail for performance
+        if follow:
+            return engine.stream_logs(container_id, tail=tail, since=since)
+        try:
+            return await engine.container_logs(container_id, tail=tail, since=since)
+        except NotFound:
+            logger.error(f"Container {container_id} not found")
+            return ""
+        except Exception as e:
+            logger.error(f"Error getting logs for container {container_id}: {e}")
+            return ""
+
+    @instrumented
+    async def iter_network_logs_async(self, containers, tail=500, engine_for=None):
+        """Yield {"container", "timestamp", "line"} for containers, merged by Docker timestamp.
+
+        Each container's log is already in time order, so a k-way merge streams
+        the result while holding one pending line per container. ``engine_for``
+        maps a container entry to the engine of its host (default: local).
+        """
+        tail = min(tail, 5000)  # Limit max tail for performance
+
+        async def container_entries(container):
+            engine = engine_for(container) if engine_for else self.engine
+            # Close the Engine stream as soon as the merge closes this source
+            async with aclosing(engine.stream_logs(container['id'], tail=tail, follow=False)) as lines:
+                async for raw in lines:
+                    entry = parse_log_line(raw)
+                    yield {"container": container['name'], **entry}
+
+        def sort_key(entry):
+            return parse_docker_timestamp(entry["timestamp"])
+
+        async with aclosing(merge_sorted_streams([container_entries(c) for c in containers], sort_key)) as merged:
+            async for entry in merged:
+                yield entry
+
+    @instrumented
+    @coalesced
+    async def get_container_networks_async(self):
+        """Awaitable get_container_networks, served from the inventory once it is loaded"""
+        if self.inventory.ready:
+            containers = [
+                (
+                    attrs['Id'],
+                    attrs.get('Name', '').lstrip('/'),
+                    attrs.get('State', {}).get('Status'),
+                    attrs.get('NetworkSettings', {}).get('Networks', {})
+                )
+                for attrs in self.inventory.containers()
+            ]
+            return self._build_network_info(self.inventory.networks(), containers)
+
+        async def load():
+            networks, summaries = await asyncio.gather(
+                self.engine.list_networks(),
+                self.engine.list_containers(all=True)
+            )
+            containers = [
+                (
+                    c['Id'],
+                    (c.get('Names') or [''])[0].lstrip('/'),
+                    c.get('State', ''),
+                    c.get('NetworkSettings', {}).get('Networks', {})
+                )
+                for c in summaries
+            ]
+            return self._build_network_info(networks, containers)
+
+        try:
+            return await self.cache.get_or_load_async("container_networks", load)
+        except Exception as e:
+            logger.error(f"Error getting network information: {e}")
+            return {}
+
+    @instrumented
+    async def start_container_async(self, container_id):
+        """Start a container"""
+        try:
+            await self.engine.start_container(container_id)
+            logger.info(f"Started container {container_id}")
+            self._clear_container_cache(container_id)
+            return True
+        except Exception as e:
+            logger.error(f"Error starting container {container_id}: {e}")
+            raise
+
+    @instrumented
+    async def stop_container_async(self, container_id):
+        """Stop a container"""
+        try:
+            await self.engine.stop_container(container_id, timeout=10)
+            logger.info(f"Stopped container {container_id}")
+            self._clear_container_cache(container_id)
+            return True
+        except Exception as e:
+            logger.error(f"Error stopping container {container_id}: {e}")
+            raise
+
+    @instrumented
+    async def restart_container_async(self, container_id):
+        """Restart a container"""
+        try:
+            await self.engine.restart_container(container_id, timeout=10)
+            logger.info(f"Restarted container {container_id}")
+            self._clear_container_cache(container_id)
+            return True
+        except Exception as e:
+            logger.error(f"Error restarting container {container_id}: {e}")
+            raise
+
+    @instrumented
+    async def remove_container_async(self, container_id, force=False):
+        """Remove a container"""
+        try:
+            await self.engine.remove_container(container_id, force=force)
+            logger.info(f"Removed container {container_id}")
+            self._clear_container_cache(container_id)
+            return True
+        except Exception as e:
+            logger.error(f"Error removing container {container_id}: {e}")
+            raise
+
+    @instrumented
+    @coalesced
+    async def get_docker_info_async(self):
+        """Awaitable get_docker_info"""
+        try:
+            return await self.cache.get_or_load_async("docker_info", self.engine.info)
         except Exception as e:
             logger.error(f"Error getting Docker info: {e}")
-            return {}
\ No newline at end of file
+            return {}
+
+    @instrumented
+    async def ping_async(self):
+        """Check the daemon is reachable; raises on failure"""
+        await self.engine.ping()
+        return True
+
+    def close(self):
+        """Release the blocking-call pool"""
+        self.executor.shutdown(wait=False, cancel_futures=True)
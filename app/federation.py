@@ -0,0 +1,296 @@
+import asyncio
+import logging
+import os
+from datetime import datetime, timezone
+from .docker_async import AsyncDockerEngine, NotFound
+from .inventory import image_display_name, image_name_map, summary_attrs
+from .log_mux import LogMultiplexer
+from .prometheus import container_samples
+from .stats_collector import AsyncStatsCollector
+
+logger = logging.getLogger(__name__)
+
+
+def parse_hosts(value):
+    """[(name, url)] from "name=url,name=url"; a bare url is named after its address"""
+    hosts = []
+    for item in (value or "").split(","):
+        item = item.strip()
+        if not item:
+            continue
+        name, sep, url = item.partition("=")
+        if not sep:
+            url = name
+            name = url.split("://", 1)[-1].rstrip("/") or url
+        hosts.append((name.strip(), url.strip()))
+    return hosts
+
+
+class RemoteHost:
+    """One extra Docker Engine endpoint with its own connection pool, stats and log streams"""
+
+    # Seconds an /images/json listing is reused for image names
+    IMAGE_NAMES_TTL = 30
+
+    def __init__(self, name, engine, timeout=5.0):
+        self.name = name
+        self.engine = engine
+        self.timeout = timeout
+        self.log_multiplexer = LogMultiplexer(engine)
+        # Streaming stats, so listings never wait for the daemon's two-sample stats call
+        self.stats_collector = AsyncStatsCollector(engine)
+        # From the latest listing: what host_for_container and /metrics know of this host
+        self.summaries = []
+        self.container_ids = set()
+        self._image_names = {}
+        self._images_loaded_at = None
+        self._unresolved_images = set()
+
+    async def _get_image_names(self, summaries):
+        """{image id: name} from one /images/json listing, reloaded when stale or a new image shows up"""
+        loop = asyncio.get_running_loop()
+        unknown = {s.get('ImageID') for s in summaries if s.get('ImageID')} - self._image_names.keys()
+        stale = self._images_loaded_at is None or loop.time() - self._images_loaded_at > self.IMAGE_NAMES_TTL
+        # Images that were missing from the last listing (e.g. deleted) don't force a reload
+        if stale or unknown - self._unresolved_images:
+            self._image_names = image_name_map(await self.engine.list_images())
+            self._images_loaded_at = loop.time()
+            self._unresolved_images = unknown - self._image_names.keys()
+        return self._image_names
+
+    def remember(self, summaries):
+        self.summaries = summaries
+        self.container_ids = {summary['Id'] for summary in summaries}
+
+    async def containers(self, calculate_cpu_percent):
+        """Container summaries with their latest streamed stats (zeros until the first sample)"""
+        summaries = await self.engine.list_containers(all=True)
+        self.remember(summaries)
+        self.stats_collector.sync({summary['Id'] for summary in summaries if summary.get('State') == "running"})
+        image_names = await self._get_image_names(summaries)
+        return [
+            summary_container_info(
+                summary, self.stats_collector.get(summary['Id']), calculate_cpu_percent, self.name,
+                image_display_name(summary.get('ImageID', ''), image_names)
+            )
+            for summary in summaries
+        ]
+
+    async def container_details(self, container_id, build_details):
+        """Detail view of one container on this host, or None if it does not exist"""
+        try:
+            attrs = await self.engine.inspect_container(container_id)
+        except NotFound:
+            return None
+        image_names = await self._get_image_names([{"ImageID": attrs.get('Image')}])
+        image_name = image_display_name(attrs.get('Image', ''), image_names)
+        return {**build_details(attrs, image_name, self.stats_collector), "host": self.name}
+
+    def prometheus_containers(self, calculate_cpu_percent):
+        """(labels, samples) per container of the latest listing, with streamed stats"""
+        containers = []
+        for summary in self.summaries:
+            attrs = summary_attrs(summary)
+            stats = self.stats_collector.get(attrs['Id'])
+            labels = {
+                "id": attrs['Id'][:12],
+                "name": attrs['Name'].lstrip('/'),
+                "image": image_display_name(attrs['Image'], self._image_names),
+                "network": ",".join(sorted(attrs['NetworkSettings']['Networks'].keys())),
+                "host": self.name,
+            }
+            cpu_percent = calculate_cpu_percent(stats) if stats else 0.0
+            containers.append((labels, container_samples(attrs, stats, cpu_percent)))
+        return containers
+
+    async def close(self):
+        await self.stats_collector.stop()
+        await self.log_multiplexer.close()
+        await self.engine.close()
+
+
+def summary_container_info(summary, stats, calculate_cpu_percent, host, image_name):
+    """Dashboard container entry built from a /containers/json summary and an optional stats sample"""
+    cpu_percent = mem_usage_mb = mem_percent = network_rx_mb = network_tx_mb = 0.0
+    mem_limit_mb = 1.0
+    if stats:
+        cpu_percent = calculate_cpu_percent(stats)
+        memory_stats = stats.get("memory_stats", {})
+        if memory_stats.get("usage") and memory_stats.get("limit"):
+            mem_usage_mb = memory_stats["usage"] / (1024 ** 2)
+            mem_limit_mb = memory_stats["limit"] / (1024 ** 2)
+            mem_percent = (mem_usage_mb / mem_limit_mb) * 100
+        networks_stats = (stats.get("networks") or {}).values()
+        network_rx_mb = sum(net.get("rx_bytes", 0) for net in networks_stats) / (1024 ** 2)
+        network_tx_mb = sum(net.get("tx_bytes", 0) for net in networks_stats) / (1024 ** 2)
+
+    ports = []
+    for port in summary.get('Ports') or []:
+        container_port = f"{port.get('PrivatePort')}/{port.get('Type', 'tcp')}"
+        ports.append(f"{port['PublicPort']}:{container_port}" if port.get('PublicPort') else container_port)
+
+    created = summary.get('Created')
+    status = summary.get('State', '')
+    return {
+        "id": summary['Id'],
+        "short_id": summary['Id'][:12],
+        "name": (summary.get('Names') or [''])[0].lstrip('/'),
+        "status": status,
+        "image": image_name,
+        "created": datetime.fromtimestamp(created, timezone.utc).isoformat() if created else '',
+        "cpu_percent": round(cpu_percent, 2),
+        "memory_usage_mb": round(mem_usage_mb, 2),
+        "memory_limit_mb": round(mem_limit_mb, 2),
+        "memory_percent": round(mem_percent, 2),
+        "network_rx_mb": round(network_rx_mb, 2),
+        "network_tx_mb": round(network_tx_mb, 2),
+        "networks": list(((summary.get('NetworkSettings') or {}).get('Networks') or {}).keys()),
+        "ports": ports,
+        "labels": summary.get('Labels') or {},
+        "state": {"Status": status, "Running": status == "running"},
+        # Not in a /containers/json summary
+        "restart_count": None,
+        "host": host,
+    }
+
+
+class DockerFederation:
+    """Aggregate the local DockerClient with any number of remote Engine endpoints.
+
+    Queries fan out to every host concurrently, each bounded by its own
+    timeout, so a slow or unreachable host only drops its own results.
+    Entries carry a ``host`` field; networks of remote hosts are keyed
+    ``name@host`` so they never collide with local ones.
+    """
+
+    def __init__(self, local, hosts=(), local_name="local", timeout=5.0):
+        self.local = local
+        self.local_name = local_name
+        self.hosts = {}
+        for name, url in hosts:
+            engine = AsyncDockerEngine.from_url(url, timeout=timeout)
+            self.hosts[name] = RemoteHost(name, engine, timeout=timeout)
+
+    @classmethod
+    def from_env(cls, local):
+        """Remote hosts from LOGIQUE_DOCKER_HOSTS ("name=tcp://host:2375,name=unix:///path").
+
+        LOGIQUE_HOST_NAME names the local host (default "local") and
+        LOGIQUE_HOST_TIMEOUT bounds each remote host's reply in seconds.
+        """
+        return cls(
+            local,
+            hosts=parse_hosts(os.environ.get("LOGIQUE_DOCKER_HOSTS", "")),
+            local_name=os.environ.get("LOGIQUE_HOST_NAME", "local"),
+            timeout=float(os.environ.get("LOGIQUE_HOST_TIMEOUT", 5))
+        )
+
+    async def _fan_out(self, query, empty):
+        """{host name: result} for every remote host; failures and timeouts yield empty"""
+        async def run(host):
+            try:
+                return await asyncio.wait_for(query(host), timeout=host.timeout)
+            except Exception as e:
+                logger.warning(f"Docker host {host.name} did not answer: {str(e) or type(e).__name__}")
+                return empty
+        results = await asyncio.gather(*(run(host) for host in self.hosts.values()))
+        return dict(zip(self.hosts, results))
+
+    async def containers(self):
+        """Containers from every host, each tagged with its host"""
+        local, remote = await asyncio.gather(
+            self.local.get_containers_info_async(),
+            self._fan_out(lambda host: host.containers(self.local._calculate_cpu_percent), [])
+        )
+        merged = [{**container, "host": self.local_name} for container in local]
+        for containers in remote.values():
+            merged.extend(containers)
+        return merged
+
+    async def networks(self):
+        """Networks from every host; remote ones are keyed name@host"""
+        async def remote_networks(host):
+            networks, summaries = await asyncio.gather(
+                host.engine.list_networks(),
+                host.engine.list_containers(all=True)
+            )
+            host.remember(summaries)
+            rows = [
+                (
+                    c['Id'],
+                    (c.get('Names') or [''])[0].lstrip('/'),
+                    c.get('State', ''),
+                    (c.get('NetworkSettings') or {}).get('Networks', {})
+                )
+                for c in summaries
+            ]
+            return self.local._build_network_info(networks, rows)
+
+        local, remote = await asyncio.gather(
+            self.local.get_container_networks_async(),
+            self._fan_out(remote_networks, {})
+        )
+        merged = {name: {**network, "host": self.local_name} for name, network in local.items()}
+        for host_name, networks in remote.items():
+            for name, network in networks.items():
+                merged[f"{name}@{host_name}"] = {
+                    **network,
+                    "host": host_name,
+                    "containers": [{**c, "host": host_name} for c in network["containers"]],
+                }
+        return merged
+
+    def host_for_container(self, container_id):
+        """The RemoteHost last seen with container_id (full id or prefix), or None for local"""
+        if not self.hosts or self.local.inventory.get_container(container_id) is not None:
+            return None
+        for host in self.hosts.values():
+            for known_id in host.container_ids:
+                if known_id == container_id or known_id.startswith(container_id):
+                    return host
+        return None
+
+    async def container_details(self, container_id):
+        """Detail view of a container from whichever host has it, or None"""
+        host = self.host_for_container(container_id)
+        if host is None:
+            details = await self.local.get_container_details_async(container_id)
+            return {**details, "host": self.local_name} if details else None
+        try:
+            return await asyncio.wait_for(
+                host.container_details(container_id, self.local._build_container_details), timeout=host.timeout
+            )
+        except Exception as e:
+            logger.error(f"Error getting container details for {container_id} on {host.name}: {e}")
+            return None
+
+    async def container_action(self, container_id, action, **kwargs):
+        """Start, stop, restart or remove a container on whichever host has it"""
+        host = self.host_for_container(container_id)
+        if host is None:
+            return await getattr(self.local, f"{action}_container_async")(container_id, **kwargs)
+        await getattr(host.engine, f"{action}_container")(container_id, **kwargs)
+        logger.info(f"Ran {action} on container {container_id} on {host.name}")
+        return True
+
+    def prometheus_containers(self):
+        """/metrics container series for every host; labelled by host once there are remote ones"""
+        containers = self.local.prometheus_containers()
+        if not self.hosts:
+            return containers
+        containers = [({**labels, "host": self.local_name}, samples) for labels, samples in containers]
+        for host in self.hosts.values():
+            containers.extend(host.prometheus_containers(self.local._calculate_cpu_percent))
+        return containers
+
+    def engine_for(self, container):
+        host = self.hosts.get(container.get('host'))
+        return host.engine if host else self.local.engine
+
+    def multiplexer_for(self, container):
+        host = self.hosts.get(container.get('host'))
+        return host.log_multiplexer if host else self.local.log_multiplexer
+
+    async def close(self):
+        for host in self.hosts.values():
+            await host.close()
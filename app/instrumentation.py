@@ -0,0 +1,370 @@
+import contextvars
+import functools
+import inspect
+import os
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from urllib.parse import urlsplit
+
+# Histogram upper bounds in seconds; slower observations land in +Inf
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# The DockerClient method currently running, so daemon requests can be attributed to it
+current_call = contextvars.ContextVar("current_docker_call", default=None)
+
+# Engine API paths with their object ids replaced, e.g. /containers/{id}/logs
+_ENGINE_OBJECT = re.compile(r"/(containers|networks|images|volumes|exec)/(?!json$)[^/]+")
+_API_VERSION = re.compile(r"^/v[\d.]+(?=/)")
+# Trailing counters and ids in thread names: docker-client_3, stats-0123456789ab, Thread-4 (run)
+_THREAD_SUFFIX = re.compile(r"(?:[-_ ](?:\d+|[0-9a-f]{12}))+(?: \(.*\))?$")
+
+
+class Histogram:
+    """Fixed-bucket latency histogram with count, error count, sum and max"""
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.errors = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds, error=False):
+        index = 0
+        while index < len(self.buckets) and seconds > self.buckets[index]:
+            index += 1
+        self.counts[index] += 1
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        if error:
+            self.errors += 1
+
+    def quantile(self, fraction):
+        """Upper bound of the bucket holding the given quantile (the max for +Inf)"""
+        if not self.count:
+            return 0.0
+        rank = fraction * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank and count:
+                return self.buckets[index] if index < len(self.buckets) else self.max
+        return self.max
+
+    def snapshot(self):
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "total_ms": round(self.total * 1000, 3),
+            "mean_ms": round(self.total / self.count * 1000, 3) if self.count else 0.0,
+            "p50_ms": round(min(self.quantile(0.5), self.max) * 1000, 3),
+            "p90_ms": round(min(self.quantile(0.9), self.max) * 1000, 3),
+            "p99_ms": round(min(self.quantile(0.99), self.max) * 1000, 3),
+            "max_ms": round(self.max * 1000, 3),
+            "buckets": {
+                **{f"le_{bound * 1000:g}ms": count for bound, count in zip(self.buckets, self.counts)},
+                "inf": self.counts[-1],
+            },
+        }
+
+
+class Instrumentation:
+    """Latency histograms by kind and name, plus gauges of what is live right now.
+
+    Kinds used by Logique: ``http`` (per route), ``websocket_send`` (per
+    websocket route, one observation per message), ``docker_method`` (per
+    DockerClient method, as its callers see it), ``docker_api`` (per daemon
+    request, named ``(calling method, "GET /containers/{id}/json")``) and
+    ``task`` (periodic background work).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._histograms = {}
+        self._active = Counter()
+        self.started = time.time()
+
+    def observe(self, kind, name, seconds, error=False):
+        with self._lock:
+            histogram = self._histograms.get((kind, name))
+            if histogram is None:
+                histogram = self._histograms[(kind, name)] = Histogram()
+            histogram.observe(seconds, error)
+
+    @contextmanager
+    def measure(self, kind, name):
+        """Time the block; an exception counts as an error (cancellation does not) and propagates"""
+        started = time.perf_counter()
+        error = False
+        try:
+            yield
+        except Exception:
+            error = True
+            raise
+        finally:
+            self.observe(kind, name, time.perf_counter() - started, error)
+
+    def track(self, gauge, delta):
+        with self._lock:
+            self._active[gauge] += delta
+            if not self._active[gauge]:
+                del self._active[gauge]
+
+    def active(self):
+        with self._lock:
+            return dict(self._active)
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+            self.started = time.time()
+
+    def snapshot(self):
+        """{kind: {name: histogram}}, slowest total time first; tuple names nest one level"""
+        with self._lock:
+            items = [(kind, name, histogram.snapshot()) for (kind, name), histogram in self._histograms.items()]
+        items.sort(key=lambda item: item[2]["total_ms"], reverse=True)
+        result = {}
+        for kind, name, histogram in items:
+            group = result.setdefault(kind, {})
+            if isinstance(name, tuple):
+                group = group.setdefault(name[0], {})
+                name = name[1]
+            group[name] = histogram
+        return result
+
+
+# Process-wide registry shared by the middleware, DockerClient and the Engine clients
+instrumentation = Instrumentation()
+
+
+def engine_route(method, path):
+    """Daemon request name attributed to the running DockerClient method"""
+    path = _ENGINE_OBJECT.sub(r"/\1/{id}", _API_VERSION.sub("", path))
+    return (current_call.get() or "other", f"{method} {path}")
+
+
+def record_docker_response(response, *args, **kwargs):
+    """requests response hook timing docker-py's daemon calls (to the response headers)"""
+    name = engine_route(response.request.method, urlsplit(response.request.url).path)
+    instrumentation.observe("docker_api", name, response.elapsed.total_seconds(), response.status_code >= 400)
+
+
+def instrumented(method):
+    """Time a DockerClient method and attribute the daemon requests it makes to it.
+
+    Put it above ``@coalesced`` so callers that join an in-flight run are
+    timed too. An async generator is timed from its first step to its last.
+    """
+    name = method.__name__
+
+    if inspect.isasyncgenfunction(method):
+        @functools.wraps(method)
+        async def asyncgen_wrapper(self, *args, **kwargs):
+            generator = method(self, *args, **kwargs)
+            with instrumentation.measure("docker_method", name):
+                try:
+                    while True:
+                        # Set only while the generator runs, not while its consumer does
+                        token = current_call.set(name)
+                        try:
+                            item = await generator.__anext__()
+                        except StopAsyncIteration:
+                            break
+                        finally:
+                            current_call.reset(token)
+                        yield item
+                finally:
+                    await generator.aclose()
+        return asyncgen_wrapper
+
+    if inspect.iscoroutinefunction(method):
+        @functools.wraps(method)
+        async def async_wrapper(self, *args, **kwargs):
+            token = current_call.set(name)
+            try:
+                with instrumentation.measure("docker_method", name):
+                    return await method(self, *args, **kwargs)
+            finally:
+                current_call.reset(token)
+        return async_wrapper
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        token = current_call.set(name)
+        try:
+            with instrumentation.measure("docker_method", name):
+                return method(self, *args, **kwargs)
+        finally:
+            current_call.reset(token)
+    return wrapper
+
+
+def route_name(scope):
+    route = scope.get("route")
+    return getattr(route, "path", None) or "(unmatched)"
+
+
+class InstrumentationMiddleware:
+    """Record HTTP latency per route and websocket send latency per message.
+
+    HTTP requests are timed until the last body chunk is sent, so streamed
+    responses count their full duration. Open requests and websockets are
+    tracked as ``http_in_flight`` and ``websocket <route>`` gauges.
+    """
+
+    def __init__(self, app, registry=instrumentation):
+        self.app = app
+        self.registry = registry
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http":
+            await self._http(scope, receive, send)
+        elif scope["type"] == "websocket":
+            await self._websocket(scope, receive, send)
+        else:
+            await self.app(scope, receive, send)
+
+    async def _http(self, scope, receive, send):
+        started = time.perf_counter()
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        self.registry.track("http_in_flight", 1)
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            self.registry.track("http_in_flight", -1)
+            self.registry.observe(
+                "http", f"{scope['method']} {route_name(scope)}", time.perf_counter() - started, status >= 500
+            )
+
+    async def _websocket(self, scope, receive, send):
+        gauge = None
+
+        async def timed_send(message):
+            nonlocal gauge
+            if message["type"] == "websocket.accept":
+                # The route is known once the router has matched
+                gauge = f"websocket {route_name(scope)}"
+                self.registry.track(gauge, 1)
+            if message["type"] != "websocket.send":
+                await send(message)
+                return
+            with self.registry.measure("websocket_send", route_name(scope)):
+                await send(message)
+
+        try:
+            await self.app(scope, receive, timed_send)
+        finally:
+            if gauge:
+                self.registry.track(gauge, -1)
+
+
+def thread_group(name):
+    """Thread name without its counter or id suffix, for counting threads by pool"""
+    return _THREAD_SUFFIX.sub("", name) or name
+
+
+def thread_counts():
+    return dict(Counter(thread_group(thread.name) for thread in threading.enumerate()).most_common())
+
+
+class SamplingProfiler:
+    """Wall-clock sampling profiler over every thread, for brief use in production.
+
+    A daemon thread records each other thread's stack every ``interval``
+    seconds until stopped or ``max_seconds`` pass. Stacks are aggregated in the
+    folded format (``thread;outer;inner count`` per line) that flamegraph.pl
+    and speedscope read. Idle threads show up in their wait calls.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._thread = None
+        self._stop_event = threading.Event()
+        self._stacks = Counter()
+        self.samples = 0
+        self.interval = None
+        self.started_at = None
+        self.stopped_at = None
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, interval=0.005, max_seconds=300):
+        """Start sampling; False if already running"""
+        with self._lock:
+            if self.running:
+                return False
+            self._stacks = Counter()
+            self.samples = 0
+            self.interval = interval
+            self.started_at = time.time()
+            self.stopped_at = None
+            self._stop_event = threading.Event()
+            self._thread = threading.Thread(
+                target=self._run, args=(self._stop_event, interval, max_seconds),
+                name="sampling-profiler", daemon=True
+            )
+            self._thread.start()
+            return True
+
+    def stop(self):
+        """Stop sampling and return the folded stacks collected"""
+        with self._lock:
+            thread = self._thread
+            self._stop_event.set()
+        if thread is not None:
+            thread.join()
+        return self.folded()
+
+    def status(self):
+        return {
+            "running": self.running,
+            "interval_ms": self.interval * 1000 if self.interval else None,
+            "samples": self.samples,
+            "started_at": self.started_at,
+            "stopped_at": self.stopped_at,
+        }
+
+    def folded(self):
+        with self._lock:
+            stacks = self._stacks.most_common()
+        return "".join(f"{stack} {count}\n" for stack, count in stacks)
+
+    def _run(self, stop_event, interval, max_seconds):
+        own = threading.get_ident()
+        deadline = time.monotonic() + max_seconds
+        while not stop_event.wait(interval) and time.monotonic() < deadline:
+            names = {thread.ident: thread_group(thread.name) for thread in threading.enumerate()}
+            sampled = Counter()
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                    frame = frame.f_back
+                stack.append(names.get(ident, "thread"))
+                sampled[";".join(reversed(stack))] += 1
+            with self._lock:
+                self._stacks.update(sampled)
+                self.samples += 1
+        self.stopped_at = time.time()
+
+
+profiler = SamplingProfiler()
@@ -0,0 +1,248 @@
+import asyncio
+import logging
+import time
+from datetime import datetime, timezone
+from .docker_async import NotFound
+
+logger = logging.getLogger(__name__)
+
+# Container actions that change what the dashboard shows and need a re-inspect
+CONTAINER_REFRESH_ACTIONS = {
+    "create", "start", "restart", "die", "stop", "kill",
+    "pause", "unpause", "rename", "update", "oom"
+}
+
+# Image actions that can change which tag an image id shows as
+IMAGE_REFRESH_ACTIONS = {"pull", "tag", "untag", "delete", "import", "load"}
+
+
+def image_name_map(images):
+    """{image id: display name} from one /images/json listing: the first tag, else the short id"""
+    names = {}
+    for image in images:
+        tags = [tag for tag in image.get('RepoTags') or [] if tag != "<none>:<none>"]
+        names[image['Id']] = tags[0] if tags else image['Id'].split(':')[-1][:12]
+    return names
+
+
+def image_display_name(image_id, names):
+    return names.get(image_id) or image_id.split(':')[-1][:12] or "unknown"
+
+
+def summary_attrs(summary):
+    """Inspect-shaped attrs from one /containers/json entry.
+
+    Fills the fields the dashboard, network, metrics and log views read, so a
+    listing needs no per-container inspect. Config.Env, RestartCount and the
+    rest of State are only in a full inspect, so they are left out rather
+    than guessed.
+    """
+    ports = {}
+    for port in summary.get('Ports') or []:
+        key = f"{port.get('PrivatePort')}/{port.get('Type', 'tcp')}"
+        if port.get('PublicPort'):
+            binding = {"HostIp": port.get('IP', ''), "HostPort": str(port['PublicPort'])}
+            ports[key] = (ports.get(key) or []) + [binding]
+        else:
+            ports.setdefault(key, None)
+
+    created = summary.get('Created')
+    state = summary.get('State', '')
+    return {
+        "Id": summary['Id'],
+        "Name": "/" + (summary.get('Names') or [''])[0].lstrip('/'),
+        "Image": summary.get('ImageID', ''),
+        "Created": datetime.fromtimestamp(created, timezone.utc).isoformat() if created else '',
+        "State": {"Status": state, "Running": state == "running"},
+        "Config": {"Image": summary.get('Image', ''), "Labels": summary.get('Labels') or {}},
+        "NetworkSettings": {
+            "Networks": (summary.get('NetworkSettings') or {}).get('Networks') or {},
+            "Ports": ports,
+        },
+        "Mounts": summary.get('Mounts') or [],
+    }
+
+
+class DockerInventory:
+    """In-memory index of containers and networks kept current from the events stream.
+
+    A full load happens once on start (and after every reconnect) from the bulk
+    container, network and image listings; from then on each event patches
+    only the affected container or network, so readers can serve inventory
+    queries without calling the daemon. Loaded containers hold summary attrs
+    (see summary_attrs); containers refreshed by an event hold a full inspect.
+    """
+
+    def __init__(self, engine, stats_collector=None):
+        self.engine = engine
+        self.stats_collector = stats_collector
+        self.ready = False
+        self.version = 0
+        self._containers = {}
+        self._networks = {}
+        self._image_names = {}
+        self._changed = asyncio.Condition()
+        self._task = None
+
+    def start(self):
+        """Start the supervised events consumer on the running loop"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self.ready = False
+
+    # Readers
+    def containers(self):
+        """Inspect data for every known container"""
+        return list(self._containers.values())
+
+    def get_container(self, container_id):
+        """Inspect data for a container by full id, id prefix or name"""
+        attrs = self._containers.get(container_id)
+        if attrs is not None:
+            return attrs
+        for attrs in self._containers.values():
+            if attrs['Id'].startswith(container_id) or attrs.get('Name', '').lstrip('/') == container_id:
+                return attrs
+        return None
+
+    def networks(self):
+        """Network attrs as returned by the Engine's network list"""
+        return list(self._networks.values())
+
+    def image_name(self, image_id):
+        return image_display_name(image_id, self._image_names)
+
+    async def wait_for_change(self, version):
+        """Wait until the index moves past version and return the new version"""
+        async with self._changed:
+            await self._changed.wait_for(lambda: self.version != version)
+            return self.version
+
+    # Consumer
+    async def _run(self):
+        backoff = 1
+        while True:
+            try:
+                # Subscribe from before the load so nothing between the two is missed
+                since = int(time.time())
+                await self._load()
+                backoff = 1
+                async for event in self.engine.events(filters={"type": ["container", "network", "image"]}, since=since):
+                    try:
+                        await self._apply(event)
+                    except Exception as e:
+                        logger.warning(f"Could not apply Docker event {event.get('Action')}: {e}")
+                logger.warning("Docker events stream ended, reloading inventory")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Docker inventory consumer failed, retrying in {backoff}s: {e}")
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, 30)
+
+    async def _load(self):
+        networks, summaries, images = await asyncio.gather(
+            self.engine.list_networks(),
+            self.engine.list_containers(all=True),
+            self.engine.list_images()
+        )
+        containers = {}
+        for summary in summaries:
+            attrs = summary_attrs(summary)
+            known = self._containers.get(attrs['Id'])
+            if known and 'RestartCount' in known and known['State'].get('Status') == attrs['State']['Status']:
+                # Keep what an earlier inspect learned while the container's state is unchanged
+                attrs['RestartCount'] = known['RestartCount']
+                attrs['State'] = known['State']
+            containers[attrs['Id']] = attrs
+
+        self._containers = containers
+        self._networks = {network['Id']: network for network in networks}
+        self._image_names = image_name_map(images)
+        self.ready = True
+
+        if self.stats_collector:
+            self.stats_collector.sync({
+                container_id for container_id, attrs in containers.items()
+                if attrs.get('State', {}).get('Status') == "running"
+            })
+        await self._notify()
+
+    async def _apply(self, event):
+        event_type = event.get("Type")
+        action = event.get("Action", "")
+        actor = event.get("Actor", {})
+
+        if event_type == "container":
+            container_id = actor.get("ID")
+            if action == "destroy":
+                self._containers.pop(container_id, None)
+                if self.stats_collector:
+                    self.stats_collector.detach(container_id)
+            elif action in CONTAINER_REFRESH_ACTIONS or action.startswith("health_status"):
+                await self._refresh_container(container_id)
+                if self.stats_collector:
+                    if action in ("start", "unpause", "restart"):
+                        self.stats_collector.attach(container_id)
+                    elif action == "die":
+                        self.stats_collector.detach(container_id)
+            else:
+                return
+
+        elif event_type == "network":
+            network_id = actor.get("ID")
+            if action == "create":
+                try:
+                    self._networks[network_id] = await self.engine.inspect_network(network_id)
+                except NotFound:
+                    return
+            elif action == "destroy":
+                self._networks.pop(network_id, None)
+            elif action in ("connect", "disconnect"):
+                await self._refresh_container(actor.get("Attributes", {}).get("container"))
+            else:
+                return
+
+        elif event_type == "image":
+            if action not in IMAGE_REFRESH_ACTIONS:
+                return
+            await self._load_images()
+        else:
+            return
+
+        await self._notify()
+
+    async def _refresh_container(self, container_id):
+        if not container_id:
+            return
+        attrs = await self._inspect_container(container_id)
+        if attrs is None:
+            self._containers.pop(container_id, None)
+            return
+        if attrs.get('Image') and attrs['Image'] not in self._image_names:
+            await self._load_images()
+        self._containers[attrs['Id']] = attrs
+
+    async def _inspect_container(self, container_id):
+        try:
+            return await self.engine.inspect_container(container_id)
+        except NotFound:
+            return None
+
+    async def _load_images(self):
+        """Replace the image name map with one bulk image listing"""
+        self._image_names = image_name_map(await self.engine.list_images())
+
+    async def _notify(self):
+        async with self._changed:
+            self.version += 1
+            self._changed.notify_all()
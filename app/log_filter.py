@@ -0,0 +1,55 @@
+import re
+
+# Same keyword rules as the dashboard: each level also keeps the more severe ones
+LEVEL_PATTERNS = {
+    "error": re.compile(r"error", re.IGNORECASE),
+    "warning": re.compile(r"warn|error", re.IGNORECASE),
+    "info": re.compile(r"info|warn|error", re.IGNORECASE),
+}
+
+
+class LogFilter:
+    """Level, keyword and regex matcher applied to log lines before they are encoded.
+
+    Patterns are compiled once per filter change rather than per line. An
+    empty filter matches everything.
+    """
+
+    def __init__(self, level=None, contains=None, regex=None):
+        self.update(level=level, contains=contains, regex=regex)
+
+    def update(self, level=None, contains=None, regex=None):
+        """Replace the filter; raises ValueError for an unknown level or bad regex"""
+        level = (level or "all").lower()
+        if level not in LEVEL_PATTERNS and level not in ("all", "debug"):
+            raise ValueError(f"Unknown log level: {level}")
+        try:
+            compiled_regex = re.compile(regex) if regex else None
+        except re.error as e:
+            raise ValueError(f"Invalid regex: {e}")
+
+        # Build every matcher before swapping any in, so a bad update changes nothing
+        self.level = level
+        self.contains = contains or None
+        self.regex = regex or None
+        self._matchers = [
+            matcher for matcher in (
+                LEVEL_PATTERNS.get(level),
+                re.compile(re.escape(contains), re.IGNORECASE) if contains else None,
+                compiled_regex,
+            )
+            if matcher is not None
+        ]
+
+    @property
+    def active(self):
+        return bool(self._matchers)
+
+    def matches(self, line):
+        for matcher in self._matchers:
+            if not matcher.search(line):
+                return False
+        return True
+
+    def to_dict(self):
+        return {"level": self.level, "contains": self.contains, "regex": self.regex}
@@ -0,0 +1,63 @@
+import asyncio
+import heapq
+import logging
+
+logger = logging.getLogger(__name__)
+
+_EXHAUSTED = object()
+
+
+async def _advance(iterator):
+    try:
+        return await iterator.__anext__()
+    except StopAsyncIteration:
+        return _EXHAUSTED
+    except Exception as e:
+        logger.warning(f"Log stream ended early while merging: {e}")
+        return _EXHAUSTED
+
+
+async def merge_sorted_streams(streams, key):
+    """Merge async iterators that are each already ordered by key.
+
+    Holds one pending item per stream in a heap, so memory is bounded by the
+    number of streams rather than the number of items. Items whose key is
+    None inherit the previous key of their own stream, keeping them next to
+    the line they followed. Every source is closed when the merge finishes
+    or is closed early.
+    """
+    iterators = [stream.__aiter__() for stream in streams]
+    last_keys = [None] * len(iterators)
+    heap = []
+
+    def push(index, item):
+        item_key = key(item)
+        if item_key is None:
+            item_key = last_keys[index]
+        last_keys[index] = item_key
+        # None sorts first; the index breaks ties and keeps each stream stable
+        heapq.heappush(heap, ((item_key is not None, item_key or 0), index, item))
+
+    try:
+        # Open every stream concurrently before emitting anything
+        firsts = await asyncio.gather(*(_advance(iterator) for iterator in iterators))
+        for index, item in enumerate(firsts):
+            if item is not _EXHAUSTED:
+                push(index, item)
+
+        while heap:
+            _, index, item = heapq.heappop(heap)
+            yield item
+            item = await _advance(iterators[index])
+            if item is not _EXHAUSTED:
+                push(index, item)
+    finally:
+        # Release every source (and its Engine stream) even when the consumer stops early
+        for iterator in iterators:
+            aclose = getattr(iterator, "aclose", None)
+            if aclose is None:
+                continue
+            try:
+                await aclose()
+            except Exception as e:
+                logger.warning(f"Error closing log stream after merging: {e}")
@@ -0,0 +1,247 @@
+import asyncio
+import logging
+import time
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+
+def parse_log_line(raw):
+    """Split a raw ``timestamps=True`` log line into a {"timestamp", "line"} entry"""
+    log_line = raw.decode("utf-8", errors="replace").rstrip("\n")
+    parts = log_line.split(" ", 1)
+    if len(parts) == 2:
+        timestamp, message = parts
+    else:
+        timestamp, message = "", log_line
+    return {"timestamp": timestamp, "line": message}
+
+
+POLICIES = ("block", "drop-oldest", "sample")
+
+
+class LogChannel:
+    """One viewer's bounded queue plus the policy applied when it fills up.
+
+    ``drop-oldest`` discards the oldest queued lines to make room, ``sample``
+    keeps only every ``sample_every``-th line once the queue is half full, and
+    ``block`` makes the (private) upstream wait for the viewer. Discarded
+    lines are counted in ``dropped``; end-of-stream markers are never dropped.
+    ``lag`` is how long the last item read had waited in the queue.
+    """
+
+    def __init__(self, maxsize=1000, policy="drop-oldest", sample_every=10, report_interval=1.0):
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown backpressure policy: {policy}")
+        self.queue = asyncio.Queue(maxsize=maxsize)
+        self.policy = policy
+        self.sample_every = sample_every
+        self.report_interval = report_interval
+        self.dropped = 0
+        self.lag = 0.0
+        self._sampled = 0
+        self._reported_dropped = 0
+        self._reported_at = 0.0
+
+    def deliver(self, item):
+        """Queue an item without waiting, applying the drop policy when full"""
+        queue = self.queue
+        if self.policy == "sample" and item is not None and queue.qsize() >= queue.maxsize // 2:
+            self._sampled += 1
+            if self._sampled % self.sample_every:
+                self.dropped += 1
+                return
+        # Bounded so a queue holding nothing but end markers cannot spin forever
+        for _ in range(queue.maxsize + 1):
+            try:
+                queue.put_nowait((time.monotonic(), item))
+                return
+            except asyncio.QueueFull:
+                oldest = queue.get_nowait()
+                if oldest[1] is None:
+                    queue.put_nowait(oldest)
+                else:
+                    self.dropped += 1
+        self.dropped += 1
+
+    async def put(self, item):
+        if self.policy == "block":
+            await self.queue.put((time.monotonic(), item))
+        else:
+            self.deliver(item)
+
+    async def get(self):
+        return self._unwrap(await self.queue.get())
+
+    def get_nowait(self):
+        """Next item; raises asyncio.QueueEmpty"""
+        return self._unwrap(self.queue.get_nowait())
+
+    def _unwrap(self, queued):
+        enqueued_at, item = queued
+        self.lag = time.monotonic() - enqueued_at
+        return item
+
+    def status(self):
+        """In-band status for the viewer, or None when there is nothing new to report.
+
+        Reported at most once per report_interval, and only when lines were
+        dropped since the last report or the viewer is falling behind (lines
+        waiting, or the last one read had queued for over a second).
+        """
+        now = time.monotonic()
+        if now - self._reported_at < self.report_interval:
+            return None
+        pending = self.queue.qsize()
+        if self.dropped == self._reported_dropped and not pending and self.lag < 1:
+            return None
+        self._reported_at = now
+        self._reported_dropped = self.dropped
+        return {
+            "policy": self.policy,
+            "dropped": self.dropped,
+            "pending": pending,
+            "lag": round(self.lag, 3),
+        }
+
+
+class LogSubscription:
+    """One viewer's attachment to a container's log stream.
+
+    Entries are delivered as ``(label, entry)`` tuples on ``channel``, which
+    may be shared by several subscriptions (e.g. every container in a network).
+    ``None`` on the channel means an upstream stream has ended.
+    """
+
+    def __init__(self, multiplexer, upstream, label, channel):
+        self.multiplexer = multiplexer
+        self.upstream = upstream
+        self.label = label
+        self.channel = channel
+
+    def deliver(self, item):
+        self.channel.deliver(item)
+
+    def close(self):
+        self.multiplexer.unsubscribe(self)
+
+
+class _Upstream:
+    def __init__(self, container_id, backlog, shared=True):
+        self.container_id = container_id
+        self.shared = shared
+        self.subscribers = set()
+        self.recent = deque(maxlen=backlog)
+        self.task = None
+
+
+class LogMultiplexer:
+    """Keep one follow stream per container and fan its lines out to every viewer.
+
+    The first subscriber opens ``/containers/{id}/logs?follow=1`` with its
+    requested tail; later subscribers are seeded from the most recent lines
+    already seen, up to ``backlog``. The upstream is closed when its last
+    subscriber leaves. Viewers read their channel in frames of up to
+    ``batch_lines`` items, waiting at most ``batch_delay`` seconds to fill one.
+
+    Shared upstreams never wait for a viewer: a full channel drops or samples
+    according to its policy. A ``block`` channel gets a private upstream
+    instead, so its backpressure only slows its own daemon stream.
+    """
+
+    def __init__(self, engine, backlog=1000, max_pending=1000, batch_lines=200, batch_delay=0.05):
+        self.engine = engine
+        self.backlog = backlog
+        self.max_pending = max_pending
+        self.batch_lines = batch_lines
+        self.batch_delay = batch_delay
+        self._upstreams = {}
+        self._private = set()
+
+    def new_channel(self, policy="drop-oldest"):
+        """Bounded channel for one viewer's subscriptions; raises ValueError for an unknown policy"""
+        return LogChannel(maxsize=self.max_pending, policy=policy)
+
+    async def next_batch(self, channel):
+        """Wait for one item, then gather more until batch_lines or batch_delay is reached"""
+        items = [await channel.get()]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.batch_delay
+        while len(items) < self.batch_lines:
+            try:
+                items.append(channel.get_nowait())
+                continue
+            except asyncio.QueueEmpty:
+                pass
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                items.append(await asyncio.wait_for(channel.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        return items
+
+    def subscribe(self, container_id, tail=10, label=None, channel=None):
+        channel = channel or self.new_channel()
+        shared = channel.policy != "block"
+        upstream = self._upstreams.get(container_id) if shared else None
+        subscription = LogSubscription(self, upstream, label or container_id, channel)
+        if upstream is None:
+            upstream = _Upstream(container_id, self.backlog, shared)
+            subscription.upstream = upstream
+            if shared:
+                self._upstreams[container_id] = upstream
+            else:
+                self._private.add(upstream)
+            upstream.task = asyncio.create_task(self._follow(upstream, tail))
+        elif tail:
+            for entry in list(upstream.recent)[-tail:]:
+                subscription.deliver((subscription.label, entry))
+        upstream.subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        upstream = subscription.upstream
+        upstream.subscribers.discard(subscription)
+        if not upstream.subscribers:
+            if self._upstreams.get(upstream.container_id) is upstream:
+                del self._upstreams[upstream.container_id]
+            self._private.discard(upstream)
+            upstream.task.cancel()
+
+    @property
+    def stream_count(self):
+        return len(self._upstreams) + len(self._private)
+
+    async def close(self):
+        for upstream in list(self._upstreams.values()) + list(self._private):
+            upstream.task.cancel()
+        self._upstreams.clear()
+        self._private.clear()
+
+    async def _follow(self, upstream, tail):
+        try:
+            async for raw in self.engine.stream_logs(upstream.container_id, tail=tail, follow=True):
+                entry = parse_log_line(raw)
+                if not upstream.shared:
+                    # Private upstream: wait for the viewer instead of dropping
+                    for subscription in list(upstream.subscribers):
+                        await subscription.channel.put((subscription.label, entry))
+                    continue
+                upstream.recent.append(entry)
+                for subscription in list(upstream.subscribers):
+                    subscription.deliver((subscription.label, entry))
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.debug(f"Log stream for container {upstream.container_id[:12]} failed: {e}")
+            for subscription in list(upstream.subscribers):
+                await subscription.channel.put((subscription.label, {"error": str(e)}))
+
+        # Upstream finished on its own (container stopped); tell the viewers
+        if self._upstreams.get(upstream.container_id) is upstream:
+            del self._upstreams[upstream.container_id]
+        self._private.discard(upstream)
+        for subscription in list(upstream.subscribers):
+            await subscription.channel.put(None)
@@ -0,0 +1,244 @@
+import asyncio
+import logging
+import os
+import sqlite3
+import threading
+import time
+from .log_mux import parse_log_line
+from .timestamps import parse_docker_timestamp
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS lines (
+    id INTEGER PRIMARY KEY,
+    container_id TEXT NOT NULL,
+    container_name TEXT NOT NULL,
+    ts INTEGER NOT NULL,
+    line TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS lines_container_ts ON lines (container_id, ts);
+CREATE INDEX IF NOT EXISTS lines_ts ON lines (ts);
+CREATE VIRTUAL TABLE IF NOT EXISTS lines_fts USING fts5(line, content='lines', content_rowid='id');
+CREATE TRIGGER IF NOT EXISTS lines_ai AFTER INSERT ON lines BEGIN
+    INSERT INTO lines_fts (rowid, line) VALUES (new.id, new.line);
+END;
+CREATE TRIGGER IF NOT EXISTS lines_ad AFTER DELETE ON lines BEGIN
+    INSERT INTO lines_fts (lines_fts, rowid, line) VALUES ('delete', old.id, old.line);
+END;
+"""
+
+
+class LogStore:
+    """SQLite-backed copy of container logs with a full-text index.
+
+    Lines are kept per container in timestamp order (indexed on
+    ``(container_id, ts)``) with an FTS5 index over the text, so time-range
+    and keyword queries never touch the Docker daemon. Retention is bounded by
+    age and by database size.
+    """
+
+    def __init__(self, path, retention_days=7, max_bytes=1024 ** 3):
+        self.path = path
+        self.retention_ns = int(retention_days * 86400 * 1e9)
+        self.max_bytes = max_bytes
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+
+    @classmethod
+    def from_env(cls):
+        """Build a store if LOGIQUE_LOG_STORE is set, otherwise return None.
+
+        LOGIQUE_LOG_STORE is the database path ("1" uses /app/data/logs.db);
+        LOGIQUE_LOG_RETENTION_DAYS and LOGIQUE_LOG_STORE_MAX_MB bound its size.
+        """
+        path = os.environ.get("LOGIQUE_LOG_STORE")
+        if not path:
+            return None
+        if path == "1":
+            path = "/app/data/logs.db"
+        return cls(
+            path,
+            retention_days=float(os.environ.get("LOGIQUE_LOG_RETENTION_DAYS", 7)),
+            max_bytes=int(float(os.environ.get("LOGIQUE_LOG_STORE_MAX_MB", 1024)) * 1024 ** 2)
+        )
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def insert_many(self, rows):
+        """Insert (container_id, container_name, ts_ns, line) rows in one transaction"""
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT INTO lines (container_id, container_name, ts, line) VALUES (?, ?, ?, ?)", rows
+            )
+
+    def last_timestamp(self, container_id):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT MAX(ts) FROM lines WHERE container_id = ?", (container_id,)
+            ).fetchone()
+        return row[0]
+
+    def search(self, query=None, since=None, until=None, containers=None, limit=1000):
+        """Lines matching an FTS5 query between since and until (epoch ns), oldest first"""
+        clauses = []
+        params = []
+        if query:
+            sql = "SELECT l.container_id, l.container_name, l.ts, l.line FROM lines_fts " \
+                  "JOIN lines l ON l.id = lines_fts.rowid"
+            clauses.append("lines_fts MATCH ?")
+            params.append(query)
+        else:
+            sql = "SELECT l.container_id, l.container_name, l.ts, l.line FROM lines l"
+        if since is not None:
+            clauses.append("l.ts >= ?")
+            params.append(since)
+        if until is not None:
+            clauses.append("l.ts <= ?")
+            params.append(until)
+        if containers:
+            placeholders = ", ".join("?" * len(containers))
+            clauses.append(f"(l.container_id IN ({placeholders}) OR l.container_name IN ({placeholders}))")
+            params.extend(containers)
+            params.extend(containers)
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY l.ts LIMIT ?"
+        params.append(limit)
+
+        try:
+            with self._lock:
+                rows = self._conn.execute(sql, params).fetchall()
+        except sqlite3.OperationalError as e:
+            # Malformed FTS5 query syntax
+            raise ValueError(str(e))
+        return [
+            {"container_id": row[0], "container": row[1], "ts": row[2], "line": row[3]}
+            for row in rows
+        ]
+
+    def used_bytes(self):
+        with self._lock:
+            page_size = self._conn.execute("PRAGMA page_size").fetchone()[0]
+            page_count = self._conn.execute("PRAGMA page_count").fetchone()[0]
+            free_pages = self._conn.execute("PRAGMA freelist_count").fetchone()[0]
+        return (page_count - free_pages) * page_size
+
+    def prune(self, batch=10000):
+        """Drop lines older than the retention age, then oldest lines until under max_bytes"""
+        cutoff = time.time_ns() - self.retention_ns
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM lines WHERE ts < ?", (cutoff,))
+        while self.used_bytes() > self.max_bytes:
+            with self._lock, self._conn:
+                deleted = self._conn.execute(
+                    "DELETE FROM lines WHERE id IN (SELECT id FROM lines ORDER BY ts LIMIT ?)", (batch,)
+                ).rowcount
+            if not deleted:
+                break
+
+
+class LogIngestor:
+    """Copy logs of running containers into a LogStore.
+
+    Follows the inventory: a container gets a follow stream while it runs,
+    resuming after the last stored timestamp. Lines are written in batches
+    off the event loop, and retention is enforced periodically.
+    """
+
+    def __init__(self, store, engine, inventory, flush_lines=500, flush_interval=1.0, prune_interval=300):
+        self.store = store
+        self.engine = engine
+        self.inventory = inventory
+        self.flush_lines = flush_lines
+        self.flush_interval = flush_interval
+        self.prune_interval = prune_interval
+        self._pending = []
+        self._followers = {}
+        self._tasks = []
+
+    def start(self):
+        self._tasks = [
+            asyncio.create_task(self._follow_inventory()),
+            asyncio.create_task(self._flush_loop()),
+            asyncio.create_task(self._prune_loop()),
+        ]
+
+    async def stop(self, close_store=True):
+        """Stop following and flush; close_store=False keeps the store open for a new ingestor"""
+        for task in self._tasks + list(self._followers.values()):
+            task.cancel()
+        await asyncio.gather(*self._tasks, *self._followers.values(), return_exceptions=True)
+        self._tasks = []
+        self._followers.clear()
+        await self._flush()
+        if close_store:
+            self.store.close()
+
+    async def _follow_inventory(self):
+        version = 0
+        while True:
+            version = await self.inventory.wait_for_change(version)
+            running = {
+                attrs['Id']: attrs.get('Name', '').lstrip('/')
+                for attrs in self.inventory.containers()
+                if attrs.get('State', {}).get('Status') == "running"
+            }
+            for container_id, name in running.items():
+                task = self._followers.get(container_id)
+                if task is None or task.done():
+                    self._followers[container_id] = asyncio.create_task(self._ingest(container_id, name))
+            for container_id in list(self._followers):
+                if container_id not in running:
+                    self._followers.pop(container_id).cancel()
+
+    async def _ingest(self, container_id, name):
+        last_ts = await asyncio.to_thread(self.store.last_timestamp, container_id)
+        # Resume after the last stored line, never reaching back past retention.
+        # Docker's `since` is inclusive, so lines at last_ts are skipped below.
+        since_ns = max(last_ts or 0, time.time_ns() - self.store.retention_ns)
+        since = f"{since_ns // 1_000_000_000}.{since_ns % 1_000_000_000:09d}"
+        try:
+            async for raw in self.engine.stream_logs(container_id, tail="all", since=since, follow=True):
+                entry = parse_log_line(raw)
+                ts = parse_docker_timestamp(entry["timestamp"])
+                if ts is None:
+                    ts = last_ts or time.time_ns()
+                elif last_ts and ts <= last_ts:
+                    continue
+                last_ts = ts
+                self._pending.append((container_id, name, ts, entry["line"]))
+                if len(self._pending) >= self.flush_lines:
+                    await self._flush()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"Log ingestion for container {name} stopped: {e}")
+
+    async def _flush(self):
+        if not self._pending:
+            return
+        rows, self._pending = self._pending, []
+        try:
+            await asyncio.to_thread(self.store.insert_many, rows)
+        except Exception as e:
+            logger.error(f"Error writing {len(rows)} log lines to the store: {e}")
+
+    async def _flush_loop(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self._flush()
+
+    async def _prune_loop(self):
+        while True:
+            try:
+                await asyncio.to_thread(self.store.prune)
+            except Exception as e:
+                logger.error(f"Error pruning log store: {e}")
+            await asyncio.sleep(self.prune_interval)
@@ -4,23 +4,33 @@ from fastapi import FastAPI, Request, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import RedirectResponse
 from fastapi.templating import Jinja2Templates
-from dateutil.parser import parse as parse_dt
 from fastapi.staticfiles import StaticFiles
 from .docker_client import DockerClient
 from datetime import datetime
-from .auth import AuthManager
+from .auth import AuthManager, HashingBusy
+from .broadcast import BroadcastHub
+from .compression import CompressionMiddleware, compression_settings_from_env
+from .container_feed import ContainerFeed
+from .log_filter import LogFilter
+from .log_store import LogStore, LogIngestor
+from .metrics_history import MetricsHistory
+from .federation import DockerFederation
+from .supervisor import DockerSupervisor
+from .instrumentation import InstrumentationMiddleware, instrumentation, profiler, thread_counts
+from . import prometheus
+from .timestamps import parse_docker_timestamp
+from contextlib import asynccontextmanager
 from typing import Optional
-import concurrent.futures
-import threading
 import asyncio
 import logging
-import queue
 import json
 
-auth_manager = AuthManager()
+# Created by the lifespan: the user store at startup, the Docker services once the daemon answers
+auth_manager = None
+docker_client = None
+federation = None
+metrics_history = None
 connected_websockets = set()
-connected_container_websockets = set()
-container_update_queue = asyncio.Queue()
 
 # Configure logging
 logging.basicConfig(
@@ -29,11 +39,25 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+@asynccontextmanager
+async def lifespan(app):
+    """Start background services without waiting for Docker; stop them on shutdown"""
+    global auth_manager
+    auth_manager = AuthManager()
+    docker_supervisor.start()
+    try:
+        yield
+    finally:
+        await docker_supervisor.stop()
+        await stop_docker_services()
+        auth_manager.close()
+
 # Initialize FastAPI app
 app = FastAPI(
     title="Logique - Where Logs Make Sense",
     description="Advanced Docker container management and monitoring",
-    version="2.0.0"
+    version="2.0.0",
+    lifespan=lifespan
 )
 
 # Add CORS middleware
@@ -45,189 +69,323 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress log and API responses (websockets use uvicorn's permessage-deflate)
+compression_settings = compression_settings_from_env()
+if compression_settings is not None:
+    app.add_middleware(CompressionMiddleware, **compression_settings)
+
+# Per-route and per-websocket-message latency for /api/debug/stats (outermost, so it includes compression)
+app.add_middleware(InstrumentationMiddleware)
+
 # Setup templates and static files
 templates = Jinja2Templates(directory="templates")
 app.mount("/static", StaticFiles(directory="static"), name="static")
 
-# Initialize Docker client
-try:
-    docker_client = DockerClient()
-    logger.info("Docker client initialized successfully")
-except Exception as e:
-    logger.error(f"Failed to initialize Docker client: {e}")
-    docker_client = None
-
 def get_current_user(request: Request):
     token = request.cookies.get("logique_token")
     if not token:
         return None
     return auth_manager.verify_token(token)
 
+async def next_or_disconnect(awaitable, receiver):
+    """Await the next outgoing item unless the client's receive task finishes first"""
+    getter = asyncio.ensure_future(awaitable)
+    done, _ = await asyncio.wait({getter, receiver}, return_when=asyncio.FIRST_COMPLETED)
+    if getter not in done:
+        # Client went away (or sent something we cannot read)
+        getter.cancel()
+        raise WebSocketDisconnect()
+    return getter.result()
+
+async def send_log_status(websocket: WebSocket, channel):
+    """Tell the viewer about dropped lines and how far behind it is, when there is news"""
+    status = channel.status()
+    if status:
+        await websocket.send_text(json.dumps({"status": status}))
+
+async def receive_log_filters(websocket: WebSocket, log_filter: LogFilter):
+    """Apply {"action": "filter", ...} messages so viewers can refilter without reconnecting"""
+    while True:
+        try:
+            message = json.loads(await websocket.receive_text())
+        except ValueError:
+            continue
+        if not isinstance(message, dict) or message.get("action") != "filter":
+            continue
+        try:
+            log_filter.update(message.get("level"), message.get("contains"), message.get("regex"))
+            await websocket.send_text(json.dumps({"filter": log_filter.to_dict()}))
+        except ValueError as e:
+            await websocket.send_text(json.dumps({"error": str(e)}))
+
+async def receive_refresh_intervals(websocket: WebSocket, hub: BroadcastHub, subscription):
+    """Apply {"refresh_interval": seconds} messages sent after the first one"""
+    while True:
+        try:
+            message = json.loads(await websocket.receive_text())
+        except ValueError:
+            continue
+        if not isinstance(message, dict):
+            continue
+        interval = message.get("refresh_interval")
+        if isinstance(interval, (int, float)) and not isinstance(interval, bool) and interval > 0:
+            hub.set_interval(subscription, interval)
+
+async def sample_system_snapshot():
+    stats, networks = await asyncio.gather(
+        docker_client.get_system_stats_async(),
+        federation.networks()
+    )
+    return {"system_stats": stats, "networks": networks}
+
+system_hub = BroadcastHub(sample_system_snapshot, name="system_hub")
+
+async def reject_until_connected(websocket: WebSocket):
+    """Close a websocket while Docker is not connected yet; True if it was closed"""
+    if docker_client:
+        return False
+    await websocket.send_text(json.dumps({"error": "Docker client not available"}))
+    await websocket.close(code=1013)  # Try again later
+    return True
+
 @app.websocket("/ws/system")
 async def websocket_system(websocket: WebSocket):
     await websocket.accept()
+    if await reject_until_connected(websocket):
+        return
     connected_websockets.add(websocket)
+    subscription = None
+    receiver = None
     try:
         data = await websocket.receive_json()
         refresh_interval = data.get("refresh_interval", 10)
         # Send initial data immediately
-        stats = docker_client.get_system_stats()
-        containers = docker_client.get_containers_info()
-        networks = docker_client.get_container_networks()
+        stats, containers, networks = await asyncio.gather(
+            docker_client.get_system_stats_async(),
+            federation.containers(),
+            federation.networks()
+        )
         await websocket.send_json({
             "system_stats": stats,
             "containers": containers,
             "networks": networks
         })
+        # Periodic updates come from the shared hub, sampled and encoded once per tick
+        subscription = system_hub.subscribe(refresh_interval)
+        receiver = asyncio.create_task(receive_refresh_intervals(websocket, system_hub, subscription))
         while True:
-            stats = docker_client.get_system_stats()
-            networks = docker_client.get_container_networks()
-            await websocket.send_json({
-                "system_stats": stats,
-                "networks": networks
-            })
-            await asyncio.sleep(refresh_interval)
+            await websocket.send_text(await next_or_disconnect(subscription.get(), receiver))
     except WebSocketDisconnect:
+        pass
+    finally:
+        if receiver:
+            receiver.cancel()
+        if subscription:
+            system_hub.unsubscribe(subscription)
         connected_websockets.discard(websocket)
 
+async def load_containers():
+    return await federation.containers()
+
+async def wait_for_inventory_change(version):
+    return await docker_client.inventory.wait_for_change(version)
+
+container_feed = ContainerFeed(load_containers, wait_for_inventory_change)
+
 @app.websocket("/ws/containers")
 async def websocket_containers(websocket: WebSocket):
     await websocket.accept()
-    connected_container_websockets.add(websocket)
+    if await reject_until_connected(websocket):
+        return
+    # First frame is a versioned snapshot, then only per-container deltas
+    subscriber = await container_feed.subscribe()
+
+    async def receive_requests():
+        while True:
+            message = await websocket.receive_json()
+            if message.get("action") == "resync":
+                subscriber.request_snapshot()
+
+    receiver = asyncio.create_task(receive_requests())
     try:
-        # Send initial container info
-        containers = docker_client.get_containers_info()
-        await websocket.send_json({"containers": containers})
         while True:
-            # Wait for container update event
-            containers = await container_update_queue.get()
-            await websocket.send_json({"containers": containers})
+            message = await next_or_disconnect(subscriber.get(), receiver)
+            await websocket.send_text(message)
     except WebSocketDisconnect:
-        connected_container_websockets.discard(websocket)
-
-def docker_event_listener():
-    for event in docker_client.client.events(decode=True):
-        if event.get("Type") == "container":
-            containers = docker_client.get_containers_info()
-            # Notify all connected /ws/containers clients
-            for ws in list(connected_container_websockets):
-                try:
-                    asyncio.run_coroutine_threadsafe(
-                        ws.send_json({"containers": containers}),
-                        asyncio.get_event_loop()
-                    )
-                except Exception:
-                    connected_container_websockets.discard(ws)
+        pass
+    finally:
+        receiver.cancel()
+        container_feed.unsubscribe(subscriber)
+
+# Optional on-disk log index (enabled with LOGIQUE_LOG_STORE)
+log_store = LogStore.from_env()
+log_ingestor = None
+
+async def start_docker_services(client):
+    """Start the services that need a connected daemon, then publish the client to the routes"""
+    global docker_client, federation, metrics_history, log_ingestor
+    # Local Docker plus any remote hosts from LOGIQUE_DOCKER_HOSTS
+    federation = DockerFederation.from_env(client)
+    # Server-side metrics history, sampled once per second
+    metrics_history = MetricsHistory(client.sample_host_metrics, client.sample_container_metrics)
+    client.inventory.start()
+    metrics_history.start()
+    if log_store:
+        log_ingestor = LogIngestor(log_store, client.engine, client.inventory)
+        log_ingestor.start()
+    docker_client = client
+
+async def warm_docker_caches(client):
+    """Fill the dashboard caches concurrently so the first page load is served from memory"""
+    # After a reconnect everything cached predates the outage (docker_info lives for minutes)
+    client.cache.clear()
+    await asyncio.gather(
+        client.get_system_stats_async(),
+        client.get_docker_info_async(),
+        federation.containers(),
+        federation.networks()
+    )
+
+async def release_docker_services(client):
+    """Stop whatever start_docker_services started for client and release its pools, threads and sessions"""
+    global docker_client, federation, metrics_history, log_ingestor
+    if docker_client is client:
+        docker_client = None
+    if log_ingestor:
+        # The store outlives the client; a retried start attaches a new ingestor to it
+        await log_ingestor.stop(close_store=False)
+        log_ingestor = None
+    if metrics_history:
+        await metrics_history.stop()
+        metrics_history = None
+    await client.inventory.stop()
+    await client.log_multiplexer.close()
+    client.stats_collector.stop()
+    if federation:
+        await federation.close()
+        federation = None
+    await client.engine.close()
+    client.close()
+
+async def stop_docker_services():
+    if docker_client:
+        await release_docker_services(docker_client)
+    if log_store:
+        log_store.close()
+
+# Connects in the background with backoff, so startup never waits for the daemon
+docker_supervisor = DockerSupervisor(
+    DockerClient, start_docker_services, warm_docker_caches, stop_services=release_docker_services
+)
 
 @app.websocket("/ws/container/{container_id}/logs")
-async def websocket_container_logs(websocket: WebSocket, container_id: str, tail: int = 10):
+async def websocket_container_logs(
+    websocket: WebSocket,
+    container_id: str,
+    tail: int = 10,
+    level: Optional[str] = None,
+    contains: Optional[str] = None,
+    regex: Optional[str] = None,
+    policy: str = "drop-oldest"
+):
     await websocket.accept()
+    if await reject_until_connected(websocket):
+        return
     tail = min(tail, 1000)  # Limit to 1000 lines to prevent overload
-    stop_event = threading.Event()
-    log_queue = queue.Queue(maxsize=100)
-
-    def log_streamer():
-        try:
-            container = docker_client.client.containers.get(container_id)
-            for log in container.logs(stream=True, follow=True, tail=tail, timestamps=True):
-                if stop_event.is_set():
-                    break
-                log_line = log.decode("utf-8", errors="replace").rstrip("\n")
-                # Split timestamp and message
-                parts = log_line.split(" ", 1)
-                if len(parts) == 2:
-                    timestamp, message = parts
-                else:
-                    timestamp, message = "", log_line
-                log_obj = {"timestamp": timestamp, "line": message}
-                log_queue.put(json.dumps(log_obj), timeout=1)
-        except Exception as e:
-            try:
-                log_queue.put(f"Error: {str(e)}", timeout=1)
-            except queue.Full:
-                pass
-
-    thread = threading.Thread(target=log_streamer, daemon=True)
-    thread.start()
+    remote_host = federation.host_for_container(container_id)
+    log_multiplexer = remote_host.log_multiplexer if remote_host else docker_client.log_multiplexer
+    try:
+        log_filter = LogFilter(level, contains, regex)
+        channel = log_multiplexer.new_channel(policy)
+    except ValueError as e:
+        await websocket.send_text(json.dumps({"error": str(e)}))
+        await websocket.close()
+        return
 
+    # Share one upstream follow stream per container between all viewers
+    attrs = docker_client.inventory.get_container(container_id)
+    subscription = log_multiplexer.subscribe(attrs['Id'] if attrs else container_id, tail=tail, channel=channel)
+    receiver = asyncio.create_task(receive_log_filters(websocket, log_filter))
     try:
-        while True:
-            try:
-                log_line = await asyncio.get_event_loop().run_in_executor(None, log_queue.get, True, 1)
-                await websocket.send_text(log_line)
-            except queue.Empty:
-                # Check if websocket is still open
-                if websocket.client_state.name != "CONNECTED":
+        ended = False
+        while not ended:
+            # Send lines in frames (one JSON array each) rather than one message per line
+            frame = []
+            for item in await next_or_disconnect(log_multiplexer.next_batch(channel), receiver):
+                if item is None:
+                    ended = True
                     break
+                _, entry = item
+                # Filter before encoding so unwanted lines cost nothing downstream
+                if "line" in entry and not log_filter.matches(entry["line"]):
+                    continue
+                frame.append(entry)
+            if frame:
+                await websocket.send_text(json.dumps(frame))
+            await send_log_status(websocket, channel)
     except WebSocketDisconnect:
         pass
     finally:
-        stop_event.set()
-        thread.join(timeout=2)
-        
+        receiver.cancel()
+        subscription.close()
+
 @app.websocket("/ws/network/{network_name}/logs")
-async def websocket_network_logs(websocket: WebSocket, network_name: str, tail: int = 10):
+async def websocket_network_logs(
+    websocket: WebSocket,
+    network_name: str,
+    tail: int = 10,
+    level: Optional[str] = None,
+    contains: Optional[str] = None,
+    regex: Optional[str] = None,
+    policy: str = "drop-oldest"
+):
     await websocket.accept()
+    if await reject_until_connected(websocket):
+        return
     tail = min(tail, 1000)  # Limit to 1000 lines per container to prevent overload
-    stop_event = threading.Event()
-    log_queue = queue.Queue(maxsize=100)
+    log_multiplexer = docker_client.log_multiplexer
+    try:
+        log_filter = LogFilter(level, contains, regex)
+        channel = log_multiplexer.new_channel(policy)
+    except ValueError as e:
+        await websocket.send_text(json.dumps({"error": str(e)}))
+        await websocket.close()
+        return
 
     try:
         # Get the list of containers in the specified network
-        networks = docker_client.get_container_networks()
+        networks = await federation.networks()
         if network_name not in networks:
             await websocket.send_text(json.dumps({"error": "Network not found"}))
             return
 
-        container_ids = [c['id'] for c in networks[network_name]['containers']]
-
-        def log_streamer(container_id):
-            try:
-                container = docker_client.client.containers.get(container_id)
-                for log in container.logs(stream=True, follow=True, tail=tail, timestamps=True):
-                    if stop_event.is_set():
-                        break
-                    log_line = log.decode("utf-8", errors="replace").rstrip("\n")
-                    # Split Docker's timestamp and message
-                    parts = log_line.split(" ", 1)
-                    if len(parts) == 2:
-                        timestamp, message = parts
-                    else:
-                        timestamp, message = "", log_line
-                    log_obj = {
-                        "container": container.name,
-                        "timestamp": timestamp,
-                        "line": message
-                    }
-                    log_queue.put(json.dumps(log_obj), timeout=1)
-            except Exception as e:
-                try:
-                    log_queue.put(json.dumps({"error": str(e)}), timeout=1)
-                except queue.Full:
-                    pass
-
-        # Start a thread for each container's log stream
-        threads = []
-        for container_id in container_ids:
-            thread = threading.Thread(target=log_streamer, args=(container_id,), daemon=True)
-            thread.start()
-            threads.append(thread)
-
+        # One channel for this viewer, fed by each container's upstream on its own host
+        subscriptions = [
+            federation.multiplexer_for(c).subscribe(c['id'], tail=tail, label=c['name'], channel=channel)
+            for c in networks[network_name]['containers']
+        ]
+        receiver = asyncio.create_task(receive_log_filters(websocket, log_filter))
         try:
-            while True:
-                try:
-                    log_line = await asyncio.get_event_loop().run_in_executor(None, log_queue.get, True, 1)
-                    await websocket.send_text(log_line)
-                except queue.Empty:
-                    # Check if websocket is still open
-                    if websocket.client_state.name != "CONNECTED":
-                        break
+            remaining = len(subscriptions)
+            while remaining:
+                frame = []
+                for item in await next_or_disconnect(log_multiplexer.next_batch(channel), receiver):
+                    if item is None:
+                        remaining -= 1
+                        continue
+                    container_name, entry = item
+                    if "line" in entry and not log_filter.matches(entry["line"]):
+                        continue
+                    frame.append({"container": container_name, **entry})
+                if frame:
+                    await websocket.send_text(json.dumps(frame))
+                await send_log_status(websocket, channel)
         except WebSocketDisconnect:
             pass
         finally:
-            stop_event.set()
-            for thread in threads:
-                thread.join(timeout=2)
+            receiver.cancel()
+            for subscription in subscriptions:
+                subscription.close()
     except Exception as e:
         await websocket.send_text(json.dumps({"error": str(e)}))
 
@@ -254,7 +412,7 @@ async def add_user_post(request: Request):
         error = "Passwords do not match."
     else:
         try:
-            auth_manager.create_user(username, password, role="child")
+            await auth_manager.create_user_async(username, password, role="child")
             return RedirectResponse("/", status_code=302)
         except Exception as e:
             error = str(e)
@@ -282,7 +440,7 @@ async def setup_post(request: Request):
         error = "Passwords do not match."
     else:
         try:
-            auth_manager.create_user(username, password)
+            await auth_manager.create_user_async(username, password)
             # Auto-login after setup
             token = auth_manager.create_token(username)
             response = RedirectResponse("/", status_code=302)
@@ -306,7 +464,16 @@ async def login_post(request: Request):
     password = form.get("password")
     error = None
 
-    if auth_manager.verify_password(username, password):
+    try:
+        verified = await auth_manager.verify_password_async(username, password)
+    except HashingBusy as e:
+        return templates.TemplateResponse("login.html", {
+            "request": request,
+            "error": str(e),
+            "username": username
+        }, status_code=429)
+
+    if verified:
         token = auth_manager.create_token(username)
         response = RedirectResponse("/", status_code=302)
         response.set_cookie("logique_token", token, httponly=True)
@@ -354,9 +521,11 @@ async def read_root(request: Request):
         if not user:
             return RedirectResponse("/login")
         
-        containers = docker_client.get_containers_info()
-        system_stats = docker_client.get_system_stats()
-        networks = docker_client.get_container_networks()
+        containers, system_stats, networks = await asyncio.gather(
+            federation.containers(),
+            docker_client.get_system_stats_async(),
+            federation.networks()
+        )
 
         response = templates.TemplateResponse("index.html", {
             "request": request,
@@ -377,7 +546,7 @@ async def get_system_stats():
         if not docker_client:
             raise HTTPException(status_code=500, detail="Docker client not available")
 
-        return docker_client.get_system_stats()
+        return await docker_client.get_system_stats_async()
     except Exception as e:
         logger.error(f"Error getting system stats: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -389,7 +558,7 @@ async def get_containers_info():
         if not docker_client:
             raise HTTPException(status_code=500, detail="Docker client not available")
 
-        return docker_client.get_containers_info()
+        return await federation.containers()
     except Exception as e:
         logger.error(f"Error getting containers info: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -401,54 +570,34 @@ async def get_networks():
         if not docker_client:
             raise HTTPException(status_code=500, detail="Docker client not available")
 
-        return docker_client.get_container_networks()
+        return await federation.networks()
     except Exception as e:
         logger.error(f"Error getting networks: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/api/network/{network_name}/logs")
 async def get_network_logs(network_name: str, tail: int = 500):
-    """Get merged logs for all containers in a network, sorted by Docker timestamp"""
+    """Stream merged logs for all containers in a network as NDJSON, sorted by Docker timestamp"""
     try:
         if not docker_client:
             raise HTTPException(status_code=500, detail="Docker client not available")
 
-        networks = docker_client.get_container_networks()
+        networks = await federation.networks()
         if network_name not in networks:
             raise HTTPException(status_code=404, detail="Network not found")
 
         containers = networks[network_name]['containers']
-        merged_logs = []
-
-        for c in containers:
-            logs = docker_client.get_container_logs(c['id'], tail=tail)
-            if not logs.strip():
-                continue
-            for line in logs.splitlines():
-                # Always use the first space-separated part as the Docker timestamp
-                parts = line.split(' ', 1)
-                if len(parts) == 2:
-                    docker_ts = parts[0]
-                    message = parts[1]
-                else:
-                    docker_ts = ""
-                    message = line
-                merged_logs.append({
-                    "container": c['name'],
-                    "line": message,
-                    "timestamp": docker_ts
-                })
-
-        # Sort logs by Docker timestamp (ISO8601)
-        def parse_ts(log):
-            try:
-                return parse_dt(log["timestamp"])
-            except Exception:
-                return datetime.min
-        merged_logs.sort(key=parse_ts)
-
-        return merged_logs
 
+        async def generate_ndjson():
+            async for entry in docker_client.iter_network_logs_async(
+                containers, tail=tail, engine_for=federation.engine_for
+            ):
+                yield json.dumps(entry) + "\n"
+
+        return StreamingResponse(generate_ndjson(), media_type="application/x-ndjson")
+
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error getting network logs: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -460,11 +609,13 @@ async def container_detail(request: Request, container_id: str):
         if not docker_client:
             raise HTTPException(status_code=500, detail="Docker client not available")
 
-        container_details = docker_client.get_container_details(container_id)
+        container_details = await federation.container_details(container_id)
         if not container_details:
             raise HTTPException(status_code=404, detail="Container not found")
 
-        container_logs = docker_client.get_container_logs(container_id, tail=500)
+        container_logs = await docker_client.get_container_logs_async(
+            container_id, tail=500, engine=federation.engine_for(container_details)
+        )
 
         return templates.TemplateResponse("container_detail.html", {
             "request": request,
@@ -486,7 +637,7 @@ async def get_container_details(container_id: str):
         if not docker_client:
             raise HTTPException(status_code=500, detail="Docker client not available")
 
-        container_details = docker_client.get_container_details(container_id)
+        container_details = await federation.container_details(container_id)
         if not container_details:
             raise HTTPException(status_code=404, detail="Container not found")
 
@@ -502,22 +653,40 @@ async def get_container_logs(
     container_id: str,
     tail: Optional[int] = Query(1000, description="Number of lines to tail"),
     since: Optional[str] = Query(None, description="Show logs since timestamp"),
-    follow: Optional[bool] = Query(False, description="Follow log output")
+    follow: Optional[bool] = Query(False, description="Follow log output"),
+    level: Optional[str] = Query(None, description="Minimum log level: error, warning, info"),
+    contains: Optional[str] = Query(None, description="Only lines containing this text (case-insensitive)"),
+    regex: Optional[str] = Query(None, description="Only lines matching this regular expression")
 ):
     """Get container logs with options"""
     try:
         if not docker_client:
             raise HTTPException(status_code=500, detail="Docker client not available")
 
+        try:
+            log_filter = LogFilter(level, contains, regex)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+        def keep(line):
+            # Match the message, not Docker's timestamp prefix
+            return log_filter.matches(line.split(" ", 1)[-1])
+
+        remote_host = federation.host_for_container(container_id)
+        engine = remote_host.engine if remote_host else None
+
         if follow:
             # Return streaming response for real-time logs
-            def generate_logs():
+            async def generate_logs():
                 try:
-                    log_stream = docker_client.get_container_logs(
-                        container_id, tail=tail, since=since, follow=True
+                    log_stream = await docker_client.get_container_logs_async(
+                        container_id, tail=tail, since=since, follow=True, engine=engine
                     )
-                    for log_line in log_stream:
-                        yield f"data: {log_line.decode('utf-8', errors='replace')}\n\n"
+                    async for log_line in log_stream:
+                        log_line = log_line.decode('utf-8', errors='replace')
+                        if log_filter.active and not keep(log_line):
+                            continue
+                        yield f"data: {log_line}\n\n"
                 except Exception as e:
                     yield f"data: Error: {str(e)}\n\n"
 
@@ -527,7 +696,9 @@ async def get_container_logs(
                 headers={"Cache-Control": "no-cache"}
             )
         else:
-            logs = docker_client.get_container_logs(container_id, tail=tail, since=since)
+            logs = await docker_client.get_container_logs_async(container_id, tail=tail, since=since, engine=engine)
+            if log_filter.active:
+                logs = "".join(line for line in logs.splitlines(keepends=True) if keep(line))
             return PlainTextResponse(logs)
 
     except HTTPException:
@@ -536,6 +707,176 @@ async def get_container_logs(
         logger.error(f"Error getting container logs: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+def parse_time_param(value):
+    """Epoch nanoseconds from an RFC 3339 timestamp or epoch seconds; None if empty"""
+    if not value:
+        return None
+    ts = parse_docker_timestamp(value)
+    if ts is None:
+        try:
+            ts = int(float(value) * 1_000_000_000)
+        except ValueError:
+            raise HTTPException(status_code=400, detail=f"Invalid time: {value}")
+    return ts
+
+@app.get("/api/logs/search")
+async def search_logs(
+    q: Optional[str] = Query(None, description="Full-text query (SQLite FTS5 syntax)"),
+    since: Optional[str] = Query(None, description="Start time, RFC 3339 or epoch seconds"),
+    until: Optional[str] = Query(None, description="End time, RFC 3339 or epoch seconds"),
+    containers: Optional[str] = Query(None, description="Comma-separated container ids or names"),
+    limit: int = Query(1000, description="Maximum number of lines")
+):
+    """Search the on-disk log index without touching the Docker daemon"""
+    try:
+        if not log_store:
+            raise HTTPException(status_code=404, detail="Log store is not enabled")
+
+        container_list = [c.strip() for c in containers.split(",") if c.strip()] if containers else None
+        try:
+            return await asyncio.to_thread(
+                log_store.search,
+                query=q,
+                since=parse_time_param(since),
+                until=parse_time_param(until),
+                containers=container_list,
+                limit=min(limit, 10000)
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error searching logs: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.get("/api/metrics/history")
+async def get_metrics_history(
+    container: Optional[str] = Query(None, description="Container id or name; omit for the host"),
+    since: Optional[str] = Query(None, description="Start time, RFC 3339 or epoch seconds (default: 15 minutes ago)"),
+    until: Optional[str] = Query(None, description="End time, RFC 3339 or epoch seconds (default: now)"),
+    resolution: Optional[str] = Query(None, description="1s, 1m or 1h (default: finest covering the range)")
+):
+    """Recorded host or container metrics for a time range in one call"""
+    try:
+        if not docker_client:
+            raise HTTPException(status_code=503, detail="Docker client not available")
+
+        container_id = None
+        if container:
+            attrs = docker_client.inventory.get_container(container)
+            container_id = attrs['Id'] if attrs else container
+
+        since_ns = parse_time_param(since)
+        until_ns = parse_time_param(until)
+        try:
+            history = metrics_history.query(
+                container_id,
+                since=since_ns / 1e9 if since_ns is not None else None,
+                until=until_ns / 1e9 if until_ns is not None else None,
+                resolution=resolution
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        if history is None:
+            raise HTTPException(status_code=404, detail=f"No metrics history for container {container}")
+        return history
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error getting metrics history: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.get("/metrics")
+async def get_prometheus_metrics():
+    """Prometheus text exposition rendered from already-sampled host and container data"""
+    try:
+        if not docker_client:
+            raise HTTPException(status_code=503, detail="Docker client not available")
+
+        host_sample = metrics_history.latest_host
+        if host_sample is None:
+            host_sample = await asyncio.to_thread(docker_client.sample_host_metrics)
+        body = prometheus.render_metrics(
+            host_sample,
+            federation.prometheus_containers(),
+            call_stats=docker_client.coalescer.stats(),
+            cache_stats=docker_client.cache.stats()
+        )
+        return PlainTextResponse(body, media_type=prometheus.CONTENT_TYPE)
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error rendering Prometheus metrics: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+# Admin-only diagnostics: when the dashboard is slow, these show where the time goes
+@app.get("/api/debug/stats")
+async def get_debug_stats(request: Request):
+    """Latency histograms, Docker call timings, cache hit rates and live threads and streams"""
+    user = get_current_user(request)
+    if not user or user.get("role") != "admin":
+        raise HTTPException(status_code=403, detail="Permission denied")
+    try:
+        streams = {
+            **instrumentation.active(),
+            "system_hub_subscribers": system_hub.subscriber_count,
+            "asyncio_tasks": len(asyncio.all_tasks()),
+        }
+        cache_stats = None
+        call_stats = None
+        if docker_client:
+            streams["docker_log_streams"] = docker_client.log_multiplexer.stream_count
+            streams["docker_stats_streams"] = docker_client.stats_collector.stream_count
+            cache_stats = docker_client.cache.stats()
+            lookups = cache_stats["hits"] + cache_stats["stale_hits"] + cache_stats["misses"]
+            cache_stats["hit_rate"] = round((cache_stats["hits"] + cache_stats["stale_hits"]) / lookups, 4) if lookups else None
+            call_stats = docker_client.coalescer.stats()
+        return {
+            "since": datetime.fromtimestamp(instrumentation.started).isoformat(),
+            "latency": instrumentation.snapshot(),
+            "cache": cache_stats,
+            "coalescing": call_stats,
+            "threads": thread_counts(),
+            "streams": streams,
+            "profiler": profiler.status(),
+        }
+    except Exception as e:
+        logger.error(f"Error collecting debug stats: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/api/debug/reset")
+async def reset_debug_stats(request: Request):
+    """Clear the latency histograms to measure a fresh window"""
+    user = get_current_user(request)
+    if not user or user.get("role") != "admin":
+        raise HTTPException(status_code=403, detail="Permission denied")
+    instrumentation.reset()
+    return {"status": "reset"}
+
+@app.post("/api/debug/profiler/start")
+async def start_profiler(request: Request, interval_ms: float = 5, max_seconds: float = 300):
+    """Start the sampling profiler; it stops by itself after max_seconds"""
+    user = get_current_user(request)
+    if not user or user.get("role") != "admin":
+        raise HTTPException(status_code=403, detail="Permission denied")
+    if not profiler.start(interval=max(interval_ms, 1) / 1000, max_seconds=min(max_seconds, 3600)):
+        raise HTTPException(status_code=409, detail="Profiler already running")
+    return profiler.status()
+
+@app.post("/api/debug/profiler/stop")
+async def stop_profiler(request: Request):
+    """Stop the sampling profiler and download its folded stacks (for flamegraph.pl or speedscope)"""
+    user = get_current_user(request)
+    if not user or user.get("role") != "admin":
+        raise HTTPException(status_code=403, detail="Permission denied")
+    # Joining the sampler thread can take one interval
+    folded = await asyncio.to_thread(profiler.stop)
+    return PlainTextResponse(folded)
+
 # Container control endpoints
 @app.post("/container/{container_id}/start")
 async def start_container(request: Request, container_id: str):
@@ -548,7 +889,7 @@ async def start_container(request: Request, container_id: str):
         if not docker_client:
             raise HTTPException(status_code=500, detail="Docker client not available")
         
-        docker_client.start_container(container_id)
+        await federation.container_action(container_id, "start")
         return {"status": "started", "container_id": container_id}
     except Exception as e:
         logger.error(f"Error starting container {container_id}: {e}")
@@ -565,7 +906,7 @@ async def stop_container(request: Request, container_id: str):
         if not docker_client:
             raise HTTPException(status_code=500, detail="Docker client not available")
 
-        docker_client.stop_container(container_id)
+        await federation.container_action(container_id, "stop")
         return {"status": "stopped", "container_id": container_id}
     except Exception as e:
         logger.error(f"Error stopping container {container_id}: {e}")
@@ -582,7 +923,7 @@ async def restart_container(request: Request, container_id: str):
         if not docker_client:
             raise HTTPException(status_code=500, detail="Docker client not available")
 
-        docker_client.restart_container(container_id)
+        await federation.container_action(container_id, "restart")
         return {"status": "restarted", "container_id": container_id}
     except Exception as e:
         logger.error(f"Error restarting container {container_id}: {e}")
@@ -595,7 +936,7 @@ async def remove_container(container_id: str, force: bool = Query(False)):
         if not docker_client:
             raise HTTPException(status_code=500, detail="Docker client not available")
 
-        docker_client.remove_container(container_id, force=force)
+        await federation.container_action(container_id, "remove", force=force)
         return {"status": "removed", "container_id": container_id}
     except Exception as e:
         logger.error(f"Error removing container {container_id}: {e}")
@@ -608,11 +949,19 @@ async def get_docker_info():
         if not docker_client:
             raise HTTPException(status_code=500, detail="Docker client not available")
 
-        return docker_client.get_docker_info()
+        return await docker_client.get_docker_info_async()
     except Exception as e:
         logger.error(f"Error getting Docker info: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/ready")
+async def readiness_check():
+    """Readiness probe: 200 once Docker is connected, the caches are warm and the inventory is loaded"""
+    status = docker_supervisor.status()
+    status["inventory"] = bool(docker_client and docker_client.inventory.ready)
+    ready = status["docker"] and status["warm"] and status["inventory"]
+    return JSONResponse({"status": "ready" if ready else "starting", **status}, status_code=200 if ready else 503)
+
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
@@ -621,7 +970,7 @@ async def health_check():
             return {"status": "unhealthy", "message": "Docker client not available"}
 
         # Test Docker connection
-        docker_client.client.ping()
+        await docker_client.ping_async()
         return {"status": "healthy", "message": "All systems operational"}
     except Exception as e:
         return {"status": "unhealthy", "message": str(e)}
@@ -0,0 +1,201 @@
+import array
+import asyncio
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+# (seconds per slot, slots): 10 minutes at 1 s, 24 hours at 1 min, 30 days at 1 h
+RESOLUTIONS = ((1, 600), (60, 1440), (3600, 720))
+RESOLUTION_NAMES = {"1s": 1, "1m": 60, "1h": 3600}
+
+HOST_FIELDS = (
+    "cpu_percent", "memory_percent", "memory_used_gb", "disk_percent",
+    "net_rx_bytes_per_s", "net_tx_bytes_per_s", "load_1min",
+)
+CONTAINER_FIELDS = (
+    "cpu_percent", "memory_mb", "memory_percent", "net_rx_bytes_per_s", "net_tx_bytes_per_s",
+)
+# Cumulative counters recorded as per-second rates
+RATE_FIELDS = {"net_rx_bytes_per_s": "net_rx_bytes", "net_tx_bytes_per_s": "net_tx_bytes"}
+
+
+class RollupRing:
+    """Fixed-size ring of per-slot averages for a set of fields.
+
+    Backed by flat arrays (slot number, sample count and float32 sums), so its
+    size is fixed at creation. A slot is reused once ``size`` slots have
+    passed; samples landing in the same slot are averaged.
+    """
+
+    def __init__(self, step, size, field_count):
+        self.step = step
+        self.size = size
+        self.field_count = field_count
+        self.slots = array.array("q", [-1]) * size
+        self.counts = array.array("H", [0]) * size
+        self.sums = array.array("f", [0.0]) * (size * field_count)
+
+    def add(self, timestamp, values):
+        slot = int(timestamp // self.step)
+        index = slot % self.size
+        base = index * self.field_count
+        if self.slots[index] != slot:
+            self.slots[index] = slot
+            self.counts[index] = 0
+            for offset in range(self.field_count):
+                self.sums[base + offset] = 0.0
+        if self.counts[index] < 65535:
+            self.counts[index] += 1
+            for offset, value in enumerate(values):
+                self.sums[base + offset] += value
+
+    def points(self, since, until):
+        """[slot_start, *averages] rows for slots overlapping since..until, oldest first"""
+        last = int(until // self.step)
+        first = max(int(since // self.step), last - self.size + 1)
+        rows = []
+        for slot in range(first, last + 1):
+            index = slot % self.size
+            count = self.counts[index]
+            if self.slots[index] != slot or not count:
+                continue
+            base = index * self.field_count
+            rows.append([slot * self.step] + [
+                round(self.sums[base + offset] / count, 3) for offset in range(self.field_count)
+            ])
+        return rows
+
+    @property
+    def nbytes(self):
+        return sum(a.itemsize * len(a) for a in (self.slots, self.counts, self.sums))
+
+
+class MetricSeries:
+    """History of one host or container at every resolution in RESOLUTIONS"""
+
+    def __init__(self, fields, name=None):
+        self.fields = fields
+        self.name = name
+        self.updated = 0.0
+        self.rings = [RollupRing(step, size, len(fields)) for step, size in RESOLUTIONS]
+        self._counters = {}
+
+    def add(self, timestamp, sample):
+        values = []
+        for field in self.fields:
+            counter = RATE_FIELDS.get(field)
+            if counter is None:
+                values.append(sample.get(field) or 0.0)
+                continue
+            value = sample.get(counter) or 0
+            previous = self._counters.get(counter)
+            self._counters[counter] = (timestamp, value)
+            # First sample, or the counter reset (container restarted): no rate yet
+            if previous is None or value < previous[1] or timestamp <= previous[0]:
+                values.append(0.0)
+            else:
+                values.append((value - previous[1]) / (timestamp - previous[0]))
+        for ring in self.rings:
+            ring.add(timestamp, values)
+        self.updated = timestamp
+
+    def ring_for(self, since, now, step=None):
+        """The ring for an explicit step, or the finest one still covering since"""
+        if step is not None:
+            return next((ring for ring in self.rings if ring.step == step), None)
+        for ring in self.rings:
+            if since >= now - ring.step * ring.size:
+                return ring
+        return self.rings[-1]
+
+    @property
+    def nbytes(self):
+        return sum(ring.nbytes for ring in self.rings)
+
+
+class MetricsHistory:
+    """Server-side history of host and per-container metrics.
+
+    Samples the host and every running container once per ``interval`` and
+    keeps raw 1 s values plus 1 min and 1 h rollups in fixed-size rings. At
+    most ``max_containers`` container series are kept; the least recently
+    updated one is evicted first, so memory stays within a fixed budget.
+    """
+
+    def __init__(self, sample_host, sample_containers, interval=1.0, max_containers=200):
+        self.sample_host = sample_host
+        self.sample_containers = sample_containers
+        self.interval = interval
+        self.max_containers = max_containers
+        self.host = MetricSeries(HOST_FIELDS, name="host")
+        self.containers = {}
+        self.latest_host = None
+        self._task = None
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    def record(self, timestamp, host_sample, container_samples):
+        """Add one host sample and {container_id: (name, sample)} container samples"""
+        if host_sample:
+            self.host.add(timestamp, host_sample)
+            self.latest_host = host_sample
+        for container_id, (name, sample) in container_samples.items():
+            series = self.containers.get(container_id)
+            if series is None:
+                if len(self.containers) >= self.max_containers:
+                    oldest = min(self.containers, key=lambda cid: self.containers[cid].updated)
+                    del self.containers[oldest]
+                series = self.containers[container_id] = MetricSeries(CONTAINER_FIELDS, name=name)
+            series.name = name
+            series.add(timestamp, sample)
+
+    def query(self, container_id=None, since=None, until=None, resolution=None):
+        """Points for the host (container_id None) or a container; None if it has no history.
+
+        ``since``/``until`` are epoch seconds; ``resolution`` is "1s", "1m",
+        "1h" or None to pick the finest one covering ``since``. Raises
+        ValueError for an unknown resolution.
+        """
+        series = self.host if container_id is None else self.containers.get(container_id)
+        if series is None:
+            return None
+        step = None
+        if resolution:
+            if resolution not in RESOLUTION_NAMES:
+                raise ValueError(f"Unknown resolution: {resolution} (use 1s, 1m or 1h)")
+            step = RESOLUTION_NAMES[resolution]
+        now = time.time()
+        until = now if until is None else until
+        since = until - 900 if since is None else since
+        ring = series.ring_for(since, now, step)
+        return {
+            "target": series.name if container_id is None else container_id,
+            "name": series.name,
+            "step": ring.step,
+            "fields": ["timestamp", *series.fields],
+            "points": ring.points(since, until),
+        }
+
+    @property
+    def nbytes(self):
+        return self.host.nbytes + sum(series.nbytes for series in self.containers.values())
+
+    async def _run(self):
+        next_time = time.monotonic()
+        while True:
+            next_time = max(next_time + self.interval, time.monotonic())
+            await asyncio.sleep(next_time - time.monotonic())
+            try:
+                host_sample = await asyncio.to_thread(self.sample_host)
+                self.record(time.time(), host_sample, self.sample_containers())
+            except Exception as e:
+                logger.error(f"Error recording metrics history: {e}")
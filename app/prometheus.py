@@ -0,0 +1,137 @@
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# (metric, type, help, host sample key)
+HOST_METRICS = (
+    ("logique_host_cpu_usage_percent", "gauge", "Host CPU usage in percent", "cpu_percent"),
+    ("logique_host_cpu_cores", "gauge", "Logical CPU cores", "cpu_cores"),
+    ("logique_host_memory_total_bytes", "gauge", "Total host memory", "memory_total_bytes"),
+    ("logique_host_memory_used_bytes", "gauge", "Used host memory", "memory_used_bytes"),
+    ("logique_host_memory_available_bytes", "gauge", "Available host memory", "memory_available_bytes"),
+    ("logique_host_disk_total_bytes", "gauge", "Size of the root filesystem", "disk_total_bytes"),
+    ("logique_host_disk_used_bytes", "gauge", "Used space on the root filesystem", "disk_used_bytes"),
+    ("logique_host_disk_free_bytes", "gauge", "Free space on the root filesystem", "disk_free_bytes"),
+    ("logique_host_network_receive_bytes_total", "counter", "Bytes received on all interfaces", "net_rx_bytes"),
+    ("logique_host_network_transmit_bytes_total", "counter", "Bytes sent on all interfaces", "net_tx_bytes"),
+    ("logique_host_network_receive_packets_total", "counter", "Packets received on all interfaces", "net_rx_packets"),
+    ("logique_host_network_transmit_packets_total", "counter", "Packets sent on all interfaces", "net_tx_packets"),
+    ("logique_host_load1", "gauge", "1 minute load average", "load_1min"),
+    ("logique_host_load5", "gauge", "5 minute load average", "load_5min"),
+    ("logique_host_load15", "gauge", "15 minute load average", "load_15min"),
+    ("logique_host_uptime_seconds", "gauge", "Seconds since host boot", "uptime_seconds"),
+)
+
+# (metric, type, help) for per-container series, in output order
+CONTAINER_METRICS = (
+    ("logique_container_up", "gauge", "1 if the container is running"),
+    ("logique_container_state", "gauge", "Container state, as a state label set to 1"),
+    ("logique_container_restart_count", "gauge", "Times Docker restarted the container"),
+    ("logique_container_cpu_usage_percent", "gauge", "Container CPU usage in percent of one core"),
+    ("logique_container_cpu_usage_seconds_total", "counter", "CPU time consumed by the container"),
+    ("logique_container_memory_usage_bytes", "gauge", "Container memory usage"),
+    ("logique_container_memory_limit_bytes", "gauge", "Container memory limit"),
+    ("logique_container_network_receive_bytes_total", "counter", "Bytes received by the container"),
+    ("logique_container_network_transmit_bytes_total", "counter", "Bytes sent by the container"),
+    ("logique_container_blkio_read_bytes_total", "counter", "Bytes read from block devices"),
+    ("logique_container_blkio_write_bytes_total", "counter", "Bytes written to block devices"),
+)
+
+
+def escape_label(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def format_labels(labels):
+    return "{" + ",".join(f'{key}="{escape_label(value)}"' for key, value in labels.items()) + "}"
+
+
+def container_samples(attrs, stats, cpu_percent):
+    """(metric, extra labels, value) samples for one container from inspect data and its latest stats"""
+    state = attrs.get('State', {}).get('Status', "unknown")
+    samples = [
+        ("logique_container_up", None, 1 if state == "running" else 0),
+        ("logique_container_state", {"state": state}, 1),
+    ]
+    # Only a full inspect carries the restart count; listing-only entries omit the series
+    if 'RestartCount' in attrs:
+        samples.append(("logique_container_restart_count", None, attrs['RestartCount']))
+    if not stats:
+        return samples
+
+    memory_stats = stats.get("memory_stats", {})
+    networks_stats = (stats.get("networks") or {}).values()
+    io_entries = (stats.get("blkio_stats") or {}).get("io_service_bytes_recursive") or []
+    samples.extend([
+        ("logique_container_cpu_usage_percent", None, round(cpu_percent, 3)),
+        ("logique_container_cpu_usage_seconds_total", None,
+         stats.get("cpu_stats", {}).get("cpu_usage", {}).get("total_usage", 0) / 1e9),
+        ("logique_container_memory_usage_bytes", None, memory_stats.get("usage", 0)),
+        ("logique_container_memory_limit_bytes", None, memory_stats.get("limit", 0)),
+        ("logique_container_network_receive_bytes_total", None, sum(net.get("rx_bytes", 0) for net in networks_stats)),
+        ("logique_container_network_transmit_bytes_total", None, sum(net.get("tx_bytes", 0) for net in networks_stats)),
+        # cgroup v1 reports "Read"/"Write", cgroup v2 "read"/"write"
+        ("logique_container_blkio_read_bytes_total", None,
+         sum(item.get("value", 0) for item in io_entries if str(item.get("op", "")).lower() == "read")),
+        ("logique_container_blkio_write_bytes_total", None,
+         sum(item.get("value", 0) for item in io_entries if str(item.get("op", "")).lower() == "write")),
+    ])
+    return samples
+
+
+# (metric, help, Coalescer.stats() key) for the Docker query counters
+CALL_METRICS = (
+    ("logique_docker_calls_total", "Docker client queries by method", "calls"),
+    ("logique_docker_coalesced_calls_total", "Docker client queries that joined an identical call in flight", "coalesced"),
+)
+
+
+# (metric, type, help, TTLCache.stats() key) for the Docker client cache
+CACHE_METRICS = (
+    ("logique_cache_hits_total", "counter", "Cache lookups answered with a fresh value", "hits"),
+    ("logique_cache_stale_hits_total", "counter", "Cache lookups answered with a stale value while refreshing", "stale_hits"),
+    ("logique_cache_misses_total", "counter", "Cache lookups that loaded the value inline", "misses"),
+    ("logique_cache_evictions_total", "counter", "Entries evicted to stay within the size limit", "evictions"),
+    ("logique_cache_refreshes_total", "counter", "Background refreshes of stale entries", "refreshes"),
+    ("logique_cache_entries", "gauge", "Entries currently cached", "size"),
+)
+
+
+def render_metrics(host_sample, containers, call_stats=None, cache_stats=None):
+    """Prometheus text exposition of a host sample and (labels, samples) per container.
+
+    ``call_stats`` and ``cache_stats`` add the Docker query and cache
+    counters. One pass over the containers; nothing here calls Docker.
+    """
+    lines = []
+    if host_sample:
+        for metric, metric_type, help_text, key in HOST_METRICS:
+            if host_sample.get(key) is None:
+                continue
+            lines.append(f"# HELP {metric} {help_text}")
+            lines.append(f"# TYPE {metric} {metric_type}")
+            lines.append(f"{metric} {host_sample[key]}")
+
+    by_metric = {metric: [] for metric, _, _ in CONTAINER_METRICS}
+    for labels, samples in containers:
+        for metric, extra_labels, value in samples:
+            series_labels = {**labels, **extra_labels} if extra_labels else labels
+            by_metric[metric].append(f"{metric}{format_labels(series_labels)} {value}")
+    for metric, metric_type, help_text in CONTAINER_METRICS:
+        if not by_metric[metric]:
+            continue
+        lines.append(f"# HELP {metric} {help_text}")
+        lines.append(f"# TYPE {metric} {metric_type}")
+        lines.extend(by_metric[metric])
+
+    if call_stats:
+        for metric, help_text, key in CALL_METRICS:
+            lines.append(f"# HELP {metric} {help_text}")
+            lines.append(f"# TYPE {metric} counter")
+            for method, counter in sorted(call_stats.items()):
+                lines.append(f"{metric}{format_labels({'method': method})} {counter[key]}")
+
+    if cache_stats:
+        for metric, metric_type, help_text, key in CACHE_METRICS:
+            lines.append(f"# HELP {metric} {help_text}")
+            lines.append(f"# TYPE {metric} {metric_type}")
+            lines.append(f"{metric} {cache_stats[key]}")
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,154 @@
+import asyncio
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+class StatsCollector:
+    """Keep one streaming stats subscription per running container.
+
+    Each running container gets a daemon thread consuming the Engine's
+    ``/containers/{id}/stats?stream=1`` feed. The newest decoded sample is kept
+    in memory so readers get it in O(1) instead of waiting for the daemon to
+    take two samples on every request. Subscriptions are driven by the
+    inventory's events consumer through attach/detach/sync.
+    """
+
+    def __init__(self, client):
+        self.client = client
+        self._samples = {}
+        self._streams = {}
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+
+    def stop(self):
+        """Signal every stats stream to finish"""
+        self._stop_event.set()
+        with self._lock:
+            for stop_event in self._streams.values():
+                stop_event.set()
+            self._streams.clear()
+            self._samples.clear()
+
+    @property
+    def stream_count(self):
+        with self._lock:
+            return len(self._streams)
+
+    def get(self, container_id):
+        """Return the latest raw stats sample for a container, or None"""
+        with self._lock:
+            return self._samples.get(container_id)
+
+    def attach(self, container_id):
+        """Start streaming stats for a container if not already subscribed"""
+        with self._lock:
+            if self._stop_event.is_set() or container_id in self._streams:
+                return
+            stop_event = threading.Event()
+            self._streams[container_id] = stop_event
+
+        thread = threading.Thread(
+            target=self._stream_stats,
+            args=(container_id, stop_event),
+            name=f"stats-{container_id[:12]}",
+            daemon=True
+        )
+        thread.start()
+
+    def detach(self, container_id):
+        """Stop streaming stats for a container and drop its sample"""
+        with self._lock:
+            stop_event = self._streams.pop(container_id, None)
+            self._samples.pop(container_id, None)
+        if stop_event:
+            stop_event.set()
+
+    def sync(self, running):
+        """Reconcile subscriptions with the given set of running container ids"""
+        with self._lock:
+            tracked = set(self._streams)
+
+        for container_id in running - tracked:
+            self.attach(container_id)
+        for container_id in tracked - running:
+            self.detach(container_id)
+
+    def _stream_stats(self, container_id, stop_event):
+        try:
+            for sample in self.client.api.stats(container_id, stream=True, decode=True):
+                if stop_event.is_set():
+                    break
+                with self._lock:
+                    if self._streams.get(container_id) is not stop_event:
+                        break
+                    self._samples[container_id] = sample
+        except Exception as e:
+            logger.debug(f"Stats stream for container {container_id[:12]} ended: {e}")
+        finally:
+            # The daemon closes the stream when the container stops
+            with self._lock:
+                if self._streams.get(container_id) is stop_event:
+                    del self._streams[container_id]
+                    self._samples.pop(container_id, None)
+
+
+class AsyncStatsCollector:
+    """StatsCollector for an AsyncDockerEngine: one stats stream task per running container.
+
+    Used for remote hosts, where there is no docker-py client. ``sync`` is
+    called with each container listing; readers get the newest sample, or
+    None until the first one arrives.
+    """
+
+    def __init__(self, engine):
+        self.engine = engine
+        self._samples = {}
+        self._streams = {}
+
+    @property
+    def stream_count(self):
+        return len(self._streams)
+
+    def get(self, container_id):
+        return self._samples.get(container_id)
+
+    def attach(self, container_id):
+        if container_id not in self._streams:
+            self._streams[container_id] = asyncio.create_task(self._stream_stats(container_id))
+
+    def detach(self, container_id):
+        task = self._streams.pop(container_id, None)
+        self._samples.pop(container_id, None)
+        if task:
+            task.cancel()
+
+    def sync(self, running):
+        """Reconcile streams with the given set of running container ids"""
+        for container_id in running - set(self._streams):
+            self.attach(container_id)
+        for container_id in set(self._streams) - running:
+            self.detach(container_id)
+
+    async def stop(self):
+        tasks = list(self._streams.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._streams.clear()
+        self._samples.clear()
+
+    async def _stream_stats(self, container_id):
+        task = asyncio.current_task()
+        try:
+            async for sample in self.engine.stream_stats(container_id):
+                self._samples[container_id] = sample
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.debug(f"Stats stream for container {container_id[:12]} ended: {e}")
+        # The daemon closes the stream when the container stops; the next sync re-attaches
+        if self._streams.get(container_id) is task:
+            del self._streams[container_id]
+            self._samples.pop(container_id, None)
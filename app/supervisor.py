@@ -0,0 +1,119 @@
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class DockerSupervisor:
+    """Connect to the Docker daemon in the background and keep watching it.
+
+    ``connect`` is a blocking client factory, run in a thread, followed by
+    ``start_services(client)``; both are retried with exponential backoff
+    until they succeed. A client whose services fail to start is handed to
+    ``stop_services(client)`` to release it before the next attempt. Then
+    ``warm(client)`` is awaited, and retried with backoff until it succeeds.
+    After that the daemon is pinged every ``check_interval`` seconds (with
+    backoff while it is down), and ``warm`` runs again whenever it comes back.
+    """
+
+    def __init__(self, connect, start_services, warm, stop_services=None, check_interval=10.0, max_backoff=30.0):
+        self.connect = connect
+        self.start_services = start_services
+        self.warm = warm
+        self.stop_services = stop_services
+        self.check_interval = check_interval
+        self.max_backoff = max_backoff
+        self.client = None
+        self.connected = False
+        self.warmed = False
+        self.last_error = None
+        self._task = None
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    def status(self):
+        return {"docker": self.connected, "warm": self.warmed, "error": self.last_error}
+
+    async def _warm(self, client):
+        """Run warm; False (with last_error set) if it failed"""
+        try:
+            await self.warm(client)
+        except Exception as e:
+            logger.error(f"Error warming Docker caches: {e}")
+            self.last_error = str(e) or type(e).__name__
+            return False
+        self.warmed = True
+        self.last_error = None
+        return True
+
+    async def _release(self, client):
+        """Hand a client that never went live to stop_services"""
+        if self.stop_services is None:
+            return
+        try:
+            await self.stop_services(client)
+        except Exception as e:
+            logger.error(f"Error releasing Docker client: {e}")
+
+    async def _run(self):
+        backoff = min(1, self.max_backoff)
+        while self.client is None:
+            client = None
+            try:
+                client = await asyncio.to_thread(self.connect)
+                await self.start_services(client)
+            except asyncio.CancelledError:
+                if client is not None:
+                    await self._release(client)
+                raise
+            except Exception as e:
+                self.last_error = str(e) or type(e).__name__
+                if client is None:
+                    logger.warning(f"Docker daemon not reachable, retrying in {backoff}s: {e}")
+                else:
+                    logger.error(f"Error starting Docker services, retrying in {backoff}s: {e}")
+                    await self._release(client)
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, self.max_backoff)
+                continue
+            self.client = client
+            self.connected = True
+            self.last_error = None
+            logger.info("Connected to the Docker daemon")
+        await self._warm(self.client)
+
+        backoff = warm_backoff = min(1, self.max_backoff)
+        while True:
+            if not self.connected:
+                delay = backoff
+            elif not self.warmed:
+                delay = warm_backoff
+            else:
+                delay = self.check_interval
+            await asyncio.sleep(delay)
+            try:
+                await self.client.ping_async()
+            except Exception as e:
+                if self.connected:
+                    logger.warning(f"Lost connection to the Docker daemon: {e}")
+                self.connected = False
+                self.last_error = str(e) or type(e).__name__
+                backoff = min(backoff * 2, self.max_backoff)
+                continue
+            if not self.connected:
+                logger.info("Docker daemon is reachable again")
+                self.connected = True
+                self.warmed = False
+                self.last_error = None
+                backoff = warm_backoff = min(1, self.max_backoff)
+                await self._warm(self.client)
+            elif not self.warmed and not await self._warm(self.client):
+                warm_backoff = min(warm_backoff * 2, self.max_backoff)
@@ -0,0 +1,56 @@
+from datetime import date
+from functools import lru_cache
+
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+_FRACTION_SCALE = [10 ** (9 - digits) for digits in range(10)]
+
+
+@lru_cache(maxsize=4096)
+def _epoch_day(date_part):
+    """Days since 1970-01-01 for a 'YYYY-MM-DD' string (log lines share few dates)"""
+    return date(int(date_part[0:4]), int(date_part[5:7]), int(date_part[8:10])).toordinal() - _EPOCH_ORDINAL
+
+
+def parse_docker_timestamp(value):
+    """Parse a Docker log timestamp into integer nanoseconds since the epoch.
+
+    Handles the fixed RFC 3339 form Docker emits with ``timestamps=True``,
+    e.g. ``2025-06-09T12:34:56.123456789Z``: the fraction may be 0-9 digits
+    (Docker trims trailing zeros) and the zone is ``Z`` or ``+HH:MM``/``-HH:MM``.
+    Returns None for missing or malformed timestamps instead of raising.
+    """
+    try:
+        if len(value) < 20 or value[4] != "-" or value[7] != "-" or value[10] != "T" \
+                or value[13] != ":" or value[16] != ":":
+            return None
+
+        seconds = (
+            _epoch_day(value[:10]) * 86400
+            + int(value[11:13]) * 3600
+            + int(value[14:16]) * 60
+            + int(value[17:19])
+        )
+
+        # Zone is the trailing 'Z' (what Docker emits) or a '+HH:MM' offset
+        if value[-1] == "Z":
+            end = len(value) - 1
+        else:
+            end = len(value) - 6
+            zone = value[end:]
+            if zone[0] not in "+-" or zone[3] != ":":
+                return None
+            offset = int(zone[1:3]) * 3600 + int(zone[4:6]) * 60
+            seconds -= offset if zone[0] == "+" else -offset
+
+        nanos = 0
+        if end > 19:
+            digits = value[20:end]
+            if value[19] != "." or not digits.isdigit() or len(digits) > 9:
+                return None
+            nanos = int(digits) * _FRACTION_SCALE[len(digits)]
+        elif end != 19:
+            return None
+
+        return seconds * 1_000_000_000 + nanos
+    except (TypeError, ValueError, IndexError):
+        return None
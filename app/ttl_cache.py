@@ -0,0 +1,187 @@
+import asyncio
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+
+class TTLCache:
+    """Thread-safe LRU cache with per-family TTLs and stale-while-revalidate.
+
+    ``families`` maps a key prefix to ``(ttl, stale_ttl)``: a value is fresh
+    for ``ttl`` seconds, and for ``stale_ttl`` seconds after that it is still
+    returned at once while one background refresh replaces it. Keys matching
+    no family use ``default``. At most ``maxsize`` entries are kept; the least
+    recently used one is evicted first.
+    """
+
+    def __init__(self, families, maxsize=512, default=(5, 0), executor=None):
+        # Longest prefix first so "container_details_" wins over "container_"
+        self.families = sorted(families.items(), key=lambda item: len(item[0]), reverse=True)
+        self.maxsize = maxsize
+        self.default = default
+        self.executor = executor
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # key -> (stored at, value)
+        self._refreshing = set()
+        self._refresh_tasks = set()
+        # key -> [generation, loads in flight], only while a load of key runs.
+        # Invalidating key bumps its generation so those loads cannot write back.
+        self._loading = {}
+        self._stats = {"hits": 0, "stale_hits": 0, "misses": 0, "evictions": 0, "refreshes": 0}
+
+    def _policy(self, key):
+        for prefix, policy in self.families:
+            if key.startswith(prefix):
+                return policy
+        return self.default
+
+    def _lookup(self, key):
+        """(value, state) where state is "fresh", "stale" or "miss"; caller holds the lock"""
+        entry = self._entries.get(key)
+        if entry is not None:
+            ttl, stale_ttl = self._policy(key)
+            age = time.monotonic() - entry[0]
+            if age < ttl + stale_ttl:
+                self._entries.move_to_end(key)
+                if age < ttl:
+                    self._stats["hits"] += 1
+                    return entry[1], "fresh"
+                self._stats["stale_hits"] += 1
+                return entry[1], "stale"
+            del self._entries[key]
+        self._stats["misses"] += 1
+        return None, "miss"
+
+    def get(self, key):
+        """The fresh value for key, or None"""
+        with self._lock:
+            value, state = self._lookup(key)
+        return value if state == "fresh" else None
+
+    def set(self, key, value, generation=None):
+        with self._lock:
+            if generation is not None and generation != self._loading[key][0]:
+                return
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self._stats["evictions"] += 1
+
+    def invalidate(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+            if key in self._loading:
+                self._loading[key][0] += 1
+
+    def invalidate_prefix(self, prefix):
+        """Drop every key starting with prefix"""
+        with self._lock:
+            for key in [key for key in self._entries if key.startswith(prefix)]:
+                del self._entries[key]
+            for key, loading in self._loading.items():
+                if key.startswith(prefix):
+                    loading[0] += 1
+
+    def clear(self):
+        """Drop every entry; loads in flight still store what they fetch"""
+        with self._lock:
+            self._entries.clear()
+
+    def _begin_load(self, key):
+        """Register a load of key and return its generation; caller holds the lock"""
+        loading = self._loading.setdefault(key, [0, 0])
+        loading[1] += 1
+        return loading[0]
+
+    def _end_load(self, key):
+        with self._lock:
+            loading = self._loading[key]
+            loading[1] -= 1
+            if not loading[1]:
+                del self._loading[key]
+
+    def _begin_refresh(self, key):
+        """The load generation if this caller should refresh key, else None"""
+        with self._lock:
+            if key in self._refreshing:
+                return None
+            self._refreshing.add(key)
+            self._stats["refreshes"] += 1
+            return self._begin_load(key)
+
+    def _end_refresh(self, key):
+        with self._lock:
+            self._refreshing.discard(key)
+        self._end_load(key)
+
+    def get_or_load(self, key, loader):
+        """Cached value for key, calling loader() on a miss.
+
+        A stale value is returned immediately while loader() runs on the
+        executor. Errors from an inline load propagate; errors from a
+        background refresh are logged and the stale value is kept.
+        """
+        with self._lock:
+            value, state = self._lookup(key)
+        if state == "fresh":
+            return value
+        if state == "stale" and self.executor is not None:
+            generation = self._begin_refresh(key)
+            if generation is not None:
+                self.executor.submit(self._refresh, key, loader, generation)
+            return value
+        with self._lock:
+            generation = self._begin_load(key)
+        try:
+            value = loader()
+            self.set(key, value, generation)
+        finally:
+            self._end_load(key)
+        return value
+
+    def _refresh(self, key, loader, generation):
+        try:
+            self.set(key, loader(), generation)
+        except Exception as e:
+            logger.error(f"Error refreshing cached {key}: {e}")
+        finally:
+            self._end_refresh(key)
+
+    async def get_or_load_async(self, key, loader):
+        """get_or_load for a coroutine function; stale values refresh in a task"""
+        with self._lock:
+            value, state = self._lookup(key)
+        if state == "fresh":
+            return value
+        if state == "stale":
+            generation = self._begin_refresh(key)
+            if generation is not None:
+                task = asyncio.ensure_future(self._refresh_async(key, loader, generation))
+                self._refresh_tasks.add(task)
+                task.add_done_callback(self._refresh_tasks.discard)
+            return value
+        with self._lock:
+            generation = self._begin_load(key)
+        try:
+            value = await loader()
+            self.set(key, value, generation)
+        finally:
+            self._end_load(key)
+        return value
+
+    async def _refresh_async(self, key, loader, generation):
+        try:
+            self.set(key, await loader(), generation)
+        except Exception as e:
+            logger.error(f"Error refreshing cached {key}: {e}")
+        finally:
+            self._end_refresh(key)
+
+    def stats(self):
+        """Hit, stale hit, miss, eviction and refresh counts plus the current size"""
+        with self._lock:
+            return {**self._stats, "size": len(self._entries), "maxsize": self.maxsize}
@@ -0,0 +1,174 @@
+import json
+import logging
+import os
+import tempfile
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+class UserStore:
+    """User records persisted as a JSON snapshot plus an append-only journal.
+
+    Reads come from memory. ``put`` and ``delete`` append one journal line
+    each, so a change costs O(1) disk I/O regardless of the number of users.
+    ``touch`` (last_login updates) is write-behind: touched users are appended
+    in one batch every ``flush_interval`` seconds. Once the journal holds
+    ``compact_after`` lines it is folded into a new snapshot, written to a temp
+    file and renamed over the old one.
+    """
+
+    def __init__(self, path, flush_interval=5.0, compact_after=1000):
+        self.path = path
+        self.journal_path = path + ".journal"
+        self.flush_interval = flush_interval
+        self.compact_after = compact_after
+        # Held by callers that need check-then-write atomicity (e.g. unique usernames)
+        self.lock = threading.RLock()
+        self._users = {}
+        self._touched = set()
+        self._journal_lines = 0
+        self._stop_event = threading.Event()
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        torn = self._load()
+        self._journal = open(self.journal_path, "a", encoding="utf-8")
+        if torn:
+            # Start from a clean snapshot rather than appending after a partial line
+            self._compact()
+
+        self._flusher = threading.Thread(target=self._flush_loop, name="user-store-flush", daemon=True)
+        self._flusher.start()
+
+    def _load(self):
+        """Read the snapshot and replay the journal; True if the journal ends in a partial line"""
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                self._users = json.load(f)
+        except FileNotFoundError:
+            self._users = {}
+
+        try:
+            with open(self.journal_path, "r", encoding="utf-8") as f:
+                journal = f.read()
+        except FileNotFoundError:
+            return False
+        for line in journal.splitlines():
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                # A torn final line from a crash mid-append
+                logger.warning(f"Skipping unreadable line in {self.journal_path}")
+                continue
+            self._apply(entry)
+            self._journal_lines += 1
+        return bool(journal) and not journal.endswith("\n")
+
+    def _apply(self, entry):
+        if entry.get("op") == "delete":
+            self._users.pop(entry["username"], None)
+        else:
+            self._users[entry["username"]] = entry["user"]
+
+    # Read access (mapping-style)
+
+    def __contains__(self, username):
+        return username in self._users
+
+    def __getitem__(self, username):
+        return self._users[username]
+
+    def __len__(self):
+        return len(self._users)
+
+    def __iter__(self):
+        return iter(list(self._users))
+
+    def get(self, username, default=None):
+        return self._users.get(username, default)
+
+    def items(self):
+        with self.lock:
+            return list(self._users.items())
+
+    # Writes
+
+    def put(self, username, user):
+        """Create or replace a user record and journal it immediately"""
+        with self.lock:
+            self._users[username] = dict(user)
+            self._touched.discard(username)
+            self._append([{"op": "set", "username": username, "user": self._users[username]}])
+
+    def delete(self, username):
+        with self.lock:
+            if username not in self._users:
+                return False
+            del self._users[username]
+            self._touched.discard(username)
+            self._append([{"op": "delete", "username": username}])
+            return True
+
+    def touch(self, username, **fields):
+        """Update fields in memory now; persist with the next background flush"""
+        with self.lock:
+            user = self._users.get(username)
+            if user is None:
+                return
+            user.update(fields)
+            self._touched.add(username)
+
+    def _append(self, entries):
+        self._journal.write("".join(json.dumps(entry, separators=(",", ":")) + "\n" for entry in entries))
+        self._journal.flush()
+        os.fsync(self._journal.fileno())
+        self._journal_lines += len(entries)
+        if self._journal_lines >= self.compact_after:
+            self._compact()
+
+    def flush(self):
+        """Write pending touched records to the journal"""
+        with self.lock:
+            if not self._touched:
+                return
+            entries = [
+                {"op": "set", "username": username, "user": self._users[username]}
+                for username in self._touched if username in self._users
+            ]
+            self._touched.clear()
+            if entries:
+                self._append(entries)
+
+    def _compact(self):
+        """Atomically replace the snapshot with the current state and empty the journal"""
+        directory = os.path.dirname(self.path) or "."
+        fd, tmp_path = tempfile.mkstemp(prefix=".users-", suffix=".tmp", dir=directory)
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(self._users, f, separators=(",", ":"))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+        except Exception:
+            os.unlink(tmp_path)
+            raise
+        # The snapshot now covers everything journaled so far
+        self._journal.close()
+        self._journal = open(self.journal_path, "w", encoding="utf-8")
+        self._journal_lines = 0
+
+    def _flush_loop(self):
+        while not self._stop_event.wait(self.flush_interval):
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"Error flushing user store: {e}")
+
+    def close(self):
+        """Flush pending updates and fold the journal into the snapshot"""
+        self._stop_event.set()
+        with self.lock:
+            self.flush()
+            if self._journal_lines:
+                self._compact()
+            self._journal.close()
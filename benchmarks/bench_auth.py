@@ -0,0 +1,104 @@
+"""Benchmark: authenticated-route latency under login load.
+
+Runs an event loop with a probe that repeatedly serves an "authenticated
+route" (cookie token check plus a small JSON body) while a burst of logins is
+in flight, and reports the probe's latency percentiles for:
+
+* inline: PBKDF2 run on the event loop (the previous ``login_post`` behaviour)
+* pool:   PBKDF2 run in AuthManager's bounded hashing pool
+
+It also times ``verify_token`` with and without the verified-token cache.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_auth [--logins 40] [--concurrency 8]
+"""
+import argparse
+import asyncio
+import json
+import tempfile
+import time
+from pathlib import Path
+
+from app.auth import AuthManager
+
+
+def percentiles(samples):
+    ordered = sorted(samples)
+    pick = lambda q: ordered[min(len(ordered) - 1, int(q * len(ordered)))] * 1000
+    return f"p50 {pick(0.50):8.2f} ms   p99 {pick(0.99):8.2f} ms   max {ordered[-1] * 1000:8.2f} ms"
+
+
+async def authenticated_route(auth, token):
+    user = auth.verify_token(token)
+    return json.dumps({"user": user, "ok": True})
+
+
+async def run_load(auth, token, logins, concurrency, inline):
+    latencies = []
+    done = asyncio.Event()
+
+    async def probe():
+        # A request arriving every 5 ms: latency is from its arrival until it is served
+        interval = 0.005
+        arrival = time.perf_counter()
+        while not done.is_set():
+            arrival += interval
+            await asyncio.sleep(max(0, arrival - time.perf_counter()))
+            await authenticated_route(auth, token)
+            latencies.append(time.perf_counter() - arrival)
+
+    async def login_worker(count):
+        for _ in range(count):
+            if inline:
+                auth.verify_password("admin", "wrong-password")
+                await asyncio.sleep(0)
+            else:
+                await auth.verify_password_async("admin", "wrong-password")
+
+    probe_task = asyncio.create_task(probe())
+    started = time.perf_counter()
+    per_worker = max(1, logins // concurrency)
+    await asyncio.gather(*(login_worker(per_worker) for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    done.set()
+    await probe_task
+    return latencies, elapsed
+
+
+def time_verify(auth, token, rounds):
+    started = time.perf_counter()
+    for _ in range(rounds):
+        auth.verify_token(token)
+    return (time.perf_counter() - started) / rounds * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--logins", type=int, default=40)
+    parser.add_argument("--concurrency", type=int, default=8)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        auth = AuthManager(data_file=str(Path(data_dir) / "users.json"))
+        auth.create_user("admin", "correct-horse")
+        token = auth.create_token("admin")
+
+        print(f"{args.logins} logins, {args.concurrency} concurrent; probe latency of an authenticated route")
+        for mode, inline in (("inline", True), ("pool", False)):
+            latencies, elapsed = asyncio.run(run_load(auth, token, args.logins, args.concurrency, inline))
+            print(f"{mode:<8} {percentiles(latencies)}   ({len(latencies)} probes, logins took {elapsed:.2f} s)")
+
+        print("\nverify_token")
+        rounds = 20000
+        auth.token_cache_ttl = 0
+        auth.invalidate_tokens("admin")
+        uncached = time_verify(auth, token, rounds)
+        auth.token_cache_ttl = 60
+        auth.invalidate_tokens("admin")
+        cached = time_verify(auth, token, rounds)
+        print(f"{'decode every call':<20} {uncached:8.2f} us")
+        print(f"{'cached':<20} {cached:8.2f} us   ({uncached / cached:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
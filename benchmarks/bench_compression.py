@@ -0,0 +1,111 @@
+"""Micro-benchmark: compression of log payloads.
+
+Measures the bytes saved and CPU spent by each codec Logique can negotiate,
+on synthetic container logs shaped like the two log transports:
+
+* HTTP: one ``/api/container/{id}/logs`` body of ``--lines`` lines, compressed
+  whole with gzip (levels 1/6/9) and brotli (qualities 1/4/11, if installed).
+* Websocket: the same lines as JSON array frames of ``--frame`` lines, with
+  permessage-deflate with and without context takeover.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_compression [--lines 5000] [--frame 200]
+"""
+import argparse
+import json
+import random
+import time
+import zlib
+from datetime import datetime, timedelta, timezone
+
+from app.compression import BrotliEncoder, GzipEncoder, brotli
+
+PATHS = ["/api/containers", "/api/system/stats", "/static/app.js", "/login", "/api/container/{}/logs"]
+LEVELS = ["INFO", "INFO", "INFO", "DEBUG", "WARN", "ERROR"]
+
+
+def make_sample(lines, seed=42):
+    """Timestamped access and application log lines, as `docker logs -t` prints them"""
+    rng = random.Random(seed)
+    moment = datetime(2025, 6, 9, tzinfo=timezone.utc)
+    sample = []
+    for _ in range(lines):
+        moment += timedelta(microseconds=rng.randrange(200_000))
+        stamp = moment.strftime("%Y-%m-%dT%H:%M:%S.%f") + "000Z"
+        if rng.random() < 0.6:
+            path = rng.choice(PATHS).format(f"{rng.getrandbits(48):012x}")
+            message = (
+                f'172.18.0.{rng.randrange(2, 30)} - - "GET {path} HTTP/1.1" '
+                f'{rng.choice([200, 200, 200, 304, 404, 500])} {rng.randrange(100, 90000)} '
+                f'"-" "Mozilla/5.0 (X11; Linux x86_64)" {rng.random():.3f}'
+            )
+        else:
+            message = (
+                f"{rng.choice(LEVELS)} [worker-{rng.randrange(8)}] request_id={rng.getrandbits(64):016x} "
+                f"handled job in {rng.randrange(1, 5000)}ms queue_depth={rng.randrange(50)}"
+            )
+        sample.append((stamp, message))
+    return sample
+
+
+def measure(name, raw_size, compress):
+    started_wall = time.perf_counter()
+    started_cpu = time.process_time()
+    size = compress()
+    cpu = time.process_time() - started_cpu
+    wall = time.perf_counter() - started_wall
+    print(
+        f"{name:<34} {size:>10,} B  {raw_size / size:6.1f}x  "
+        f"{cpu * 1000:8.1f} ms CPU  {raw_size / wall / 1e6:8.1f} MB/s"
+    )
+
+
+def compress_whole(encoder_factory, body):
+    return lambda: len(encoder_factory().compress(body, final=True))
+
+
+def compress_frames(frames, context_takeover):
+    """permessage-deflate: raw deflate, each message sync-flushed and its 4-byte tail stripped"""
+    def run():
+        total = 0
+        compressor = zlib.compressobj(6, zlib.DEFLATED, -15)
+        for frame in frames:
+            if not context_takeover:
+                compressor = zlib.compressobj(6, zlib.DEFLATED, -15)
+            total += len(compressor.compress(frame) + compressor.flush(zlib.Z_SYNC_FLUSH)) - 4
+        return total
+    return run
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--lines", type=int, default=5000)
+    parser.add_argument("--frame", type=int, default=200, help="lines per websocket frame")
+    args = parser.parse_args()
+
+    sample = make_sample(args.lines)
+
+    body = "".join(f"{stamp} {message}\n" for stamp, message in sample).encode()
+    print(f"HTTP log response: {args.lines:,} lines, {len(body):,} B")
+    measure("identity", len(body), lambda: len(body))
+    for level in (1, 6, 9):
+        measure(f"gzip level {level}", len(body), compress_whole(lambda: GzipEncoder(level), body))
+    if brotli is None:
+        print("brotli                             not installed (pip install brotli)")
+    else:
+        for quality in (1, 4, 11):
+            measure(f"brotli quality {quality}", len(body), compress_whole(lambda: BrotliEncoder(quality), body))
+
+    frames = [
+        json.dumps([{"timestamp": stamp, "line": message} for stamp, message in sample[i:i + args.frame]]).encode()
+        for i in range(0, len(sample), args.frame)
+    ]
+    frames_size = sum(len(frame) for frame in frames)
+    print(f"\nWebsocket log frames: {len(frames):,} frames of {args.frame} lines, {frames_size:,} B")
+    measure("uncompressed", frames_size, lambda: frames_size)
+    measure("permessage-deflate", frames_size, compress_frames(frames, context_takeover=True))
+    measure("permessage-deflate, no takeover", frames_size, compress_frames(frames, context_takeover=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,270 @@
+"""Benchmark: Logique's hot paths against a simulated Docker host.
+
+Starts the fake Docker Engine (``benchmarks.fake_engine``) and the Logique
+app (uvicorn, in-process) on unix sockets in a temporary directory, waits for
+``/ready``, then drives each hot path with ``--clients`` concurrent clients:
+
+* ``DockerClient.get_containers_info`` / ``get_container_networks``
+  (the blocking docker-py paths, called from threads)
+* ``GET /api/containers`` and ``GET /api/networks``
+* ``GET /api/network/{name}/logs`` (the merged NDJSON download)
+* ``/ws/container/{id}/logs`` (all clients viewing one container) and
+  ``/ws/network/{name}/logs``, for ``--duration`` seconds
+* ``/ws/system`` fan-out at a one second refresh, for ``--duration`` seconds
+
+For every path it reports throughput, p50/p99 latency and the Docker daemon
+requests the fake Engine served meanwhile (in total and per operation).
+Latency is per request for the HTTP and threaded paths and time to first
+frame for the websockets, whose throughput is messages (or log lines) per
+second received across all clients.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_hot_paths [--clients 20] [--requests 200] [--duration 5]
+        [--containers 100] [--networks 5] [--log-rate 10] [--stats-latency 0.05]
+"""
+import argparse
+import asyncio
+import functools
+import json
+import os
+import tempfile
+import time
+from collections import Counter
+from pathlib import Path
+
+import aiohttp
+
+from benchmarks.fake_engine import add_arguments, from_args
+
+BASE_URL = "http://logique"
+
+
+def percentile(samples, fraction):
+    if not samples:
+        return float("nan")
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+class Measurement:
+    """Daemon requests served by the fake Engine between start and report"""
+
+    def __init__(self, fake, name):
+        self.fake = fake
+        self.name = name
+        self.before = Counter(fake.requests)
+        self.started = time.perf_counter()
+
+    def report(self, operations, latencies, unit="req"):
+        elapsed = time.perf_counter() - self.started
+        daemon = Counter(self.fake.requests)
+        daemon.subtract(self.before)
+        total = sum(daemon.values())
+        per_op = total / operations if operations else float("nan")
+        print(
+            f"{self.name:<34} {operations:>7} {operations / elapsed:>9.1f} {unit + '/s':<8}"
+            f"{percentile(latencies, 0.5) * 1000:>9.1f} {percentile(latencies, 0.99) * 1000:>9.1f}"
+            f"{total:>9} {per_op:>8.2f}"
+        )
+        routes = ", ".join(f"{route} {n}" for route, n in daemon.most_common(4) if n > 0)
+        if routes:
+            print(f"{'':<36}daemon: {routes}")
+
+
+async def run_clients(clients, requests, call):
+    """Run call() `requests` times from `clients` concurrent workers; per-call latencies"""
+    latencies = []
+    remaining = iter(range(requests))
+
+    async def worker():
+        for _ in remaining:
+            started = time.perf_counter()
+            await call()
+            latencies.append(time.perf_counter() - started)
+
+    await asyncio.gather(*(worker() for _ in range(clients)))
+    return latencies
+
+
+async def bench_threaded(fake, name, clients, requests, fn):
+    measurement = Measurement(fake, name)
+    latencies = await run_clients(clients, requests, lambda: asyncio.to_thread(fn))
+    measurement.report(requests, latencies)
+
+
+async def bench_http(fake, session, name, path, clients, requests):
+    async def call():
+        async with session.get(BASE_URL + path) as response:
+            response.raise_for_status()
+            await response.read()
+
+    measurement = Measurement(fake, name)
+    latencies = await run_clients(clients, requests, call)
+    measurement.report(requests, latencies)
+
+
+async def bench_network_logs(fake, session, name, network, clients, requests, tail):
+    lines = 0
+
+    async def call():
+        nonlocal lines
+        async with session.get(f"{BASE_URL}/api/network/{network}/logs", params={"tail": str(tail)}) as response:
+            response.raise_for_status()
+            async for _ in response.content:
+                lines += 1
+
+    measurement = Measurement(fake, name)
+    latencies = await run_clients(clients, requests, call)
+    measurement.report(requests, latencies)
+    print(f"{'':<36}{lines / requests:.0f} lines per download")
+
+
+async def bench_log_websocket(fake, session, name, path, clients, duration, tail):
+    """Clients follow one log websocket for `duration` seconds; lines/s and time to first frame"""
+    first_frame = []
+    lines = 0
+
+    async def viewer():
+        nonlocal lines
+        started = time.perf_counter()
+        deadline = started + duration
+        async with session.ws_connect(BASE_URL + path, params={"tail": str(tail)}) as ws:
+            while (remaining := deadline - time.perf_counter()) > 0:
+                try:
+                    message = await ws.receive(timeout=remaining)
+                except asyncio.TimeoutError:
+                    break
+                if message.type != aiohttp.WSMsgType.TEXT:
+                    break
+                payload = json.loads(message.data)
+                if isinstance(payload, dict):
+                    if "error" in payload:
+                        raise RuntimeError(payload["error"])
+                    continue
+                lines += len(payload)
+                if started is not None:
+                    first_frame.append(time.perf_counter() - started)
+                    started = None
+
+    measurement = Measurement(fake, name)
+    await asyncio.gather(*(viewer() for _ in range(clients)))
+    measurement.report(lines, first_frame, unit="line")
+
+
+async def bench_system_websocket(fake, session, name, clients, duration):
+    """Clients subscribe to /ws/system at a 1s refresh; messages/s and time to the initial snapshot"""
+    initial = []
+    messages = 0
+
+    async def viewer():
+        nonlocal messages
+        started = time.perf_counter()
+        deadline = started + duration
+        async with session.ws_connect(BASE_URL + "/ws/system") as ws:
+            await ws.send_json({"refresh_interval": 1})
+            snapshot = await ws.receive_json()
+            if "error" in snapshot:
+                raise RuntimeError(snapshot["error"])
+            initial.append(time.perf_counter() - started)
+            messages += 1
+            while (remaining := deadline - time.perf_counter()) > 0:
+                try:
+                    message = await ws.receive(timeout=remaining)
+                except asyncio.TimeoutError:
+                    break
+                if message.type != aiohttp.WSMsgType.TEXT:
+                    break
+                messages += 1
+
+    measurement = Measurement(fake, name)
+    await asyncio.gather(*(viewer() for _ in range(clients)))
+    measurement.report(messages, initial, unit="msg")
+
+
+async def wait_until_ready(session, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            async with session.get(BASE_URL + "/ready") as response:
+                if response.status == 200:
+                    return
+        except aiohttp.ClientError:
+            pass
+        await asyncio.sleep(0.1)
+    raise RuntimeError("Logique did not become ready")
+
+
+async def run(args, fake, tmp):
+    import uvicorn
+    from app import main as logique
+    from app.auth import AuthManager
+
+    # Keep the user store out of /app/data
+    logique.AuthManager = functools.partial(AuthManager, data_file=str(Path(tmp) / "users.json"))
+    app_socket = str(Path(tmp) / "logique.sock")
+    server = uvicorn.Server(uvicorn.Config(logique.app, uds=app_socket, log_level="warning", lifespan="on"))
+    serving = asyncio.create_task(server.serve())
+
+    connector = aiohttp.UnixConnector(path=app_socket)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        while not server.started:
+            await asyncio.sleep(0.05)
+        await wait_until_ready(session)
+
+        client = logique.docker_client
+        network = fake.networks[-1]["Name"]
+        container = next(iter(fake.containers))
+        clients, requests = args.clients, args.requests
+
+        print(
+            f"{len(fake.containers)} containers on {len(fake.networks)} networks, {clients} clients, "
+            f"{args.log_rate:g} log lines/s per container, stats latency {args.stats_latency * 1000:g}ms"
+        )
+        print(
+            f"{'path':<34} {'ops':>7} {'throughput':>18}{'p50 ms':>9} {'p99 ms':>9}"
+            f"{'daemon':>9} {'per op':>8}"
+        )
+        await bench_threaded(fake, "get_containers_info (docker-py)", clients, requests, client.get_containers_info)
+        await bench_threaded(fake, "get_container_networks (docker-py)", clients, requests, client.get_container_networks)
+        await bench_http(fake, session, "GET /api/containers", "/api/containers", clients, requests)
+        await bench_http(fake, session, "GET /api/networks", "/api/networks", clients, requests)
+        await bench_network_logs(
+            fake, session, f"GET /api/network/{network}/logs", network,
+            min(clients, args.log_requests), args.log_requests, args.tail,
+        )
+        await bench_log_websocket(
+            fake, session, "/ws/container/{id}/logs", f"/ws/container/{container}/logs",
+            clients, args.duration, args.tail,
+        )
+        await bench_log_websocket(
+            fake, session, f"/ws/network/{network}/logs", f"/ws/network/{network}/logs",
+            clients, args.duration, args.tail,
+        )
+        await bench_system_websocket(fake, session, "/ws/system", clients, args.duration)
+
+    server.should_exit = True
+    await serving
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, default=20, help="concurrent clients per path")
+    parser.add_argument("--requests", type=int, default=200, help="requests per HTTP path")
+    parser.add_argument("--log-requests", type=int, default=20, help="network log downloads")
+    parser.add_argument("--tail", type=int, default=100, help="log lines requested per container")
+    parser.add_argument("--duration", type=float, default=5.0, help="seconds per websocket path")
+    add_arguments(parser)
+    parser.set_defaults(containers=100, stats_latency=0.05)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        fake = from_args(args)
+        socket_path = str(Path(tmp) / "docker.sock")
+        fake.serve(socket_path)
+        os.environ["DOCKER_HOST"] = f"unix://{socket_path}"
+        os.environ.pop("LOGIQUE_DOCKER_HOSTS", None)
+        asyncio.run(run(args, fake, tmp))
+
+
+if __name__ == "__main__":
+    main()
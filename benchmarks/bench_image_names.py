@@ -0,0 +1,96 @@
+"""Benchmark: Docker daemon requests per container listing.
+
+Starts the fake Docker Engine (``benchmarks.fake_engine``) on a unix socket
+with ``--containers`` stopped containers built from ``--images`` images, and
+reports the requests made by one dashboard refresh:
+
+* before: one inspect per container (docker-py's ``containers.list()`` or the
+  async list-then-inspect), plus image names resolved per container
+  (``container.image.tags``) or per distinct image (``/images/{id}/json``)
+* after:  one ``/containers/json`` listing and one ``/images/json`` listing,
+  the latter shared through the cache (a warm refresh reuses it)
+
+Network listings are compared the same way.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_image_names [--containers 50] [--images 5]
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+from pathlib import Path
+
+from benchmarks.fake_engine import FakeEngine
+
+
+def legacy_sync_refresh(client):
+    """The previous get_containers_info: containers.list() inspects, container.image per container"""
+    for container in client.containers.list(all=True):
+        container.image.tags
+
+
+def legacy_sync_networks(client):
+    """The previous get_container_networks: network and container models"""
+    [network.attrs for network in client.networks.list()]
+    [c.attrs for c in client.containers.list(all=True)]
+
+
+async def legacy_async_refresh(engine):
+    """The previous async fallback: one inspect_image per distinct image"""
+    summaries = await engine.list_containers(all=True)
+    attrs = await asyncio.gather(*(engine.inspect_container(s["Id"]) for s in summaries))
+    await asyncio.gather(*(engine.inspect_image(i) for i in {a["Image"] for a in attrs}))
+
+
+def count(fake, label, call):
+    fake.requests.clear()
+    call()
+    total = sum(fake.requests.values())
+    detail = ", ".join(f"{route} {n}" for route, n in sorted(fake.requests.items()))
+    print(f"{label:<28} {total:>5} requests   ({detail})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--containers", type=int, default=50)
+    parser.add_argument("--images", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        socket_path = str(Path(tmp) / "docker.sock")
+        fake = FakeEngine(containers=args.containers, networks=1, images=args.images, running=0)
+        fake.serve(socket_path)
+        os.environ["DOCKER_HOST"] = f"unix://{socket_path}"
+
+        from app.docker_client import DockerClient
+        client = DockerClient()
+
+        async def run_async(call):
+            try:
+                return await call()
+            finally:
+                await client.engine.close()
+
+        print(f"{args.containers} containers from {args.images} images; daemon requests per refresh")
+        print("docker-py path (get_containers_info)")
+        count(fake, "  before", lambda: legacy_sync_refresh(client.client))
+        client.cache.invalidate_prefix("")
+        count(fake, "  after (cold)", client.get_containers_info)
+        count(fake, "  after (warm)", client.get_containers_info)
+
+        print("docker-py path (get_container_networks)")
+        count(fake, "  before", lambda: legacy_sync_networks(client.client))
+        client.cache.invalidate_prefix("")
+        count(fake, "  after", client.get_container_networks)
+
+        print("async path (get_containers_info_async, no inventory)")
+        count(fake, "  before", lambda: asyncio.run(run_async(lambda: legacy_async_refresh(client.engine))))
+        client.cache.invalidate_prefix("")
+        count(fake, "  after (cold)", lambda: asyncio.run(run_async(client.get_containers_info_async)))
+        count(fake, "  after (warm)", lambda: asyncio.run(run_async(client.get_containers_info_async)))
+        client.close()
+
+
+if __name__ == "__main__":
+    main()
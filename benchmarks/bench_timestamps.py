@@ -0,0 +1,77 @@
+"""Micro-benchmark: Docker log timestamp parsing.
+
+Compares app.timestamps.parse_docker_timestamp with dateutil's parser (the
+previous sort key for network logs) on a synthetic sample of Docker log
+timestamps, and times sorting the sample by each key.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_timestamps [--lines 1000000]
+"""
+import argparse
+import random
+import time
+from datetime import datetime, timedelta, timezone
+
+from dateutil.parser import parse as parse_dt
+
+from app.timestamps import parse_docker_timestamp
+
+
+def make_sample(lines, seed=42):
+    """Timestamps as Docker prints them: UTC, 0-9 fraction digits with trailing zeros trimmed"""
+    rng = random.Random(seed)
+    start = datetime(2025, 6, 9, tzinfo=timezone.utc)
+    sample = []
+    for _ in range(lines):
+        moment = start + timedelta(seconds=rng.randrange(3 * 86400))
+        fraction = f"{rng.randrange(10 ** 9):09d}".rstrip("0")
+        sample.append(moment.strftime("%Y-%m-%dT%H:%M:%S") + (f".{fraction}" if fraction else "") + "Z")
+    return sample
+
+
+def dateutil_key(value):
+    try:
+        return parse_dt(value).timestamp()
+    except Exception:
+        return None
+
+
+def run(name, func, sample):
+    started = time.perf_counter()
+    for value in sample:
+        func(value)
+    elapsed = time.perf_counter() - started
+    print(f"{name:<28} {elapsed:8.3f} s   {elapsed / len(sample) * 1e9:8.0f} ns/line")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--lines", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    sample = make_sample(args.lines)
+
+    # Both parsers must order the sample identically
+    checked = sample[:10_000]
+    assert sorted(checked, key=parse_docker_timestamp) == sorted(checked, key=dateutil_key)
+
+    print(f"Parsing {len(sample):,} Docker log timestamps")
+    fast = run("parse_docker_timestamp", parse_docker_timestamp, sample)
+    slow = run("dateutil parse_dt", dateutil_key, sample)
+    print(f"speedup: {slow / fast:.1f}x")
+
+    print(f"\nSorting {len(sample):,} lines by timestamp")
+    started = time.perf_counter()
+    sorted(sample, key=parse_docker_timestamp)
+    fast_sort = time.perf_counter() - started
+    print(f"{'key=parse_docker_timestamp':<28} {fast_sort:8.3f} s")
+    started = time.perf_counter()
+    sorted(sample, key=dateutil_key)
+    slow_sort = time.perf_counter() - started
+    print(f"{'key=parse_dt':<28} {slow_sort:8.3f} s")
+    print(f"speedup: {slow_sort / fast_sort:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
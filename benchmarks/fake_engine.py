@@ -0,0 +1,466 @@
+"""Fake Docker Engine API server for benchmarks and local development.
+
+Serves the subset of the Engine API Logique uses on a unix socket, for a
+simulated host of ``--containers`` containers (``--running`` of them
+running) spread over ``--networks`` networks, and counts every request it
+answers by route. Give each instance its own ``--host-id`` to run several
+side by side as the hosts of a federation; their container ids then differ.
+
+It serves:
+
+* container list/inspect, images, networks, info, ping and version
+* stats, one-shot or streamed every ``--stats-interval`` seconds, each sample
+  delayed by ``--stats-latency`` seconds
+* logs with a ``--log-backlog`` line history per container; followed logs
+  emit ``--log-rate`` new lines per second per container (multiplexed frames,
+  as for a non-TTY container)
+* events; every ``--event-interval`` seconds a random container stops or
+  starts (0 disables the churn)
+* start, stop, restart and remove
+
+Run it on its own to point a development instance at it:
+    python -m benchmarks.fake_engine --socket /tmp/fake-docker.sock --containers 200
+    DOCKER_HOST=unix:///tmp/fake-docker.sock uvicorn app.main:app
+"""
+import argparse
+import asyncio
+import json
+import random
+import re
+import struct
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timezone
+
+from aiohttp import web
+
+API_VERSION = "1.43"
+LEVELS = ["INFO", "INFO", "INFO", "DEBUG", "WARN", "ERROR"]
+
+# (method, path pattern, route name, handler attribute); ids are captured as "id"
+ROUTES = [
+    ("GET", r"/_ping", "/_ping", "ping"),
+    ("GET", r"/version", "/version", "version"),
+    ("GET", r"/info", "/info", "info"),
+    ("GET", r"/containers/json", "/containers/json", "list_containers"),
+    ("GET", r"/containers/(?P<id>[^/]+)/json", "/containers/{id}/json", "inspect_container"),
+    ("GET", r"/containers/(?P<id>[^/]+)/stats", "/containers/{id}/stats", "stats"),
+    ("GET", r"/containers/(?P<id>[^/]+)/logs", "/containers/{id}/logs", "logs"),
+    ("POST", r"/containers/(?P<id>[^/]+)/start", "/containers/{id}/start", "start"),
+    ("POST", r"/containers/(?P<id>[^/]+)/stop", "/containers/{id}/stop", "stop"),
+    ("POST", r"/containers/(?P<id>[^/]+)/restart", "/containers/{id}/restart", "restart"),
+    ("DELETE", r"/containers/(?P<id>[^/]+)", "/containers/{id}", "remove"),
+    ("GET", r"/networks", "/networks", "list_networks"),
+    ("GET", r"/networks/(?P<id>[^/]+)", "/networks/{id}", "inspect_network"),
+    ("GET", r"/images/json", "/images/json", "list_images"),
+    ("GET", r"/images/(?P<id>[^/]+)/json", "/images/{id}/json", "inspect_image"),
+    ("GET", r"/events", "/events", "events"),
+]
+
+
+def docker_time(epoch):
+    """RFC 3339 with nanoseconds, as Docker prints timestamps"""
+    moment = datetime.fromtimestamp(epoch, timezone.utc)
+    return moment.strftime("%Y-%m-%dT%H:%M:%S.%f") + f"{int(epoch * 1e9) % 1000:03d}Z"
+
+
+def frame(payload, stream=1):
+    """One multiplexed log frame (stdout by default)"""
+    return struct.pack(">BxxxI", stream, len(payload)) + payload
+
+
+class FakeEngine:
+    """In-memory Docker host answering Engine API requests, with a request counter"""
+
+    def __init__(self, containers=50, networks=5, images=5, running=None, stats_latency=0.0, stats_interval=1.0,
+                 log_backlog=1000, log_rate=10.0, event_interval=0.0, seed=42, host_id=0):
+        running = containers if running is None else running
+        self.stats_latency = stats_latency
+        self.stats_interval = stats_interval
+        self.log_backlog = log_backlog
+        self.log_rate = log_rate
+        self.event_interval = event_interval
+        self.rng = random.Random(seed)
+        self.started = time.time()
+        self.requests = Counter()
+        self._subscribers = set()
+        self._loop = None
+
+        self.images = [
+            {"Id": f"sha256:{index + 1:064x}", "RepoTags": [f"example/service{index}:latest"], "Created": 1749427200}
+            for index in range(max(1, images))
+        ]
+        self.networks = [
+            {
+                "Name": "bridge" if index == 0 else f"net{index}",
+                "Id": f"{0xa0000 + index:064x}",
+                "Driver": "bridge",
+                "Scope": "local",
+                "Created": "2025-06-09T00:00:00Z",
+                "IPAM": {"Config": [{"Subnet": f"172.{18 + index}.0.0/16"}]},
+            }
+            for index in range(max(1, networks))
+        ]
+        self.containers = {}
+        for index in range(containers):
+            container_id = f"{host_id:04x}{index + 1:060x}"
+            network = self.networks[index % len(self.networks)]
+            image = self.images[index % len(self.images)]
+            self.containers[container_id] = {
+                "Id": container_id,
+                "Name": f"/service-{index}",
+                "Image": image["Id"],
+                "Created": "2025-06-09T00:00:00.000000000Z",
+                "RestartCount": 0,
+                "Platform": "linux",
+                "State": {
+                    "Status": "running" if index < running else "exited", "Running": index < running,
+                    "StartedAt": "2025-06-09T00:00:00.000000000Z", "FinishedAt": "0001-01-01T00:00:00Z",
+                },
+                "Config": {
+                    "Image": image["RepoTags"][0],
+                    "Labels": {"com.example.service": f"service-{index}"},
+                    "Env": ["PATH=/usr/local/bin:/usr/bin", f"SERVICE_INDEX={index}"],
+                },
+                "NetworkSettings": {
+                    "Networks": {network["Name"]: {"IPAddress": f"172.{18 + index % len(self.networks)}.0.{index // len(self.networks) + 2}"}},
+                    "Ports": {"8080/tcp": [{"HostIp": "0.0.0.0", "HostPort": str(20000 + index)}]},
+                },
+                "Mounts": [{"Source": f"/srv/service-{index}", "Destination": "/data"}],
+                "_index": index,
+            }
+
+    # Model helpers
+
+    def _find(self, container_id):
+        attrs = self.containers.get(container_id)
+        if attrs is not None:
+            return attrs
+        for attrs in self.containers.values():
+            if attrs["Id"].startswith(container_id) or attrs["Name"].lstrip("/") == container_id:
+                return attrs
+        return None
+
+    @staticmethod
+    def _public(attrs):
+        return {key: value for key, value in attrs.items() if not key.startswith("_")}
+
+    def _summary(self, attrs):
+        state = attrs["State"]["Status"]
+        return {
+            "Id": attrs["Id"],
+            "Names": [attrs["Name"]],
+            "Image": attrs["Config"]["Image"],
+            "ImageID": attrs["Image"],
+            "Created": 1749427200,
+            "State": state,
+            "Status": "Up 2 hours" if state == "running" else "Exited (0) 5 minutes ago",
+            "Ports": [
+                {"IP": "0.0.0.0", "PrivatePort": 8080, "PublicPort": 20000 + attrs["_index"], "Type": "tcp"}
+            ],
+            "Labels": attrs["Config"]["Labels"],
+            "NetworkSettings": {"Networks": attrs["NetworkSettings"]["Networks"]},
+            "Mounts": attrs["Mounts"],
+        }
+
+    def _stats_sample(self, attrs):
+        index = attrs["_index"]
+        elapsed = time.time() - self.started
+        cpu_total = int((elapsed + 1) * 1e9 * (0.05 + (index % 10) / 100))
+        system_total = int((elapsed + 1) * 1e9 * 4)
+        return {
+            "read": docker_time(time.time()),
+            "cpu_stats": {"cpu_usage": {"total_usage": cpu_total}, "system_cpu_usage": system_total, "online_cpus": 4},
+            "precpu_stats": {
+                "cpu_usage": {"total_usage": int(cpu_total * 0.99)}, "system_cpu_usage": int(system_total * 0.99),
+                "online_cpus": 4,
+            },
+            "memory_stats": {"usage": (64 + index % 256) * 1024 ** 2, "limit": 2 * 1024 ** 3, "stats": {"cache": 0}},
+            "networks": {"eth0": {"rx_bytes": int(elapsed * 4096 * (index + 1)), "tx_bytes": int(elapsed * 2048 * (index + 1))}},
+            "blkio_stats": {"io_service_bytes_recursive": [
+                {"op": "Read", "value": int(elapsed * 1024)}, {"op": "Write", "value": int(elapsed * 512)},
+            ]},
+        }
+
+    def _log_line(self, attrs, number, epoch):
+        rng = random.Random(attrs["_index"] * 1_000_003 + number)
+        message = (
+            f"{rng.choice(LEVELS)} [worker-{rng.randrange(8)}] request_id={rng.getrandbits(64):016x} "
+            f"handled job {number} in {rng.randrange(1, 5000)}ms"
+        )
+        return f"{docker_time(epoch)} {message}\n".encode()
+
+    def _emit_event(self, attrs, action):
+        event = {
+            "Type": "container", "Action": action, "status": action, "id": attrs["Id"],
+            "Actor": {"ID": attrs["Id"], "Attributes": {"name": attrs["Name"].lstrip("/"), "image": attrs["Config"]["Image"]}},
+            "time": int(time.time()), "timeNano": time.time_ns(),
+        }
+        for queue in list(self._subscribers):
+            queue.put_nowait(event)
+
+    def _set_state(self, attrs, running):
+        attrs["State"]["Status"] = "running" if running else "exited"
+        attrs["State"]["Running"] = running
+        if running:
+            attrs["State"]["StartedAt"] = docker_time(time.time())
+        else:
+            attrs["State"]["FinishedAt"] = docker_time(time.time())
+
+    # Handlers
+
+    async def ping(self, request):
+        return web.Response(text="OK")
+
+    async def version(self, request):
+        return web.json_response({"ApiVersion": API_VERSION, "Version": "24.0.0", "MinAPIVersion": "1.12"})
+
+    async def info(self, request):
+        running = sum(1 for attrs in self.containers.values() if attrs["State"]["Running"])
+        return web.json_response({
+            "Name": "fake-engine", "ServerVersion": "24.0.0", "Containers": len(self.containers),
+            "ContainersRunning": running, "ContainersStopped": len(self.containers) - running,
+            "Images": len(self.images), "NCPU": 4, "MemTotal": 8 * 1024 ** 3,
+        })
+
+    async def list_containers(self, request):
+        show_all = request.query.get("all") in ("1", "true", "True")
+        filters = json.loads(request.query.get("filters") or "{}")
+        ids = filters.get("id")
+        summaries = []
+        for attrs in self.containers.values():
+            if not show_all and not attrs["State"]["Running"]:
+                continue
+            if ids and not any(attrs["Id"].startswith(i) for i in ids):
+                continue
+            summaries.append(self._summary(attrs))
+        return web.json_response(summaries)
+
+    async def inspect_container(self, request, attrs):
+        return web.json_response(self._public(attrs))
+
+    async def stats(self, request, attrs):
+        if request.query.get("stream") in ("0", "false", "False"):
+            await asyncio.sleep(self.stats_latency)
+            return web.json_response(self._stats_sample(attrs))
+        response = web.StreamResponse(headers={"Content-Type": "application/json"})
+        await response.prepare(request)
+        try:
+            while attrs["State"]["Running"]:
+                await asyncio.sleep(self.stats_latency)
+                await response.write(json.dumps(self._stats_sample(attrs)).encode() + b"\n")
+                await asyncio.sleep(self.stats_interval)
+        except ConnectionResetError:
+            pass  # Client closed the stream
+        return response
+
+    async def logs(self, request, attrs):
+        query = request.query
+        tail = query.get("tail", "all")
+        follow = query.get("follow") in ("1", "true", "True")
+        since = float(query["since"]) if query.get("since") else None
+        spacing = 1 / self.log_rate if self.log_rate > 0 else 1.0
+
+        numbers = range(self.log_backlog)
+        if tail not in ("all", "-1"):
+            numbers = numbers[max(0, self.log_backlog - int(tail)):]
+        lines = []
+        for number in numbers:
+            epoch = self.started - (self.log_backlog - number) * spacing
+            if since is None or epoch >= since:
+                lines.append(self._log_line(attrs, number, epoch))
+
+        if not follow:
+            return web.Response(body=b"".join(frame(line) for line in lines), content_type="application/octet-stream")
+
+        response = web.StreamResponse(headers={"Content-Type": "application/vnd.docker.multiplexed-stream"})
+        await response.prepare(request)
+        try:
+            if lines:
+                await response.write(b"".join(frame(line) for line in lines))
+            number = self.log_backlog
+            next_time = time.monotonic()
+            while self.log_rate > 0 and attrs["State"]["Running"]:
+                next_time += spacing
+                await asyncio.sleep(max(0, next_time - time.monotonic()))
+                await response.write(frame(self._log_line(attrs, number, time.time())))
+                number += 1
+        except ConnectionResetError:
+            pass  # Client closed the stream
+        return response
+
+    async def start(self, request, attrs):
+        if not attrs["State"]["Running"]:
+            self._set_state(attrs, True)
+            self._emit_event(attrs, "start")
+        return web.Response(status=204)
+
+    async def stop(self, request, attrs):
+        if attrs["State"]["Running"]:
+            self._set_state(attrs, False)
+            self._emit_event(attrs, "die")
+            self._emit_event(attrs, "stop")
+        return web.Response(status=204)
+
+    async def restart(self, request, attrs):
+        self._set_state(attrs, True)
+        attrs["RestartCount"] += 1
+        self._emit_event(attrs, "restart")
+        return web.Response(status=204)
+
+    async def remove(self, request, attrs):
+        del self.containers[attrs["Id"]]
+        self._emit_event(attrs, "destroy")
+        return web.Response(status=204)
+
+    async def list_networks(self, request):
+        return web.json_response(self.networks)
+
+    async def inspect_network(self, request):
+        network_id = request.match_info["id"]
+        for network in self.networks:
+            if network["Id"].startswith(network_id) or network["Name"] == network_id:
+                return web.json_response(network)
+        return web.json_response({"message": f"network {network_id} not found"}, status=404)
+
+    async def list_images(self, request):
+        return web.json_response(self.images)
+
+    async def inspect_image(self, request):
+        image_id = request.match_info["id"]
+        for image in self.images:
+            if image["Id"].endswith(image_id) or image_id in image["RepoTags"]:
+                return web.json_response(image)
+        return web.json_response({"message": f"No such image: {image_id}"}, status=404)
+
+    async def events(self, request):
+        response = web.StreamResponse(headers={"Content-Type": "application/json"})
+        await response.prepare(request)
+        queue = asyncio.Queue()
+        self._subscribers.add(queue)
+        try:
+            while True:
+                event = await queue.get()
+                await response.write(json.dumps(event).encode() + b"\n")
+        except ConnectionResetError:
+            return response
+        finally:
+            self._subscribers.discard(queue)
+
+    async def _churn(self):
+        """Stop or start a random container every event_interval seconds"""
+        while True:
+            await asyncio.sleep(self.event_interval)
+            if not self.containers:
+                continue
+            attrs = self.rng.choice(list(self.containers.values()))
+            if attrs["State"]["Running"]:
+                self._set_state(attrs, False)
+                self._emit_event(attrs, "die")
+            else:
+                self._set_state(attrs, True)
+                self._emit_event(attrs, "start")
+
+    async def handle(self, request):
+        path = re.sub(r"^/v[\d.]+", "", request.path)
+        for method, pattern, route, handler in ROUTES:
+            match = re.fullmatch(pattern, path)
+            if not match or request.method != method:
+                continue
+            self.requests[route] += 1
+            request.match_info.update(match.groupdict())
+            if "id" in match.groupdict() and route.startswith("/containers/"):
+                attrs = self._find(match["id"])
+                if attrs is None:
+                    return web.json_response({"message": f"No such container: {match['id']}"}, status=404)
+                return await getattr(self, handler)(request, attrs)
+            return await getattr(self, handler)(request)
+        self.requests[f"{request.method} {path} (unhandled)"] += 1
+        return web.json_response({"message": "page not found"}, status=404)
+
+    # Serving
+
+    def app(self):
+        app = web.Application()
+        app.router.add_route("*", "/{tail:.*}", self.handle)
+        return app
+
+    async def start_server(self, socket_path):
+        """Serve on socket_path from the running loop; returns the aiohttp runner"""
+        self._loop = asyncio.get_running_loop()
+        runner = web.AppRunner(self.app(), access_log=None)
+        await runner.setup()
+        await web.UnixSite(runner, socket_path).start()
+        if self.event_interval > 0:
+            asyncio.ensure_future(self._churn())
+        return runner
+
+    def serve(self, socket_path):
+        """Serve on socket_path from a background thread with its own event loop"""
+        started = threading.Event()
+
+        def run():
+            loop = asyncio.new_event_loop()
+            loop.run_until_complete(self.start_server(socket_path))
+            started.set()
+            loop.run_forever()
+
+        threading.Thread(target=run, name="fake-engine", daemon=True).start()
+        started.wait()
+
+    def request_count(self):
+        return sum(self.requests.values())
+
+
+def add_arguments(parser):
+    parser.add_argument("--containers", type=int, default=50)
+    parser.add_argument("--networks", type=int, default=5)
+    parser.add_argument("--images", type=int, default=5)
+    parser.add_argument("--running", type=int, default=None, help="running containers (default: all)")
+    parser.add_argument("--stats-latency", type=float, default=0.0, help="seconds before each stats sample")
+    parser.add_argument("--stats-interval", type=float, default=1.0, help="seconds between streamed stats samples")
+    parser.add_argument("--log-backlog", type=int, default=1000, help="log lines per container before start")
+    parser.add_argument("--log-rate", type=float, default=10.0, help="followed log lines per second per container")
+    parser.add_argument("--event-interval", type=float, default=0.0, help="seconds between container stop/start events")
+    parser.add_argument("--host-id", type=int, default=0, help="distinguishes container ids across fake hosts")
+
+
+def from_args(args):
+    return FakeEngine(
+        containers=args.containers,
+        networks=args.networks,
+        images=args.images,
+        running=args.running,
+        stats_latency=args.stats_latency,
+        stats_interval=args.stats_interval,
+        log_backlog=args.log_backlog,
+        log_rate=args.log_rate,
+        event_interval=args.event_interval,
+        host_id=args.host_id,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--socket", default="/tmp/fake-docker.sock")
+    add_arguments(parser)
+    args = parser.parse_args()
+
+    engine = from_args(args)
+
+    async def run():
+        await engine.start_server(args.socket)
+        print(f"Fake Docker Engine with {args.containers} containers on unix://{args.socket}")
+        while True:
+            await asyncio.sleep(10)
+            print(f"{engine.request_count()} requests: {dict(engine.requests.most_common(6))}")
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
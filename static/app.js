@@ -11,6 +11,8 @@ let containersLoaded = false;
 let currentWsLogs = null;
 let wsSystem = null;
 let wsContainers = null;
+let containersState = {};
+let containersVersion = 0;
 let wsLogs = null;
 
 function connectSystemWebSocket() {
@@ -61,12 +63,28 @@ function connectContainersWebSocket() {
 
   wsContainers.onmessage = function (event) {
     const data = JSON.parse(event.data);
-    if (data.containers) {
-      updateContainersRealtime(data.containers);
-      containersLoaded = true;
-      // Hide loading if both stats and containers are loaded
-      if (statsLoaded && containersLoaded) hideLoading();
+    if (data.type === "snapshot") {
+      containersState = {};
+      data.containers.forEach((c) => { containersState[c.id] = c; });
+    } else if (data.type === "delta") {
+      // A missed version means our copy is stale; ask for a fresh snapshot
+      if (data.version !== containersVersion + 1) {
+        wsContainers.send(JSON.stringify({ action: "resync" }));
+        return;
+      }
+      data.added.forEach((c) => { containersState[c.id] = c; });
+      data.removed.forEach((id) => { delete containersState[id]; });
+      data.changed.forEach((fields) => {
+        if (containersState[fields.id]) Object.assign(containersState[fields.id], fields);
+      });
+    } else {
+      return;
     }
+    containersVersion = data.version;
+    updateContainersRealtime(Object.values(containersState));
+    containersLoaded = true;
+    // Hide loading if both stats and containers are loaded
+    if (statsLoaded && containersLoaded) hideLoading();
   };
 
   wsContainers.onclose = function () {
@@ -801,6 +819,11 @@ function applySettingsImmediately() {
   // Reload data immediately
   // Promise.all([loadSystemStats(), loadContainers()])
 
+  // The system websocket picks up a new refresh interval without reconnecting
+  if (wsSystem && wsSystem.readyState === WebSocket.OPEN) {
+    wsSystem.send(JSON.stringify({ refresh_interval: settings.refreshInterval || 10 }))
+  }
+
   // Update chart points limit
   if (cpuChart && cpuChart.data.length > settings.chartPoints) {
     cpuChart.data = cpuChart.data.slice(-settings.chartPoints)
@@ -1153,23 +1176,43 @@ async function viewContainerLogsInline(containerId, containerName) {
 
   // Establish WebSocket connection
   const protocol = window.location.protocol === "https:" ? "wss:" : "ws:";
-  const wsUrl = `${protocol}//${window.location.host}/ws/container/${containerId}/logs?tail=100`;
+  const logLevel = document.getElementById("network-log-level-filter").value;
+  const wsUrl = `${protocol}//${window.location.host}/ws/container/${containerId}/logs?tail=100&level=${logLevel}`;
   currentWsLogs = new WebSocket(wsUrl);
+  currentStreamLevel = logLevel;
 
   currentWsLogs.onopen = function() {
     console.log(`WebSocket connected for container ${containerName}`);
     logsContent.innerHTML = ''; // Clear loading message once connected
   };
 
+  let droppedReported = 0;
   currentWsLogs.onmessage = function(event) {
-    const logObj = JSON.parse(event.data);
-    const logEntry = {
-      container: containerName,
-      line: logObj.line,
-      timestamp: logObj.timestamp
-    };
-    currentContainerLogs.logs.push(logEntry);
-    appendLogEntry(logEntry);
+    const data = JSON.parse(event.data);
+    // Log lines arrive in frames (arrays); control messages are single objects
+    const items = Array.isArray(data) ? data : [data];
+    items.forEach((logObj) => {
+      if (logObj.error) {
+        logsContent.innerHTML += `<div style="color: red;">Error: ${escapeHtml(logObj.error)}</div>`;
+        return;
+      }
+      if (logObj.filter) return; // Server acknowledged a filter change
+      if (logObj.status) {
+        // The server dropped lines because this viewer fell behind
+        if (logObj.status.dropped > droppedReported) {
+          logsContent.innerHTML += `<div style="color: orange;">${logObj.status.dropped - droppedReported} lines skipped (viewer falling behind, ${logObj.status.lag}s lag)</div>`;
+          droppedReported = logObj.status.dropped;
+        }
+        return;
+      }
+      const logEntry = {
+        container: containerName,
+        line: logObj.line,
+        timestamp: logObj.timestamp
+      };
+      currentContainerLogs.logs.push(logEntry);
+      appendLogEntry(logEntry);
+    });
   };
 
   currentWsLogs.onerror = function(error) {
@@ -1256,6 +1299,10 @@ let currentNetworkLogs = []
 let currentNetworkName = ""
 let currentContainerColors = {}
 let currentMaxNameLen = 10
+// Level the server is filtering the open log stream by; lines below it were never received
+let currentStreamLevel = "all"
+// Each level keeps the ones ranked above it
+const LOG_LEVEL_RANK = { error: 0, warning: 1, info: 2, all: 3 }
 
 // Network logs functionality (unchanged but optimized)
 async function viewNetworkLogsMain(networkName) {
@@ -1289,27 +1336,43 @@ async function viewNetworkLogsMain(networkName) {
 
   // Establish WebSocket connection
   const protocol = window.location.protocol === "https:" ? "wss:" : "ws:";
-  const wsUrl = `${protocol}//${window.location.host}/ws/network/${networkName}/logs?tail=100`;
+  const logLevel = document.getElementById("network-log-level-filter").value;
+  const wsUrl = `${protocol}//${window.location.host}/ws/network/${networkName}/logs?tail=100&level=${logLevel}`;
   currentWsLogs = new WebSocket(wsUrl);
+  currentStreamLevel = logLevel;
 
   currentWsLogs.onopen = function() {
     console.log(`WebSocket connected for network ${networkName}`);
     logsContent.innerHTML = ''; // Clear loading message once connected
   };
 
+  let droppedReported = 0;
   currentWsLogs.onmessage = function(event) {
-    const logObj = JSON.parse(event.data);
-    if (logObj.error) {
-      logsContent.innerHTML += `<div style="color: red;">Error: ${logObj.error}</div>`;
-      return;
-    }
-    const logEntry = {
-      container: logObj.container,
-      line: logObj.line,
-      timestamp: logObj.timestamp
-    };
-    currentNetworkLogs.push(logEntry);
-    appendLogEntry(logEntry);
+    const data = JSON.parse(event.data);
+    // Log lines arrive in frames (arrays); control messages are single objects
+    const items = Array.isArray(data) ? data : [data];
+    items.forEach((logObj) => {
+      if (logObj.error) {
+        logsContent.innerHTML += `<div style="color: red;">Error: ${logObj.error}</div>`;
+        return;
+      }
+      if (logObj.filter) return; // Server acknowledged a filter change
+      if (logObj.status) {
+        // The server dropped lines because this viewer fell behind
+        if (logObj.status.dropped > droppedReported) {
+          logsContent.innerHTML += `<div style="color: orange;">${logObj.status.dropped - droppedReported} lines skipped (viewer falling behind, ${logObj.status.lag}s lag)</div>`;
+          droppedReported = logObj.status.dropped;
+        }
+        return;
+      }
+      const logEntry = {
+        container: logObj.container,
+        line: logObj.line,
+        timestamp: logObj.timestamp
+      };
+      currentNetworkLogs.push(logEntry);
+      appendLogEntry(logEntry);
+    });
   };
 
   currentWsLogs.onerror = function(error) {
@@ -1439,6 +1502,16 @@ function getLogLevelClass(line) {
 function filterNetworkLogs() {
   const logLevel = document.getElementById("network-log-level-filter").value;
   const logsContent = document.getElementById("network-logs-content");
+  if (LOG_LEVEL_RANK[logLevel] > LOG_LEVEL_RANK[currentStreamLevel]) {
+    // Wider than the server filter: the missing lines were never sent, so resubscribe with a fresh tail
+    refreshNetworkLogs();
+    return;
+  }
+  // Have the server drop non-matching lines from now on instead of sending them
+  if (currentWsLogs && currentWsLogs.readyState === WebSocket.OPEN) {
+    currentWsLogs.send(JSON.stringify({ action: "filter", level: logLevel }));
+    currentStreamLevel = logLevel;
+  }
   if (currentContainerLogs) {
     if (logsContent) {
       logsContent.innerHTML = renderContainerLogs(
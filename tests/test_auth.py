@@ -0,0 +1,59 @@
+import asyncio
+
+import pytest
+
+from app.auth import AuthManager, HashingBusy
+
+
+@pytest.fixture
+def auth(tmp_path):
+    manager = AuthManager(data_file=str(tmp_path / "users.json"), hash_workers=1, max_pending_hashes=1)
+    manager.create_user("admin", "password1")
+    yield manager
+    manager.close()
+
+
+def test_hashing_past_the_cap_fails_fast(auth):
+    async def run():
+        first = asyncio.create_task(auth.verify_password_async("admin", "password1"))
+        await asyncio.sleep(0)
+        with pytest.raises(HashingBusy):
+            await auth.verify_password_async("admin", "password1")
+        return await first
+
+    assert asyncio.run(run()) is True
+    # The slot is released once the hash finishes
+    assert asyncio.run(auth.verify_password_async("admin", "wrong-password")) is False
+
+
+class InvalidatingUsers:
+    """Store whose read is followed by an invalidation, as if change_password ran meanwhile"""
+
+    def __init__(self, auth, users):
+        self.auth = auth
+        self.users = users
+
+    def __contains__(self, username):
+        return username in self.users
+
+    def __getitem__(self, username):
+        user = self.users[username]
+        self.auth.invalidate_tokens(username)
+        return user
+
+
+def test_verification_racing_invalidation_is_not_cached(auth):
+    token = auth.create_token("admin")
+    store = auth.users
+    auth.users = InvalidatingUsers(auth, store)
+    try:
+        assert auth.verify_token(token)["username"] == "admin"
+    finally:
+        auth.users = store
+    assert token not in auth._token_cache
+
+    # Without a concurrent invalidation the result is cached
+    assert auth.verify_token(token)["username"] == "admin"
+    assert token in auth._token_cache
+    auth.delete_user("admin")
+    assert auth.verify_token(token) is None
@@ -0,0 +1,100 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from app.coalesce import Coalescer, coalesced
+
+
+class Service:
+    def __init__(self):
+        self.coalescer = Coalescer()
+        self.calls = []
+        self.release = None
+
+    @coalesced
+    async def load(self, name):
+        self.calls.append(name)
+        await self.release.wait()
+        return {"name": name}
+
+    @coalesced
+    def load_blocking(self, name):
+        self.calls.append(name)
+        # Hold the run until the other threads have joined it
+        while self.coalescer.stats()["load_blocking"]["calls"] < 4:
+            time.sleep(0.001)
+        return {"name": name}
+
+
+def test_concurrent_callers_share_one_run_per_arguments():
+    service = Service()
+
+    async def run():
+        service.release = asyncio.Event()
+        calls = [service.load("a") for _ in range(5)] + [service.load("b")]
+        pending = asyncio.gather(*calls)
+        await asyncio.sleep(0)
+        service.release.set()
+        results = await pending
+        # Finished runs are not cached
+        results.append(await service.load("a"))
+        return results
+
+    results = asyncio.run(run())
+    assert service.calls == ["a", "b", "a"]
+    assert results[0] is results[4] and results[5] == {"name": "b"}
+    assert service.coalescer.stats() == {"load": {"calls": 7, "coalesced": 4}}
+
+
+def test_cancelled_caller_does_not_cancel_the_shared_run():
+    service = Service()
+
+    async def run():
+        service.release = asyncio.Event()
+        first = asyncio.ensure_future(service.load("a"))
+        second = asyncio.ensure_future(service.load("a"))
+        await asyncio.sleep(0)
+        first.cancel()
+        await asyncio.sleep(0)
+        service.release.set()
+        return first, await second
+
+    first, result = asyncio.run(run())
+    assert first.cancelled()
+    assert result == {"name": "a"}
+    assert service.calls == ["a"]
+
+
+def test_errors_reach_every_waiting_caller():
+    coalescer = Coalescer()
+
+    async def fail():
+        await asyncio.sleep(0)
+        raise ValueError("boom")
+
+    async def run():
+        return await asyncio.gather(
+            *(coalescer.run_async("fail", "key", fail) for _ in range(3)), return_exceptions=True
+        )
+
+    results = asyncio.run(run())
+    assert [type(error) for error in results] == [ValueError] * 3
+    assert coalescer.stats() == {"fail": {"calls": 3, "coalesced": 2}}
+
+
+def test_blocking_callers_share_the_first_thread_call():
+    service = Service()
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(service.load_blocking("a"))) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert service.calls == ["a"]
+    assert all(result is results[0] for result in results)
+    assert service.coalescer.stats()["load_blocking"] == {"calls": 4, "coalesced": 3}
+    with pytest.raises(ZeroDivisionError):
+        Coalescer().run("divide", "key", lambda: 1 / 0)
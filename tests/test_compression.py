@@ -0,0 +1,89 @@
+import asyncio
+import gzip
+import zlib
+
+import pytest
+
+from app.compression import CompressionMiddleware, accepted_encodings
+
+
+def plain_app(body, content_type=b"application/json", chunks=None):
+    """ASGI app sending body whole, or as chunks when given"""
+    async def app(scope, receive, send):
+        headers = [(b"content-type", content_type)]
+        if chunks is None:
+            headers.append((b"content-length", str(len(body)).encode()))
+        await send({"type": "http.response.start", "status": 200, "headers": headers})
+        if chunks is None:
+            await send({"type": "http.response.body", "body": body})
+            return
+        for index, chunk in enumerate(chunks):
+            await send({"type": "http.response.body", "body": chunk, "more_body": index < len(chunks) - 1})
+    return app
+
+
+def request(app, accept_encoding="gzip, br;q=0", **settings):
+    scope = {
+        "type": "http", "method": "GET", "path": "/",
+        "headers": [(b"accept-encoding", accept_encoding.encode())] if accept_encoding else [],
+    }
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b""}
+
+    async def send(message):
+        messages.append(message)
+
+    asyncio.run(CompressionMiddleware(app, **settings)(scope, receive, send))
+    start, *bodies = messages
+    headers = {key.decode(): value.decode() for key, value in start["headers"]}
+    return headers, bodies
+
+
+def test_accept_encoding_parsing_drops_q_zero():
+    assert accepted_encodings("gzip;q=0.5, br;q=0, Deflate , x;q=bad") == {"gzip", "deflate"}
+
+
+def test_small_responses_are_sent_as_is():
+    headers, bodies = request(plain_app(b"x" * 100), minimum_size=1024)
+    assert "content-encoding" not in headers
+    assert bodies[0]["body"] == b"x" * 100
+
+
+def test_large_responses_are_gzipped_with_a_new_length():
+    body = b'{"line": "INFO handled request"}\n' * 200
+    headers, bodies = request(plain_app(body), minimum_size=1024)
+    assert headers["content-encoding"] == "gzip"
+    assert headers["vary"] == "Accept-Encoding"
+    assert int(headers["content-length"]) == len(bodies[0]["body"]) < len(body)
+    assert gzip.decompress(bodies[0]["body"]) == body
+
+
+def test_already_compressed_types_and_unsupported_clients_are_skipped():
+    body = b"\x89PNG" * 1000
+    headers, _ = request(plain_app(body, content_type=b"image/png"), minimum_size=10)
+    assert "content-encoding" not in headers
+    headers, _ = request(plain_app(b"x" * 5000), accept_encoding="identity", minimum_size=10)
+    assert "content-encoding" not in headers
+
+
+def test_streamed_chunks_decompress_as_they_arrive():
+    chunks = [b'{"n": %d}\n' % n for n in range(3)]
+    headers, bodies = request(plain_app(b"", chunks=chunks), minimum_size=1024)
+
+    # Streamed responses are compressed whatever their size, without a length
+    assert headers["content-encoding"] == "gzip"
+    assert "content-length" not in headers
+    assert [message["more_body"] for message in bodies] == [True, True, False]
+    decompressor = zlib.decompressobj(31)
+    # Each chunk is sync-flushed, so it decodes before the stream ends
+    assert [decompressor.decompress(message["body"]) for message in bodies] == chunks
+
+
+def test_brotli_is_preferred_when_accepted():
+    brotli = pytest.importorskip("brotli")
+    body = b"INFO handled request\n" * 200
+    headers, bodies = request(plain_app(body), accept_encoding="gzip, br", minimum_size=1024)
+    assert headers["content-encoding"] == "br"
+    assert brotli.decompress(bodies[0]["body"]) == body
@@ -0,0 +1,29 @@
+import asyncio
+
+from app.container_feed import ContainerFeed
+
+
+def test_concurrent_first_subscribers_start_one_poller():
+    loads = []
+
+    async def load():
+        loads.append(1)
+        await asyncio.sleep(0.01)
+        return [{"id": "a", "status": "running"}]
+
+    async def wait_for_change(version):
+        await asyncio.sleep(3600)
+
+    async def run():
+        feed = ContainerFeed(load, wait_for_change)
+        subscribers = await asyncio.gather(*(feed.subscribe() for _ in range(5)))
+        pollers = [task for task in asyncio.all_tasks() if task.get_coro().__qualname__ == "ContainerFeed._run"]
+        for subscriber in subscribers:
+            feed.unsubscribe(subscriber)
+        for task in pollers:
+            task.cancel()
+        return len(pollers)
+
+    assert asyncio.run(run()) == 1
+    # Only the first subscriber refreshed; the rest reused its snapshot
+    assert len(loads) == 1
@@ -0,0 +1,53 @@
+import asyncio
+import struct
+
+from app.docker_async import AsyncDockerEngine
+
+
+class FakeContent:
+    """Just enough of aiohttp's StreamReader to feed _iter_log_lines"""
+
+    def __init__(self, data):
+        self.data = data
+        self.offset = 0
+
+    async def readexactly(self, n):
+        chunk = self.data[self.offset:self.offset + n]
+        self.offset += len(chunk)
+        if len(chunk) < n:
+            raise asyncio.IncompleteReadError(chunk, n)
+        return chunk
+
+    async def read(self, n):
+        chunk = self.data[self.offset:self.offset + n]
+        self.offset += len(chunk)
+        return chunk
+
+
+def frame(stream, data):
+    return struct.pack(">BxxxI", stream, len(data)) + data
+
+
+def log_lines(data):
+    async def run():
+        return [line async for line in AsyncDockerEngine._iter_log_lines(FakeContent(data))]
+    return asyncio.run(run())
+
+
+def test_multiplexed_partial_lines_stay_on_their_own_stream():
+    data = (
+        frame(1, b"out one\nout t")
+        + frame(2, b"err o")
+        + frame(1, b"wo\n")
+        + frame(2, b"ne\nerr tail")
+    )
+    assert log_lines(data) == [b"out one\n", b"out two\n", b"err one\n", b"err tail"]
+
+
+def test_tty_stream_splits_lines_across_reads():
+    lines = [f"line {i}\n".encode() for i in range(20000)]
+    assert log_lines(b"".join(lines) + b"partial") == lines + [b"partial"]
+
+
+def test_short_stream_is_returned_as_is():
+    assert log_lines(b"hi\n") == [b"hi\n"]
@@ -0,0 +1,96 @@
+import asyncio
+
+import pytest
+
+from app.docker_client import DockerClient
+from app.federation import DockerFederation
+from benchmarks.fake_engine import FakeEngine
+
+
+@pytest.fixture
+def fake_hosts(tmp_path, monkeypatch):
+    """A local and a remote fake Docker host, each served from its own thread"""
+    local = FakeEngine(containers=3, networks=2, log_backlog=20, log_rate=0, host_id=1)
+    remote = FakeEngine(containers=2, networks=1, running=1, log_backlog=20, log_rate=0, host_id=2)
+    local.serve(str(tmp_path / "local.sock"))
+    remote.serve(str(tmp_path / "remote.sock"))
+    monkeypatch.setenv("DOCKER_HOST", f"unix://{tmp_path / 'local.sock'}")
+    return local, remote, f"unix://{tmp_path / 'remote.sock'}"
+
+
+async def start_client():
+    client = DockerClient()
+    client.inventory.start()
+    deadline = asyncio.get_running_loop().time() + 5
+    while not client.inventory.ready:
+        assert asyncio.get_running_loop().time() < deadline, "inventory did not load"
+        await asyncio.sleep(0.01)
+    return client
+
+
+async def close(federation, client):
+    await federation.close()
+    await client.inventory.stop()
+    await client.log_multiplexer.close()
+    client.stats_collector.stop()
+    await client.engine.close()
+    client.close()
+
+
+def test_federation_spans_hosts_and_routes_by_container(fake_hosts):
+    local, remote, remote_url = fake_hosts
+    remote_id, stopped_id = list(remote.containers)
+
+    async def run():
+        client = await start_client()
+        federation = DockerFederation(client, hosts=[("edge", remote_url)], local_name="core")
+        try:
+            containers = await federation.containers()
+            networks = await federation.networks()
+            details = await federation.container_details(remote_id[:12])
+            local_details = await federation.container_details(next(iter(local.containers)))
+            await federation.container_action(remote_id, "stop")
+            metrics = federation.prometheus_containers()
+            return containers, networks, details, local_details, metrics
+        finally:
+            await close(federation, client)
+
+    containers, networks, details, local_details, metrics = asyncio.run(run())
+
+    assert sorted((c["host"], c["name"]) for c in containers) == [
+        ("core", "service-0"), ("core", "service-1"), ("core", "service-2"),
+        ("edge", "service-0"), ("edge", "service-1"),
+    ]
+    assert {"bridge", "net1", "bridge@edge"} <= networks.keys()
+    assert [c["host"] for c in networks["bridge@edge"]["containers"]] == ["edge", "edge"]
+
+    # Remote containers are inspected on their own host, local ones locally
+    assert details["id"] == remote_id and details["host"] == "edge"
+    assert details["image"] == "example/service0:latest"
+    assert local_details["host"] == "core"
+
+    assert not remote.containers[remote_id]["State"]["Running"]
+    assert local.containers and all(attrs["State"]["Running"] for attrs in local.containers.values())
+
+    hosts = {labels["name"]: labels["host"] for labels, _ in metrics if labels["host"] == "edge"}
+    assert hosts == {"service-0": "edge", "service-1": "edge"}
+    assert {labels["host"] for labels, _ in metrics} == {"core", "edge"}
+    assert stopped_id[:12] in {labels["id"] for labels, _ in metrics}
+
+
+def test_unreachable_host_only_drops_its_own_results(fake_hosts, tmp_path):
+    _, _, remote_url = fake_hosts
+
+    async def run():
+        client = await start_client()
+        federation = DockerFederation(
+            client, hosts=[("edge", remote_url), ("gone", f"unix://{tmp_path / 'missing.sock'}")], timeout=1
+        )
+        try:
+            return await federation.containers()
+        finally:
+            await close(federation, client)
+
+    containers = asyncio.run(run())
+    assert sorted({c["host"] for c in containers}) == ["edge", "local"]
+    assert len(containers) == 5
@@ -0,0 +1,50 @@
+import asyncio
+
+from app.inventory import DockerInventory, summary_attrs
+
+
+def summary(container_id, state):
+    return {"Id": container_id, "Names": [f"/{container_id}"], "ImageID": "sha256:abc", "State": state}
+
+
+class FakeEngine:
+    def __init__(self, summaries):
+        self.summaries = summaries
+
+    async def list_networks(self):
+        return []
+
+    async def list_containers(self, all=True):
+        return self.summaries
+
+    async def list_images(self):
+        return []
+
+
+def test_summary_attrs_leaves_out_inspect_only_fields():
+    attrs = summary_attrs(summary("a", "running"))
+    assert "RestartCount" not in attrs
+    assert attrs["State"] == {"Status": "running", "Running": True}
+
+
+def test_reload_keeps_inspected_fields_while_state_is_unchanged():
+    engine = FakeEngine([summary("a", "running"), summary("b", "running")])
+    inventory = DockerInventory(engine)
+    inspected_state = {"Status": "running", "Running": True, "StartedAt": "2025-06-09T00:00:00Z"}
+
+    async def run():
+        await inventory._load()
+        # As if events had re-inspected both containers
+        for container_id in ("a", "b"):
+            inventory._containers[container_id]["RestartCount"] = 3
+            inventory._containers[container_id]["State"] = dict(inspected_state)
+        engine.summaries = [summary("a", "running"), summary("b", "exited")]
+        await inventory._load()
+
+    asyncio.run(run())
+
+    assert inventory.get_container("a")["RestartCount"] == 3
+    assert inventory.get_container("a")["State"] == inspected_state
+    # b changed state since it was inspected, so its old details are dropped
+    assert "RestartCount" not in inventory.get_container("b")
+    assert inventory.get_container("b")["State"] == {"Status": "exited", "Running": False}
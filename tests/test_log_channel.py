@@ -0,0 +1,76 @@
+import asyncio
+
+import pytest
+
+from app.log_mux import LogChannel, parse_log_line
+
+
+def drain(channel):
+    items = []
+    while not channel.queue.empty():
+        items.append(channel.get_nowait())
+    return items
+
+
+def test_drop_oldest_keeps_the_newest_lines_and_end_markers():
+    channel = LogChannel(maxsize=3, policy="drop-oldest")
+    channel.deliver(None)
+    for line in range(5):
+        channel.deliver(line)
+
+    items = drain(channel)
+    assert None in items
+    assert [item for item in items if item is not None] == [3, 4]
+    assert channel.dropped == 3
+
+
+def test_sample_keeps_every_nth_line_once_half_full():
+    channel = LogChannel(maxsize=10, policy="sample", sample_every=3)
+    for line in range(11):
+        channel.deliver(line)
+
+    # Lines 0-4 fill half the queue; after that only every third line is kept
+    assert drain(channel) == [0, 1, 2, 3, 4, 7, 10]
+    assert channel.dropped == 4
+    channel.deliver(None)
+    assert drain(channel) == [None]
+
+
+def test_block_waits_for_the_viewer_without_dropping():
+    channel = LogChannel(maxsize=2, policy="block")
+
+    async def run():
+        await channel.put(1)
+        await channel.put(2)
+        blocked = asyncio.ensure_future(channel.put(3))
+        await asyncio.sleep(0.01)
+        waiting = not blocked.done()
+        first = await channel.get()
+        await blocked
+        return waiting, [first, await channel.get(), await channel.get()]
+
+    assert asyncio.run(run()) == (True, [1, 2, 3])
+    assert channel.dropped == 0
+
+
+def test_status_reports_drops_at_most_once_per_interval():
+    channel = LogChannel(maxsize=2, policy="drop-oldest", report_interval=3600)
+    assert channel.status() is None
+    for line in range(4):
+        channel.deliver(line)
+
+    assert channel.status() == {"policy": "drop-oldest", "dropped": 2, "pending": 2, "lag": 0.0}
+    channel.deliver(5)
+    assert channel.status() is None
+
+
+def test_unknown_policy_is_rejected():
+    with pytest.raises(ValueError):
+        LogChannel(policy="never")
+
+
+def test_parse_log_line_splits_the_timestamp():
+    assert parse_log_line(b"2025-06-09T10:00:00.123456789Z hello world\n") == {
+        "timestamp": "2025-06-09T10:00:00.123456789Z", "line": "hello world",
+    }
+    assert parse_log_line(b"bare\n") == {"timestamp": "", "line": "bare"}
@@ -0,0 +1,45 @@
+import pytest
+
+from app.log_filter import LogFilter
+
+
+def test_empty_filter_matches_everything():
+    log_filter = LogFilter()
+    assert not log_filter.active
+    assert log_filter.matches("anything at all")
+    assert log_filter.to_dict() == {"level": "all", "contains": None, "regex": None}
+
+
+@pytest.mark.parametrize("level, kept", [
+    ("error", ["ERROR disk full"]),
+    ("warning", ["ERROR disk full", "WARN slow query"]),
+    ("info", ["ERROR disk full", "WARN slow query", "INFO started"]),
+    ("debug", ["ERROR disk full", "WARN slow query", "INFO started", "DEBUG tick"]),
+])
+def test_each_level_keeps_the_more_severe_ones(level, kept):
+    lines = ["ERROR disk full", "WARN slow query", "INFO started", "DEBUG tick"]
+    log_filter = LogFilter(level=level.upper())
+    assert [line for line in lines if log_filter.matches(line)] == kept
+
+
+def test_level_keyword_and_regex_must_all_match():
+    log_filter = LogFilter(level="error", contains="Disk", regex=r"/dev/sd[a-z]")
+    assert log_filter.matches("ERROR disk /dev/sda full")
+    assert not log_filter.matches("ERROR disk /dev/nvme0 full")
+    assert not log_filter.matches("INFO disk /dev/sda mounted")
+    # The keyword is literal, not a pattern
+    assert LogFilter(contains="a.b").matches("x a.b y")
+    assert not LogFilter(contains="a.b").matches("x acb y")
+
+
+def test_bad_update_leaves_the_filter_unchanged():
+    log_filter = LogFilter(level="error")
+    with pytest.raises(ValueError):
+        log_filter.update(regex="(unclosed")
+    with pytest.raises(ValueError):
+        log_filter.update(level="loud")
+    assert log_filter.to_dict() == {"level": "error", "contains": None, "regex": None}
+    assert not log_filter.matches("INFO fine")
+
+    log_filter.update(contains="fine")
+    assert log_filter.matches("INFO fine")
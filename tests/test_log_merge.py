@@ -0,0 +1,48 @@
+import asyncio
+from contextlib import aclosing
+
+from app.log_merge import merge_sorted_streams
+
+
+def tracked_stream(values, closed, name):
+    async def generate():
+        try:
+            for value in values:
+                yield value
+                await asyncio.sleep(0)
+        finally:
+            closed.append(name)
+    return generate()
+
+
+def test_merge_orders_items_across_streams():
+    async def run():
+        closed = []
+        streams = [tracked_stream([1, 4, 7], closed, "a"), tracked_stream([2, 3, 9], closed, "b")]
+        return [item async for item in merge_sorted_streams(streams, key=lambda item: item)], list(closed)
+
+    merged, closed = asyncio.run(run())
+    assert merged == [1, 2, 3, 4, 7, 9]
+    assert sorted(closed) == ["a", "b"]
+
+
+def test_stopping_early_closes_every_source():
+    async def run():
+        closed = []
+        streams = [
+            tracked_stream(range(0, 100, 3), closed, "a"),
+            tracked_stream(range(1, 100, 3), closed, "b"),
+            tracked_stream(range(2, 100, 3), closed, "c"),
+        ]
+        seen = []
+        async with aclosing(merge_sorted_streams(streams, key=lambda item: item)) as merged:
+            async for item in merged:
+                seen.append(item)
+                if len(seen) == 4:
+                    break
+        # Checked before asyncio.run finalizes leftover generators
+        return seen, list(closed)
+
+    seen, closed = asyncio.run(run())
+    assert seen == [0, 1, 2, 3]
+    assert sorted(closed) == ["a", "b", "c"]
@@ -0,0 +1,68 @@
+import time
+
+import pytest
+
+from app.log_store import LogStore
+
+SECOND = 1_000_000_000
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = LogStore(str(tmp_path / "logs.db"))
+    yield store
+    store.close()
+
+
+def test_search_by_text_time_and_container(store):
+    now = time.time_ns()
+    store.insert_many([
+        ("aaa", "web", now - 3 * SECOND, "ERROR upstream timed out"),
+        ("bbb", "db", now - 2 * SECOND, "INFO checkpoint complete"),
+        ("aaa", "web", now - 1 * SECOND, "INFO request served"),
+        ("bbb", "db", now, "ERROR disk full"),
+    ])
+
+    assert [row["line"] for row in store.search("error")] == ["ERROR upstream timed out", "ERROR disk full"]
+    assert [row["line"] for row in store.search(since=now - 2 * SECOND, until=now - SECOND)] == [
+        "INFO checkpoint complete", "INFO request served",
+    ]
+    # Containers match by id or by name
+    assert [row["container"] for row in store.search(containers=["web"])] == ["web", "web"]
+    assert [row["ts"] for row in store.search("error", containers=["bbb"])] == [now]
+    assert len(store.search(limit=2)) == 2
+    assert store.last_timestamp("aaa") == now - SECOND
+    assert store.last_timestamp("missing") is None
+
+
+def test_malformed_query_raises_value_error(store):
+    with pytest.raises(ValueError):
+        store.search('"unterminated')
+
+
+def test_prune_drops_lines_past_retention(store):
+    now = time.time_ns()
+    store.retention_ns = 60 * SECOND
+    store.insert_many([
+        ("aaa", "web", now - 120 * SECOND, "INFO old"),
+        ("aaa", "web", now, "INFO new"),
+    ])
+    store.prune()
+
+    assert [row["line"] for row in store.search()] == ["INFO new"]
+    # The full-text index follows deletions
+    assert store.search("old") == []
+
+
+def test_prune_drops_oldest_lines_until_under_the_size_cap(store):
+    now = time.time_ns()
+    store.insert_many([("aaa", "web", now + n, f"INFO line {n} " + "x" * 200) for n in range(2000)])
+    store.max_bytes = store.used_bytes() // 2
+    store.prune(batch=100)
+
+    remaining = store.search(limit=5000)
+    assert store.used_bytes() <= store.max_bytes
+    assert 0 < len(remaining) < 2000
+    # The newest lines survive
+    assert remaining[-1]["ts"] == now + 1999
+    assert remaining[0]["ts"] == now + 2000 - len(remaining)
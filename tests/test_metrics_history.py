@@ -0,0 +1,62 @@
+import time
+
+import pytest
+
+from app.metrics_history import MetricSeries, MetricsHistory, RollupRing
+
+
+def test_ring_averages_samples_per_slot_and_reuses_old_slots():
+    ring = RollupRing(step=60, size=3, field_count=2)
+    ring.add(120, [1.0, 10.0])
+    ring.add(150, [3.0, 20.0])
+    ring.add(185, [5.0, 30.0])
+
+    assert ring.points(0, 239) == [[120, 2.0, 15.0], [180, 5.0, 30.0]]
+    # Three slots later slot 120 is overwritten by 300
+    ring.add(300, [7.0, 0.0])
+    assert ring.points(0, 359) == [[180, 5.0, 30.0], [300, 7.0, 0.0]]
+    assert ring.nbytes == 3 * 8 + 3 * 2 + 6 * 4
+
+
+def test_series_rolls_up_and_turns_counters_into_rates():
+    series = MetricSeries(("cpu_percent", "net_rx_bytes_per_s"))
+    series.add(3600, {"cpu_percent": 10, "net_rx_bytes": 1000})
+    series.add(3601, {"cpu_percent": 20, "net_rx_bytes": 3000})
+    series.add(3603, {"cpu_percent": 30, "net_rx_bytes": 4000})
+    # Counter went backwards: the container restarted, so no rate for this sample
+    series.add(3604, {"cpu_percent": 40, "net_rx_bytes": 10})
+
+    seconds, minutes, hours = series.rings
+    assert seconds.points(3600, 3604) == [
+        [3600, 10.0, 0.0], [3601, 20.0, 2000.0], [3603, 30.0, 500.0], [3604, 40.0, 0.0],
+    ]
+    assert minutes.points(3600, 3659) == [[3600, 25.0, 625.0]]
+    assert hours.points(3600, 7199) == [[3600, 25.0, 625.0]]
+
+
+def test_query_picks_the_finest_resolution_covering_the_range():
+    history = MetricsHistory(None, None)
+    now = time.time()
+    for offset in range(5, 0, -1):
+        history.record(now - offset, {"cpu_percent": offset, "net_rx_bytes": 0}, {})
+
+    assert history.query(since=now - 60)["step"] == 1
+    assert len(history.query(since=now - 60)["points"]) == 5
+    assert history.query(since=now - 3600)["step"] == 60
+    assert history.query(since=now - 7 * 86400)["step"] == 3600
+    assert history.query(since=now - 60, resolution="1h")["step"] == 3600
+    assert history.latest_host == {"cpu_percent": 1, "net_rx_bytes": 0}
+    with pytest.raises(ValueError):
+        history.query(resolution="5m")
+
+
+def test_least_recently_updated_container_is_evicted():
+    history = MetricsHistory(None, None, max_containers=2)
+    history.record(100, None, {"a": ("web", {"cpu_percent": 1}), "b": ("db", {"cpu_percent": 2})})
+    history.record(101, None, {"a": ("web-renamed", {"cpu_percent": 1})})
+    history.record(102, None, {"c": ("cache", {"cpu_percent": 3})})
+
+    assert sorted(history.containers) == ["a", "c"]
+    assert history.containers["a"].name == "web-renamed"
+    assert history.query("b") is None
+    assert history.query("a", since=0, until=101, resolution="1h")["name"] == "web-renamed"
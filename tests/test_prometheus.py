@@ -0,0 +1,70 @@
+from app.prometheus import container_samples, render_metrics
+
+STATS = {
+    "cpu_stats": {"cpu_usage": {"total_usage": 2_500_000_000}},
+    "memory_stats": {"usage": 64 * 1024 ** 2, "limit": 1024 ** 3},
+    "networks": {"eth0": {"rx_bytes": 100, "tx_bytes": 40}, "eth1": {"rx_bytes": 1, "tx_bytes": 2}},
+    "blkio_stats": {"io_service_bytes_recursive": [
+        {"op": "Read", "value": 10}, {"op": "read", "value": 5}, {"op": "Write", "value": 7},
+    ]},
+}
+
+
+def series(body):
+    """{series line without value: value} for every sample in the exposition"""
+    samples = {}
+    for line in body.splitlines():
+        if line and not line.startswith("#"):
+            name, _, value = line.rpartition(" ")
+            samples[name] = value
+    return samples
+
+
+def test_render_host_and_container_series():
+    attrs = {"State": {"Status": "running"}, "RestartCount": 2}
+    labels = {"id": "abc", "name": 'web "1"', "image": "nginx", "network": "bridge"}
+    body = render_metrics(
+        {"cpu_percent": 12.5, "load_1min": None, "memory_total_bytes": 1024},
+        [(labels, container_samples(attrs, STATS, 3.14159))],
+    )
+    samples = series(body)
+    prefix = 'id="abc",name="web \\"1\\"",image="nginx",network="bridge"'
+
+    assert samples["logique_host_cpu_usage_percent"] == "12.5"
+    assert "logique_host_load1" not in body
+    assert samples[f"logique_container_up{{{prefix}}}"] == "1"
+    assert samples[f'logique_container_state{{{prefix},state="running"}}'] == "1"
+    assert samples[f"logique_container_restart_count{{{prefix}}}"] == "2"
+    assert samples[f"logique_container_cpu_usage_percent{{{prefix}}}"] == "3.142"
+    assert samples[f"logique_container_cpu_usage_seconds_total{{{prefix}}}"] == "2.5"
+    assert samples[f"logique_container_network_receive_bytes_total{{{prefix}}}"] == "101"
+    # cgroup v1 and v2 op spellings are both counted
+    assert samples[f"logique_container_blkio_read_bytes_total{{{prefix}}}"] == "15"
+    assert "# TYPE logique_container_cpu_usage_seconds_total counter" in body
+    assert body.count("# HELP logique_container_up ") == 1
+    assert body.endswith("\n")
+
+
+def test_listing_only_container_omits_restart_count_and_stats():
+    samples = container_samples({"State": {"Status": "exited"}}, None, 0.0)
+    assert samples == [
+        ("logique_container_up", None, 0),
+        ("logique_container_state", {"state": "exited"}, 1),
+    ]
+    body = render_metrics(None, [({"id": "abc"}, samples)])
+    assert "restart_count" not in body and "cpu_usage" not in body
+    assert "logique_host" not in body
+
+
+def test_call_and_cache_counters():
+    body = render_metrics(
+        None, [],
+        call_stats={"get_containers_info": {"calls": 10, "coalesced": 4}},
+        cache_stats={"hits": 7, "stale_hits": 1, "misses": 2, "evictions": 0, "refreshes": 1, "size": 3},
+    )
+    samples = series(body)
+    assert samples['logique_docker_calls_total{method="get_containers_info"}'] == "10"
+    assert samples['logique_docker_coalesced_calls_total{method="get_containers_info"}'] == "4"
+    assert samples["logique_cache_hits_total"] == "7"
+    assert samples["logique_cache_entries"] == "3"
+    assert "# TYPE logique_cache_entries gauge" in body
@@ -0,0 +1,112 @@
+import asyncio
+
+from app.supervisor import DockerSupervisor
+
+
+class FakeClient:
+    def __init__(self, number):
+        self.number = number
+
+    async def ping_async(self):
+        return True
+
+
+async def wait_for(predicate, timeout=5.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not predicate():
+        assert asyncio.get_running_loop().time() < deadline, "timed out"
+        await asyncio.sleep(0.01)
+
+
+def test_failed_start_services_releases_client_and_retries():
+    clients = []
+    started = []
+    released = []
+    warmed = []
+
+    def connect():
+        clients.append(FakeClient(len(clients)))
+        return clients[-1]
+
+    async def start_services(client):
+        started.append(client)
+        if len(started) == 1:
+            raise ValueError("bad LOGIQUE_DOCKER_HOSTS entry")
+
+    async def stop_services(client):
+        released.append(client)
+
+    async def warm(client):
+        warmed.append(client)
+
+    async def run():
+        supervisor = DockerSupervisor(connect, start_services, warm, stop_services=stop_services, max_backoff=0.01)
+        supervisor.start()
+        try:
+            await wait_for(lambda: supervisor.warmed)
+            return supervisor.status(), supervisor.client
+        finally:
+            await supervisor.stop()
+
+    status, client = asyncio.run(run())
+
+    assert status == {"docker": True, "warm": True, "error": None}
+    assert started == clients and len(clients) == 2
+    # The first client's services failed: it was released, and the second one went live
+    assert released == [clients[0]]
+    assert client is clients[1]
+    assert warmed == [clients[1]]
+
+
+def test_connect_failure_is_retried_without_release():
+    attempts = []
+    released = []
+
+    def connect():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise ConnectionError("daemon down")
+        return FakeClient(0)
+
+    async def noop(client):
+        pass
+
+    async def stop_services(client):
+        released.append(client)
+
+    async def run():
+        supervisor = DockerSupervisor(connect, noop, noop, stop_services=stop_services, max_backoff=0.01)
+        supervisor.start()
+        try:
+            await wait_for(lambda: supervisor.warmed)
+            return supervisor.status()
+        finally:
+            await supervisor.stop()
+
+    assert asyncio.run(run())["docker"] is True
+    assert len(attempts) == 3
+    assert released == []
+
+
+def test_failed_warm_is_retried_until_it_succeeds():
+    warm_attempts = []
+
+    async def noop(client):
+        pass
+
+    async def warm(client):
+        warm_attempts.append(client)
+        if len(warm_attempts) < 3:
+            raise RuntimeError("daemon busy")
+
+    async def run():
+        supervisor = DockerSupervisor(lambda: FakeClient(0), noop, warm, max_backoff=0.01)
+        supervisor.start()
+        try:
+            await wait_for(lambda: supervisor.warmed)
+            return supervisor.status()
+        finally:
+            await supervisor.stop()
+
+    assert asyncio.run(run()) == {"docker": True, "warm": True, "error": None}
+    assert len(warm_attempts) == 3
@@ -0,0 +1,37 @@
+from datetime import datetime
+
+import pytest
+
+from app.timestamps import parse_docker_timestamp
+
+
+def reference(value):
+    """Nanoseconds via datetime, for timestamps with at most microsecond precision"""
+    moment = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    return int(moment.timestamp()) * 1_000_000_000 + moment.microsecond * 1000
+
+
+def test_nanosecond_fraction():
+    assert parse_docker_timestamp("2025-06-09T12:34:56.123456789Z") == 1749472496_123456789
+
+
+@pytest.mark.parametrize("value", [
+    "2025-06-09T12:34:56Z",
+    "2025-06-09T12:34:56.1Z",
+    "2025-06-09T12:34:56.120000Z",
+    "1970-01-01T00:00:00Z",
+    "2024-02-29T23:59:59.999999Z",
+    "2025-06-09T14:34:56.5+02:00",
+    "2025-06-09T07:04:56-05:30",
+])
+def test_matches_datetime_for_trimmed_fractions_and_offsets(value):
+    assert parse_docker_timestamp(value) == reference(value)
+
+
+@pytest.mark.parametrize("value", [
+    None, "", "not a timestamp", "2025-06-09 12:34:56Z", "2025-06-09T12:34:56.Z",
+    "2025-06-09T12:34:56.1234567890Z", "2025-06-09T12:34:56.12a4Z", "2025-06-09T12:34:56+0200",
+    "2025-13-09T12:34:56Z",
+])
+def test_malformed_timestamps_return_none(value):
+    assert parse_docker_timestamp(value) is None
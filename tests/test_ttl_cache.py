@@ -0,0 +1,168 @@
+import asyncio
+
+import pytest
+
+from app import ttl_cache
+from app.ttl_cache import TTLCache
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+class InlineExecutor:
+    """Runs background refreshes at once, so a test can see their result"""
+
+    def __init__(self):
+        self.submitted = 0
+
+    def submit(self, fn, *args):
+        self.submitted += 1
+        fn(*args)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(ttl_cache, "time", clock)
+    return clock
+
+
+def test_values_expire_after_their_family_ttl(clock):
+    cache = TTLCache({"container_details_": (2, 0), "container_": (10, 0)}, default=(5, 0))
+    cache.set("container_details_a", "details")
+    cache.set("container_networks", "networks")
+    cache.set("docker_info", "info")
+
+    clock.now += 3
+    # The longest matching prefix decides the policy
+    assert cache.get("container_details_a") is None
+    assert cache.get("container_networks") == "networks"
+    assert cache.get("docker_info") == "info"
+    clock.now += 3
+    assert cache.get("docker_info") is None
+    assert cache.get("container_networks") == "networks"
+    assert cache.stats()["size"] == 1
+
+
+def test_least_recently_used_entry_is_evicted(clock):
+    cache = TTLCache({}, maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+
+
+def test_stale_value_is_served_while_one_refresh_runs(clock):
+    executor = InlineExecutor()
+    cache = TTLCache({"system_stats": (5, 30)}, executor=executor)
+    loads = []
+
+    def load():
+        loads.append(clock.now)
+        return len(loads)
+
+    assert cache.get_or_load("system_stats", load) == 1
+    clock.now += 10
+    # Stale: the old value comes back at once and the refresh replaces it
+    assert cache.get_or_load("system_stats", load) == 1
+    assert cache.get_or_load("system_stats", load) == 2
+    assert executor.submitted == 1
+    clock.now += 100
+    # Past the stale window the load is inline again
+    assert cache.get_or_load("system_stats", load) == 3
+    stats = cache.stats()
+    assert (stats["hits"], stats["stale_hits"], stats["misses"], stats["refreshes"]) == (1, 1, 2, 1)
+
+
+def test_failed_background_refresh_keeps_the_stale_value(clock):
+    cache = TTLCache({"docker_info": (1, 10)}, executor=InlineExecutor())
+    cache.set("docker_info", "old")
+    clock.now += 2
+
+    def fail():
+        raise ConnectionError("daemon down")
+
+    assert cache.get_or_load("docker_info", fail) == "old"
+    assert cache.get_or_load("docker_info", fail) == "old"
+    with pytest.raises(ConnectionError):
+        cache.get_or_load("missing", fail)
+
+
+def test_async_stale_refresh_runs_once_in_a_task(clock):
+    cache = TTLCache({"container_networks": (10, 60)})
+    loads = []
+
+    async def load():
+        loads.append(1)
+        await asyncio.sleep(0)
+        return len(loads)
+
+    async def run():
+        first = await cache.get_or_load_async("container_networks", load)
+        clock.now += 20
+        stale = await asyncio.gather(*(cache.get_or_load_async("container_networks", load) for _ in range(5)))
+        await asyncio.gather(*cache._refresh_tasks)
+        return first, stale, await cache.get_or_load_async("container_networks", load)
+
+    assert asyncio.run(run()) == (1, [1] * 5, 2)
+    assert len(loads) == 2
+
+
+def test_invalidation_only_discards_loads_of_matching_keys():
+    cache = TTLCache({"container_": (5, 0), "system_": (5, 0)})
+
+    async def run():
+        release = asyncio.Event()
+
+        async def load(value):
+            await release.wait()
+            return value
+
+        loads = [
+            asyncio.ensure_future(cache.get_or_load_async("container_details_a", lambda: load("details"))),
+            asyncio.ensure_future(cache.get_or_load_async("container_networks", lambda: load("networks"))),
+            asyncio.ensure_future(cache.get_or_load_async("system_stats", lambda: load("stats"))),
+        ]
+        await asyncio.sleep(0)
+        cache.invalidate_prefix("container_details_a")
+        cache.invalidate("container_networks")
+        release.set()
+        return await asyncio.gather(*loads)
+
+    # Callers still get what they loaded; only the invalidated keys are not stored
+    assert asyncio.run(run()) == ["details", "networks", "stats"]
+    assert cache.get("container_details_a") is None
+    assert cache.get("container_networks") is None
+    assert cache.get("system_stats") == "stats"
+    assert cache._loading == {}
+
+
+def test_clear_keeps_loads_in_flight():
+    cache = TTLCache({})
+
+    async def run():
+        release = asyncio.Event()
+
+        async def load():
+            await release.wait()
+            return "info"
+
+        cache.set("old", 1)
+        pending = asyncio.ensure_future(cache.get_or_load_async("docker_info", load))
+        await asyncio.sleep(0)
+        cache.clear()
+        release.set()
+        return await pending
+
+    assert asyncio.run(run()) == "info"
+    assert cache.get("old") is None
+    assert cache.get("docker_info") == "info"
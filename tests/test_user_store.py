@@ -0,0 +1,78 @@
+import json
+
+from app.user_store import UserStore
+
+
+def open_store(tmp_path, **kwargs):
+    return UserStore(str(tmp_path / "users.json"), flush_interval=3600, **kwargs)
+
+
+def journal_lines(tmp_path):
+    return (tmp_path / "users.json.journal").read_text().splitlines()
+
+
+def test_changes_are_journaled_and_replayed_on_open(tmp_path):
+    store = open_store(tmp_path)
+    store.put("alice", {"role": "admin"})
+    store.put("bob", {"role": "child"})
+    store.delete("bob")
+    assert len(journal_lines(tmp_path)) == 3
+    assert not (tmp_path / "users.json").exists()
+    # Simulate a crash: nothing is compacted, the journal alone has the changes
+    store._stop_event.set()
+    store._journal.close()
+
+    reopened = open_store(tmp_path)
+    assert dict(reopened.items()) == {"alice": {"role": "admin"}}
+    reopened.close()
+
+
+def test_torn_final_line_is_skipped_and_compacted_away(tmp_path):
+    (tmp_path / "users.json").write_text(json.dumps({"alice": {"role": "admin"}}))
+    (tmp_path / "users.json.journal").write_text(
+        '{"op":"set","username":"bob","user":{"role":"child"}}\n{"op":"set","username":"car'
+    )
+
+    store = open_store(tmp_path)
+    assert sorted(store) == ["alice", "bob"]
+    # Folded into a fresh snapshot so new entries don't follow the partial line
+    assert journal_lines(tmp_path) == []
+    assert json.loads((tmp_path / "users.json").read_text()).keys() == {"alice", "bob"}
+    store.put("carol", {"role": "child"})
+    store.close()
+
+    reopened = open_store(tmp_path)
+    assert sorted(reopened) == ["alice", "bob", "carol"]
+    reopened.close()
+
+
+def test_journal_is_compacted_into_the_snapshot(tmp_path):
+    store = open_store(tmp_path, compact_after=3)
+    store.put("alice", {"role": "admin"})
+    store.put("bob", {"role": "child"})
+    assert len(journal_lines(tmp_path)) == 2
+    store.put("carol", {"role": "child"})
+
+    assert journal_lines(tmp_path) == []
+    assert json.loads((tmp_path / "users.json").read_text()).keys() == {"alice", "bob", "carol"}
+    store.close()
+
+
+def test_touch_is_written_behind_in_one_batch(tmp_path):
+    store = open_store(tmp_path)
+    store.put("alice", {"role": "admin", "last_login": None})
+    store.put("bob", {"role": "child", "last_login": None})
+    store.touch("alice", last_login="2025-06-09T10:00:00")
+    store.touch("bob", last_login="2025-06-09T10:00:01")
+    store.touch("nobody", last_login="2025-06-09T10:00:02")
+    assert store["alice"]["last_login"] == "2025-06-09T10:00:00"
+    assert len(journal_lines(tmp_path)) == 2
+
+    store.flush()
+    assert len(journal_lines(tmp_path)) == 4
+    store.close()
+
+    reopened = open_store(tmp_path)
+    assert reopened["bob"]["last_login"] == "2025-06-09T10:00:01"
+    assert "nobody" not in reopened
+    reopened.close()
@@ -0,0 +1,128 @@
+import asyncio
+import json
+
+import pytest
+from fastapi import WebSocketDisconnect
+
+from app import main
+from app.broadcast import BroadcastHub, Subscription
+from app.log_filter import LogFilter
+from app.main import receive_log_filters
+
+
+class ScriptedWebSocket:
+    """Receives the given texts, then disconnects; records what is sent"""
+
+    def __init__(self, messages):
+        self.messages = list(messages)
+        self.sent = []
+
+    async def receive_text(self):
+        if not self.messages:
+            raise WebSocketDisconnect()
+        return self.messages.pop(0)
+
+    async def send_text(self, text):
+        self.sent.append(json.loads(text))
+
+
+def test_log_filter_receiver_ignores_messages_that_are_not_objects():
+    websocket = ScriptedWebSocket([
+        "[1]", '"filter"', "null", "not json", '{"action": "other"}',
+        '{"action": "filter", "level": "error"}',
+        '{"action": "filter", "regex": "("}',
+    ])
+    log_filter = LogFilter()
+
+    with pytest.raises(WebSocketDisconnect):
+        asyncio.run(receive_log_filters(websocket, log_filter))
+
+    assert websocket.sent[0] == {"filter": {"level": "error", "contains": None, "regex": None}}
+    assert "error" in websocket.sent[1]
+    assert log_filter.level == "error"
+
+
+class QueuedWebSocket:
+    """Receives whatever the test puts on its inbox; None disconnects"""
+
+    def __init__(self):
+        self.inbox = asyncio.Queue()
+        self.sent = asyncio.Queue()
+
+    async def accept(self):
+        pass
+
+    async def receive_text(self):
+        message = await self.inbox.get()
+        if message is None:
+            raise WebSocketDisconnect()
+        return message
+
+    async def receive_json(self):
+        return json.loads(await self.receive_text())
+
+    async def send_json(self, data):
+        await self.sent.put(data)
+
+    async def send_text(self, text):
+        await self.sent.put(json.loads(text))
+
+
+class FakeFederation:
+    async def containers(self):
+        return []
+
+    async def networks(self):
+        return {}
+
+
+class FakeDockerClient:
+    async def get_system_stats_async(self):
+        return {"cpu": 1}
+
+
+def test_hub_interval_change_applies_on_the_next_due_tick():
+    hub = BroadcastHub(None, tick=1.0)
+    subscription = Subscription(every=10, next_tick=10)
+
+    hub.set_interval(subscription, 2)
+    assert (subscription.every, subscription.next_tick) == (2, 2)
+    # A longer interval does not postpone the update already due
+    hub.set_interval(subscription, 30)
+    assert (subscription.every, subscription.next_tick) == (30, 2)
+
+
+def test_system_websocket_follows_interval_changes_and_cleans_up(monkeypatch):
+    samples = []
+
+    async def sample():
+        samples.append(len(samples))
+        return {"sample": len(samples)}
+
+    hub = BroadcastHub(sample, tick=0.01)
+    monkeypatch.setattr(main, "docker_client", FakeDockerClient())
+    monkeypatch.setattr(main, "federation", FakeFederation())
+    monkeypatch.setattr(main, "system_hub", hub)
+
+    async def run():
+        websocket = QueuedWebSocket()
+        await websocket.inbox.put(json.dumps({"refresh_interval": 3600}))
+        session = asyncio.ensure_future(main.websocket_system(websocket))
+        snapshot = await websocket.sent.get()
+        assert websocket in main.connected_websockets
+
+        # Later messages on the same socket change the interval
+        await websocket.inbox.put("not json")
+        await websocket.inbox.put(json.dumps({"refresh_interval": 0.01}))
+        update = await asyncio.wait_for(websocket.sent.get(), timeout=5)
+
+        await websocket.inbox.put(None)
+        await asyncio.wait_for(session, timeout=5)
+        return websocket, snapshot, update
+
+    websocket, snapshot, update = asyncio.run(run())
+    assert snapshot == {"system_stats": {"cpu": 1}, "containers": [], "networks": {}}
+    assert "sample" in update
+    # A client that goes away without a failed send is still cleaned up
+    assert websocket not in main.connected_websockets
+    assert hub.subscriber_count == 0